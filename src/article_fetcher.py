@@ -0,0 +1,180 @@
+import glob
+import hashlib
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import http_client
+import metrics
+from disk_cache import DiskCache
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'articles')
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures')
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# 네이버 뉴스 기사 본문 영역 (일반/구 레이아웃/연예·스포츠 순서로 시도)
+BODY_IDS = ('dic_area', 'newsct_article', 'articleBodyContents', 'articeBody', 'newsEndContents')
+# 본문 안에서 빼는 요소 (스크립트, 사진 설명)
+_DROP_XPATH = './/script | .//style | .//*[contains(concat(" ", normalize-space(@class), " "), " img_desc ")]'
+_SPACES = re.compile(r'\s+')
+_SENTENCE_END = re.compile(r'(?<=[다요음함\.\?!])[\.\?!]?\s')
+
+
+def trim_text(text, max_chars):
+    """max_chars 이내에서 문장 단위로 자르기"""
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    ends = [match.end() for match in _SENTENCE_END.finditer(cut)]
+    return cut[:ends[-1]].strip() if ends else cut.strip()
+
+
+def _lxml_body(content):
+    if isinstance(content, bytes):
+        root = lxml.html.document_fromstring(content, parser=lxml.html.HTMLParser(encoding='utf-8'))
+    else:
+        root = lxml.html.document_fromstring(content)
+
+    for body_id in BODY_IDS:
+        nodes = root.xpath(f'//*[@id="{body_id}"]')
+        if nodes:
+            node = nodes[0]
+            for dropped in node.xpath(_DROP_XPATH):
+                dropped.drop_tree()
+            return ' '.join(node.itertext())
+
+    # 본문 영역을 못 찾으면 요약 메타 태그
+    description = root.xpath('//meta[@property="og:description"]/@content')
+    return description[0] if description else ''
+
+
+def _soup_body(content):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    for body_id in BODY_IDS:
+        node = soup.find(id=body_id)
+        if node:
+            for dropped in node.select('script, style, .img_desc'):
+                dropped.decompose()
+            return node.get_text(' ')
+
+    description = soup.find('meta', property='og:description')
+    return description.get('content', '') if description else ''
+
+
+def extract_article_body(content, max_chars=600):
+    """기사 HTML에서 본문 텍스트만 추출해 max_chars 이내로"""
+    text = _lxml_body(content) if HAS_LXML else _soup_body(content)
+    return trim_text(_SPACES.sub(' ', text).strip(), max_chars)
+
+
+class ArticleFetcher:
+    """기사 본문 동시 수집 - 워커 수 제한, 요청별 timeout, 전체 시간 예산, URL별 디스크 캐시"""
+
+    def __init__(self, max_workers=3, timeout=3, budget_seconds=2.5, max_chars=600, cache=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.budget_seconds = budget_seconds
+        self.max_chars = max_chars
+        self.cache = cache
+
+    def _cache_key(self, url):
+        return hashlib.sha256(f"{url}|{self.max_chars}".encode('utf-8')).hexdigest()
+
+    def _fetch_one(self, url):
+        with metrics.span('enrich.fetch', url=url) as attrs:
+            response = http_client.get(url, headers=HEADERS, timeout=self.timeout)
+            response.raise_for_status()
+            body = extract_article_body(response.content, self.max_chars)
+            attrs['chars'] = len(body)
+
+        if body and self.cache:
+            self.cache.set(self._cache_key(url), body)
+        return body
+
+    def fetch_bodies(self, urls):
+        """URL별 본문 {url: 본문} - 시간 예산 안에 못 받은 URL은 빠짐"""
+        bodies = {}
+        pending = []
+        for url in dict.fromkeys(urls):
+            cached = self.cache.get(self._cache_key(url)) if self.cache else None
+            if cached:
+                bodies[url] = cached
+            else:
+                pending.append(url)
+
+        if not pending:
+            return bodies
+
+        started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(pending)))
+        futures = {executor.submit(self._fetch_one, url): url for url in pending}
+        done, not_done = wait(futures, timeout=self.budget_seconds)
+        # 예산을 넘긴 요청은 기다리지 않음 (요청별 timeout으로 곧 끝남)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in done:
+            try:
+                body = future.result()
+            except Exception as e:
+                print(f"기사 본문 수집 실패 ({futures[future]}): {e}")
+                continue
+            if body:
+                bodies[futures[future]] = body
+
+        if not_done:
+            print(f"⏱️ 시간 예산({self.budget_seconds}초) 초과로 기사 본문 {len(not_done)}개 생략")
+            metrics.increment('enrich.skipped', len(not_done))
+        print(f"📄 기사 본문 {len(bodies)}/{len(urls)}개 ({time.perf_counter() - started:.2f}초)")
+        return bodies
+
+
+def create_article_fetcher(enrichment_config):
+    """설정으로 본문 수집기 생성 (꺼져 있으면 None)"""
+    if not enrichment_config.get('enabled', True):
+        return None
+
+    cache = DiskCache(
+        CACHE_DIR,
+        ttl_seconds=enrichment_config.get('cache_ttl_seconds', 86400),
+        max_entries=enrichment_config.get('cache_max_entries', 300),
+    )
+    return ArticleFetcher(
+        max_workers=enrichment_config.get('max_workers', 3),
+        timeout=enrichment_config.get('timeout', 3),
+        budget_seconds=enrichment_config.get('budget_seconds', 2.5),
+        max_chars=enrichment_config.get('max_chars', 600),
+        cache=cache,
+    )
+
+
+def enrich_news_items(news_items, fetcher, max_articles=3):
+    """상위 max_articles개 뉴스에 기사 본문(body) 추가 (못 받은 뉴스는 제목만)"""
+    targets = [item for item in news_items[:max_articles] if item.get('link')]
+    bodies = fetcher.fetch_bodies([item['link'] for item in targets])
+    return [dict(item, body=bodies[item['link']]) if item.get('link') in bodies else item for item in news_items]
+
+
+# 저장된 기사 페이지로 본문 추출 시간 측정
+if __name__ == "__main__":
+    import timeit
+
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, 'naver_article*.html'))):
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        body = extract_article_body(content)
+        seconds = min(timeit.repeat(lambda: extract_article_body(content), number=20, repeat=3)) / 20
+        print(f"{os.path.basename(path)} [{'lxml' if HAS_LXML else 'html.parser'}] {seconds * 1000:.2f}ms, {len(body)}자")
+        print(f"  {body[:120]}…")
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""오프라인 성능 측정 - 저장된 랭킹 HTML + 가짜 Anthropic/웹훅 서버로 실제 서비스 없이 실행
+
+    python benchmark.py [--runs 3] [--llm-latency 0.3] [--webhook-latency 0.05]
+
+결과는 data/benchmarks/에 커밋별 JSON으로 저장하고 직전 결과와 비교해 출력한다.
+"""
+
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fake_services import (
+    make_anthropic_handler, make_naver_handler, make_webhook_handler, start_server,
+)
+from import_profile import profile_all
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SRC_DIR)
+FIXTURE_DIR = os.path.join(ROOT_DIR, 'fixtures')
+RESULTS_DIR = os.path.join(ROOT_DIR, 'data', 'benchmarks')
+
+
+def load_fixtures():
+    """fixtures/naver_ranking_*.html → {'/파일명': bytes}, 기사 페이지 bytes"""
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, 'naver_ranking_*.html'))):
+        with open(path, 'rb') as f:
+            pages['/' + os.path.basename(path)] = f.read()
+    with open(os.path.join(FIXTURE_DIR, 'naver_article.html'), 'rb') as f:
+        article = f.read()
+    return pages, article
+
+
+def start_fake_services(pages, article, llm_latency, webhook_latency):
+    """가짜 서버 실행 + 환경 변수를 가짜 서버로 지정 (프로젝트 모듈 import 전에 호출)"""
+    # 랭킹 페이지 외의 경로(기사 링크)는 모두 기사 페이지로 응답
+    naver, naver_url = start_server(make_naver_handler(pages, fallback=article))
+    anthropic, anthropic_url = start_server(make_anthropic_handler(llm_latency))
+    webhooks, webhook_url = start_server(make_webhook_handler(webhook_latency))
+
+    os.environ.update({
+        'ANTHROPIC_BASE_URL': anthropic_url,
+        'CLAUDE_API_KEY': 'bench',
+        'TELEGRAM_API_BASE': webhook_url,
+        'TELEGRAM_BOT_TOKEN': 'bench',
+        'TELEGRAM_CHAT_ID': '1',
+        'DISCORD_WEBHOOK_URL': f'{webhook_url}/discord',
+        'SLACK_WEBHOOK_URL': f'{webhook_url}/slack',
+    })
+    # 채팅별 초당 1개 제한이 fan-out 측정을 가리지 않도록 다중 전송은 제외
+    os.environ.pop('TELEGRAM_BROADCAST_CHAT_IDS', None)
+    return [naver, anthropic, webhooks], naver_url
+
+
+def _timings(samples):
+    return {
+        'runs': len(samples),
+        'mean_ms': round(statistics.mean(samples) * 1000, 2),
+        'min_ms': round(min(samples) * 1000, 2),
+        'max_ms': round(max(samples) * 1000, 2),
+    }
+
+
+def bench_parse(pages, runs):
+    """추출 백엔드별 랭킹 페이지 파싱 처리량 (페이지/초)"""
+    from html_extractor import EXTRACTORS, extract_ranking_news
+
+    results = {}
+    for backend in sorted(EXTRACTORS):
+        started = time.perf_counter()
+        for _ in range(runs):
+            for content in pages.values():
+                extract_ranking_news(content, 30, backend, max_sections=6, per_section=5)
+        elapsed = time.perf_counter() - started
+        count = runs * len(pages)
+        results[backend] = {
+            'pages': count,
+            'pages_per_second': round(count / elapsed, 1),
+            'ms_per_page': round(elapsed / count * 1000, 3),
+        }
+    return results
+
+
+def create_bench_crawler(naver_url, fixture):
+    """모든 소스 URL을 가짜 네이버 서버로 바꾸고 캐시/이력은 끈 크롤러 (매번 전체 수집)"""
+    from naver_crawler import NaverNewsCrawler
+    from trend_score import TrendScorer
+
+    crawler = NaverNewsCrawler()
+    crawler.response_cache = None
+    crawler.history_store = None
+    crawler.archive = None
+    # 인기 점수는 메모리에서 계산 (계산 비용은 포함, data/ 상태는 건드리지 않음)
+    if crawler.trend_scorer:
+        crawler.trend_scorer = TrendScorer(':memory:', out_rank=crawler.candidate_limit + 1)
+    for slot_config in crawler.config.get('news_sources', {}).values():
+        for source in slot_config.get('sources', []):
+            source['url'] = f'{naver_url}/{fixture}'
+    # 전체 수집 모드의 섹션별 랭킹 페이지도 같은 페이지로 (쿼리만 달라 중복 기사로 처리됨)
+    crawler.full_coverage = dict(crawler.full_coverage, section_urls=[
+        f'{naver_url}/{fixture}?section={index}' for index, _ in enumerate(crawler.full_coverage.get('section_urls', []))
+    ])
+
+    # 기사 링크도 가짜 서버로 (본문 수집 단계까지 측정)
+    get_naver_news = crawler.get_naver_news
+
+    def get_local_news(time_slot=None):
+        return [dict(item, link=naver_url + urlparse(item['link']).path) for item in get_naver_news(time_slot)]
+
+    crawler.get_naver_news = get_local_news
+    return crawler
+
+
+def bench_end_to_end(naver_url, fixture, runs):
+    """main()과 같은 순서(초기화 → 수집 → 생성 → 전송)로 시간대별 전체 실행 시간"""
+    import main
+    import metrics
+    from article_fetcher import create_article_fetcher
+    from issue_generator import IssueGenerator
+
+    config = main.load_config()
+    # 가짜 실행의 구간 지표는 실제 실행 기록(data/metrics.jsonl)에 섞지 않음
+    metrics.configure(jsonl_path=os.path.join(RESULTS_DIR, 'metrics.jsonl'))
+    results = {}
+    for slot in sorted(config['news_sources']):
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            crawler = create_bench_crawler(naver_url, fixture)
+            generator = IssueGenerator()
+            generator.cache = None
+            article_fetcher = create_article_fetcher(config.get('enrichment', {}))
+            if article_fetcher:
+                article_fetcher.cache = None  # 매번 본문 수집
+            if not main.run_slot(slot, crawler, generator, None, config, article_fetcher):
+                raise RuntimeError(f"{slot} 실행 실패")
+            samples.append(time.perf_counter() - started)
+        results[slot] = _timings(samples)
+    return results
+
+
+def bench_fanout(runs):
+    """텔레그램/Discord/Slack 동시 전송 처리량"""
+    from notifiers import build_thread_data, dispatch, get_notifiers
+
+    thread_data = build_thread_data('벤치마크 본문', '12:00', '종합', [])
+    notifiers = get_notifiers()
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        results = dispatch(thread_data, notifiers)
+        samples.append(time.perf_counter() - started)
+        if not all(result['success'] for result in results):
+            raise RuntimeError(f"전송 실패: {results}")
+
+    timings = _timings(samples)
+    timings['destinations'] = len(notifiers)
+    timings['deliveries_per_second'] = round(len(notifiers) * runs / sum(samples), 1)
+    return timings
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def save_results(report):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    name = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['commit']}.json"
+    path = os.path.join(RESULTS_DIR, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def latest_results(exclude=None):
+    """가장 최근에 저장된 결과 (exclude 파일 제외)"""
+    paths = [path for path in sorted(glob.glob(os.path.join(RESULTS_DIR, '*.json'))) if path != exclude]
+    if not paths:
+        return None
+    with open(paths[-1], 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _flatten(results, prefix=''):
+    flat = {}
+    for key, value in results.items():
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f'{prefix}{key}.'))
+        elif isinstance(value, (int, float)):
+            flat[f'{prefix}{key}'] = value
+    return flat
+
+
+def compare(previous, current):
+    """직전 결과 대비 변화율 출력 (시간은 낮을수록, 처리량은 높을수록 좋음)"""
+    print(f"\n📊 {previous['commit']} ({previous['timestamp']}) 대비")
+    before = _flatten(previous['results'])
+    for key, value in _flatten(current['results']).items():
+        tracked = key.endswith(('mean_ms', '_per_second')) or key.startswith('startup_import_ms.')
+        if not tracked or not before.get(key):
+            continue
+        change = (value - before[key]) / before[key] * 100
+        print(f"  {key}: {before[key]} → {value} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오프라인 성능 측정")
+    parser.add_argument('--runs', type=int, default=3, help="항목별 반복 횟수")
+    parser.add_argument('--parse-runs', type=int, default=50, help="파싱 반복 횟수")
+    parser.add_argument('--llm-latency', type=float, default=0.3, help="가짜 Anthropic 첫 응답 지연 (초)")
+    parser.add_argument('--webhook-latency', type=float, default=0.05, help="가짜 웹훅/Bot API 응답 지연 (초)")
+    parser.add_argument('--fixture', default='naver_ranking_popular_day.html', help="수집에 쓸 랭킹 HTML")
+    parser.add_argument('--no-save', action='store_true', help="결과 파일 저장 안 함")
+    args = parser.parse_args()
+
+    pages, article = load_fixtures()
+    servers, naver_url = start_fake_services(pages, article, args.llm_latency, args.webhook_latency)
+
+    try:
+        print("=== 시작 시간 (import) ===")
+        startup = {name: result['total_ms'] for name, result in profile_all().items()}
+        print(json.dumps(startup, ensure_ascii=False, indent=2))
+
+        print("=== 파싱 처리량 ===")
+        parse = bench_parse(pages, args.parse_runs)
+        print(json.dumps(parse, ensure_ascii=False, indent=2))
+
+        print("=== 전체 실행 (main) ===")
+        end_to_end = bench_end_to_end(naver_url, args.fixture, args.runs)
+
+        print("=== 전송 fan-out ===")
+        fanout = bench_fanout(args.runs * 5)
+    finally:
+        for server in servers:
+            server.shutdown()
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'settings': {
+            'llm_latency': args.llm_latency,
+            'webhook_latency': args.webhook_latency,
+            'runs': args.runs,
+            'fixture': args.fixture,
+        },
+        'results': {'startup_import_ms': startup, 'parse': parse, 'end_to_end': end_to_end, 'fanout': fanout},
+    }
+    print("\n=== 결과 ===")
+    print(json.dumps(report['results'], ensure_ascii=False, indent=2))
+
+    path = None if args.no_save else save_results(report)
+    previous = latest_results(exclude=path)
+    if previous:
+        compare(previous, report)
+    if path:
+        print(f"\n💾 저장: {path}")
+
+
+if __name__ == "__main__":
+    main()
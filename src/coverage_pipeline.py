@@ -0,0 +1,215 @@
+import hashlib
+import heapq
+import math
+import random
+import time
+from array import array
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+import metrics
+from headline_cluster import MinHashLSH, char_shingles
+from history_store import normalize_url
+from html_extractor import iter_ranking_news
+
+
+def iter_pages(load_page, urls, max_workers=4):
+    """페이지를 동시에 받아 도착 순서대로 (url, 본문) yield - 메모리에 있는 본문은 max_workers개 이하"""
+    urls = iter(urls)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {executor.submit(load_page, url): url for url in islice(urls, max_workers)}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                # 하나 끝날 때마다 다음 페이지 1개만 요청 (받아 둔 본문이 쌓이지 않도록)
+                next_url = next(urls, None)
+                if next_url:
+                    pending[executor.submit(load_page, next_url)] = next_url
+                try:
+                    body = future.result()
+                except Exception as e:
+                    print(f"랭킹 페이지 수집 오류 ({url}): {e}")
+                    continue
+                if body:
+                    yield url, body
+
+
+def iter_news(pages, stats, backend='lxml'):
+    """페이지마다 모든 언론사 박스의 뉴스를 하나씩 yield (본문은 파싱 후 바로 버림)"""
+    for _, body in pages:
+        stats['pages'] += 1
+        for item in iter_ranking_news(body, backend):
+            stats['items'] += 1
+            yield item
+
+
+def unique_news(news_items, stats, max_seen=10000):
+    """같은 기사(정규화 URL)는 처음 1번만 - 최근 본 기사 max_seen개의 8바이트 해시만 보관 (LRU)
+
+    같은 기사는 보통 가까운 박스/페이지에 다시 나오므로 창 밖으로 밀려난 중복만 통과하고,
+    그마저 제목 묶기에서 같은 사건으로 합쳐진다. 페이지가 늘어도 메모리는 max_seen개로 일정.
+    """
+    seen = OrderedDict()
+    for item in news_items:
+        key = hashlib.blake2b(normalize_url(item['link']).encode('utf-8'), digest_size=8).digest()
+        if key in seen:
+            seen.move_to_end(key)
+            stats['duplicates'] += 1
+            continue
+        seen[key] = None
+        if len(seen) > max_seen:
+            seen.popitem(last=False)
+        yield item
+
+
+def _item_rank(item):
+    return item.get('section_rank') or item.get('rank') or 1
+
+
+class StreamingClusterer:
+    """뉴스를 하나씩 받아 비슷한 제목끼리 바로 묶음 - 클러스터마다 대표 기사/서명/보도 수만 보관
+
+    점수 = 1/박스 안 최고 순위 + cluster_weight * log(보도 수) (PromptBuilder와 같은 꼴)
+    클러스터가 max_clusters를 넘으면 점수 낮은 것부터 3/4까지 줄여 후보가 늘어도 메모리를 일정하게 유지한다.
+    """
+
+    def __init__(self, lsh=None, max_clusters=1000, max_titles=5, cluster_weight=0.5):
+        self.lsh = lsh or MinHashLSH()
+        self.max_clusters = max_clusters
+        self.max_titles = max_titles
+        self.cluster_weight = cluster_weight
+        self.clusters = {}
+        self.buckets = {}
+        self.next_id = 0
+        self.evicted = 0
+
+    def score(self, cluster):
+        return 1 / _item_rank(cluster['item']) + self.cluster_weight * math.log(cluster['size'])
+
+    def _band_keys(self, packed):
+        """밴드별 버킷 키 (밴드 번호 + 서명 조각을 8바이트 정수로)"""
+        width = self.lsh.rows * 4
+        return [
+            int.from_bytes(hashlib.blake2b(packed[band * width:(band + 1) * width], digest_size=8, salt=bytes([band])).digest(), 'little')
+            for band in range(self.lsh.bands)
+        ]
+
+    def add(self, item):
+        # 서명은 정수 튜플 대신 4바이트씩 묶은 bytes로 보관 (클러스터당 수 KB → 수백 바이트)
+        signature = array('I', self.lsh.signature(char_shingles(item['title'], self.lsh.ngram)))
+        packed = signature.tobytes()
+        keys = self._band_keys(packed)
+
+        # 같은 밴드 버킷에 있는 클러스터의 대표 서명하고만 비교 (먼저 생긴 클러스터 우선)
+        candidates = sorted({cluster_id for key in keys for cluster_id in self.buckets.get(key, ())})
+        for cluster_id in candidates:
+            cluster = self.clusters[cluster_id]
+            if self.lsh.estimate_similarity(signature, array('I', cluster['signature'])) >= self.lsh.threshold:
+                cluster['size'] += 1
+                if len(cluster['titles']) < self.max_titles:
+                    cluster['titles'].append(item['title'])
+                if _item_rank(item) < _item_rank(cluster['item']):
+                    cluster['item'] = item
+                return
+
+        cluster_id = self.next_id
+        self.next_id += 1
+        self.clusters[cluster_id] = {'item': item, 'signature': packed, 'size': 1, 'titles': [item['title']]}
+        for key in keys:
+            self.buckets.setdefault(key, []).append(cluster_id)
+
+        if len(self.clusters) > self.max_clusters:
+            self._evict()
+
+    def _evict(self):
+        """점수 낮은 클러스터를 max_clusters의 3/4까지 제거 (대부분 순위 낮은 1건짜리)"""
+        count = len(self.clusters) - self.max_clusters * 3 // 4
+        for cluster_id in heapq.nsmallest(count, self.clusters, key=lambda cid: self.score(self.clusters[cid])):
+            for key in self._band_keys(self.clusters.pop(cluster_id)['signature']):
+                bucket = self.buckets[key]
+                bucket.remove(cluster_id)
+                if not bucket:
+                    del self.buckets[key]
+        self.evicted += count
+
+    def top(self, limit):
+        """점수 높은 클러스터 limit개의 대표 기사 (rank, cluster_size, cluster_titles 포함)"""
+        best = heapq.nlargest(limit, self.clusters.values(), key=self.score)
+        return [
+            dict(cluster['item'], rank=rank, cluster_size=cluster['size'], cluster_titles=cluster['titles'])
+            for rank, cluster in enumerate(best, 1)
+        ]
+
+
+def crawl_full_coverage(load_page, urls, limit, lsh=None, backend='lxml', max_workers=4, max_clusters=1000, max_seen=10000):
+    """여러 랭킹 페이지의 모든 언론사 박스를 수집 → 중복 제거 → 묶기 → 점수 상위 limit개
+
+    수집/파싱/중복 제거/묶기가 제너레이터로 이어져 있어 중간 목록을 만들지 않는다.
+    """
+    stats = {'pages': 0, 'items': 0, 'duplicates': 0}
+    clusterer = StreamingClusterer(lsh, max_clusters)
+    with metrics.span('crawl.full_coverage', pages=len(urls)) as attrs:
+        for item in unique_news(iter_news(iter_pages(load_page, urls, max_workers), stats, backend), stats, max_seen):
+            clusterer.add(item)
+        news_items = clusterer.top(limit)
+        attrs.update(stats, clusters=len(clusterer.clusters), evicted=clusterer.evicted)
+
+    metrics.increment('crawl.full_coverage.items', stats['items'])
+    print(f"🗞️ 전체 수집: 페이지 {stats['pages']}/{len(urls)}개, 뉴스 {stats['items']}개 "
+          f"(중복 {stats['duplicates']}개) → 같은 사건 {len(clusterer.clusters) + clusterer.evicted}개")
+    return news_items
+
+
+def synthetic_page(page, boxes=80, per_box=5, stories=5000, hot_stories=30, seed=7):
+    """측정용 랭킹 페이지 (언론사 박스 boxes개, 30%는 여러 언론사가 함께 보도하는 큰 사건 hot_stories개)"""
+    rng = random.Random(seed * 100003 + page)
+    words = ['정부', '대통령', '국회', '경제', '금리', '부동산', '반도체', '수출', '선거', '검찰', '법원', '날씨',
+             '태풍', '야구', '축구', '배우', '가수', '교육', '의료', '노동', '환율', '증시', '북한', '미국']
+    html = ['<html><body>']
+    for box in range(boxes):
+        html.append('<div class="rankingnews_box"><ul class="rankingnews_list">')
+        for position in range(per_box):
+            story = rng.randrange(hot_stories) if rng.random() < 0.3 else rng.randrange(stories)
+            story_rng = random.Random(story)
+            title = ' '.join(story_rng.choice(words) for _ in range(5)) + f' 관련 소식 {story}번째 보도'
+            link = f'https://n.news.naver.com/article/{box:03d}/{page:04d}{box:03d}{position:03d}'
+            html.append(f'<li><div class="list_content"><a href="{link}" class="list_title">{title}</a></div></li>')
+        html.append('</ul></div>')
+    html.append('</body></html>')
+    return ''.join(html).encode('utf-8')
+
+
+# 페이지 수를 늘려가며 목록 방식(전부 파싱 후 묶기) vs 스트리밍 방식의 시간/최대 메모리 비교
+if __name__ == "__main__":
+    import tracemalloc
+
+    from headline_cluster import cluster_headlines
+    from html_extractor import extract_ranking_news
+
+    def load_page(url):
+        return synthetic_page(int(url.split('-')[1]))
+
+    def run_list(urls):
+        items = [item for url in urls for item in extract_ranking_news(load_page(url), 10 ** 6, 'lxml', None, None)]
+        return cluster_headlines(items)[:10]
+
+    def run_streaming(urls):
+        return crawl_full_coverage(load_page, urls, 10, max_workers=1, max_clusters=500)
+
+    for pages in (1, 4, 16):
+        urls = [f'page-{page}' for page in range(pages)]
+        line = []
+        for name, run in (('목록', run_list), ('스트리밍', run_streaming)):
+            started = time.perf_counter()
+            top = run(urls)
+            elapsed = time.perf_counter() - started
+            # 메모리는 따로 측정 (tracemalloc이 실행 시간을 크게 늘림)
+            tracemalloc.start()
+            run(urls)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            line.append(f"{name} {elapsed * 1000:.0f}ms 최대 {peak / 1024:.0f}KB")
+        print(f"페이지 {pages}개 (뉴스 {pages * 400}개): {', '.join(line)}")
+        print(f"  1위: {top[0]['title']} (x{top[0]['cluster_size']})")
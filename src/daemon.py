@@ -0,0 +1,173 @@
+import json
+import signal
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from zoneinfo import ZoneInfo
+
+import metrics
+
+KST = ZoneInfo('Asia/Seoul')
+
+
+def next_slot(slots, now):
+    """now 이후 가장 가까운 (시간대, 실행 시각)"""
+    candidates = []
+    for slot in slots:
+        hour, minute = map(int, slot.split(':'))
+        run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if run_at <= now:
+            run_at += timedelta(days=1)
+        candidates.append((run_at, slot))
+
+    run_at, slot = min(candidates)
+    return slot, run_at
+
+
+class NewsDaemon:
+    """상주 실행 - 클라이언트/연결/캐시를 유지한 채 시간대마다 run_slot 호출
+
+    /health (JSON)와 /metrics (Prometheus 텍스트)로 상태 확인
+    poll: 시간대 사이에 poll_seconds마다 호출 (랭킹만 수집해서 인기 점수 갱신)
+    """
+
+    def __init__(self, run_slot, slots, host='127.0.0.1', port=8080, poll=None, poll_seconds=0):
+        self.run_slot = run_slot
+        self.slots = slots
+        self.poll = poll
+        self.poll_seconds = poll_seconds
+        self.polls = {'success': 0, 'failure': 0}
+        self.host = host
+        self.port = port
+        self.started_at = time.time()
+        self.next_run = None
+        self.runs = {slot: {'success': 0, 'failure': 0} for slot in slots}
+        self.last_duration = {}
+        self.last_success_at = {}
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._server = None
+
+    def _run(self, slot):
+        print(f"⏰ {slot} 실행 시작")
+        started = time.perf_counter()
+        try:
+            success = bool(self.run_slot(slot))
+        except Exception as e:
+            print(f"❌ {slot} 실행 오류: {e}")
+            success = False
+        duration = time.perf_counter() - started
+
+        with self.lock:
+            self.runs[slot]['success' if success else 'failure'] += 1
+            self.last_duration[slot] = duration
+            if success:
+                self.last_success_at[slot] = time.time()
+        print(f"⏰ {slot} 실행 {'성공' if success else '실패'} ({duration:.1f}초)")
+
+    def _poll(self):
+        try:
+            self.poll()
+            result = 'success'
+        except Exception as e:
+            print(f"주기 수집 오류: {e}")
+            result = 'failure'
+        with self.lock:
+            self.polls[result] += 1
+
+    def _wait_until(self, run_at):
+        """run_at까지 대기 (중간에 주기 수집) - 종료 신호가 오면 False"""
+        while True:
+            remaining = (run_at - datetime.now(KST)).total_seconds()
+            if remaining <= 0:
+                return True
+            if not self.poll or not self.poll_seconds or remaining <= self.poll_seconds:
+                return not self._stop.wait(remaining)
+            if self._stop.wait(self.poll_seconds):
+                return False
+            self._poll()
+
+    def health(self):
+        with self.lock:
+            return {
+                'status': 'ok',
+                'uptime_seconds': round(time.time() - self.started_at, 1),
+                'next_run': self.next_run,
+                'runs': {slot: dict(counts) for slot, counts in self.runs.items()},
+                'polls': dict(self.polls),
+            }
+
+    def metrics(self):
+        """Prometheus 텍스트 형식 지표"""
+        lines = [
+            '# TYPE news_bot_uptime_seconds gauge',
+            f'news_bot_uptime_seconds {time.time() - self.started_at:.1f}',
+            '# TYPE news_bot_runs_total counter',
+        ]
+        with self.lock:
+            for slot, counts in self.runs.items():
+                for result, count in counts.items():
+                    lines.append(f'news_bot_runs_total{{slot="{slot}",result="{result}"}} {count}')
+            lines.append('# TYPE news_bot_polls_total counter')
+            for result, count in self.polls.items():
+                lines.append(f'news_bot_polls_total{{result="{result}"}} {count}')
+            lines.append('# TYPE news_bot_last_run_duration_seconds gauge')
+            for slot, duration in self.last_duration.items():
+                lines.append(f'news_bot_last_run_duration_seconds{{slot="{slot}"}} {duration:.3f}')
+            lines.append('# TYPE news_bot_last_success_timestamp_seconds gauge')
+            for slot, success_at in self.last_success_at.items():
+                lines.append(f'news_bot_last_success_timestamp_seconds{{slot="{slot}"}} {success_at:.0f}')
+        # 수집/생성/전송 구간 지표
+        return '\n'.join(lines) + '\n' + metrics.prometheus_text()
+
+    def _start_server(self):
+        daemon = self
+
+        class HealthHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/health':
+                    body, content_type = json.dumps(daemon.health(), ensure_ascii=False), 'application/json'
+                elif self.path == '/metrics':
+                    body, content_type = daemon.metrics(), 'text/plain; version=0.0.4'
+                else:
+                    self.send_error(404)
+                    return
+
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', f'{content_type}; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), HealthHandler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"🩺 상태 확인: http://{self.host}:{self._server.server_port}/health, /metrics")
+
+    def stop(self, *args):
+        self._stop.set()
+
+    def serve_forever(self):
+        """종료 신호가 올 때까지 시간대마다 실행"""
+        self._start_server()
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        try:
+            while not self._stop.is_set():
+                now = datetime.now(KST)
+                slot, run_at = next_slot(self.slots, now)
+                with self.lock:
+                    self.next_run = {'slot': slot, 'at': run_at.isoformat()}
+                print(f"⏳ 다음 실행: {slot} ({run_at.strftime('%Y-%m-%d %H:%M')})")
+
+                if not self._wait_until(run_at):
+                    break
+                self._run(slot)
+        finally:
+            self._server.shutdown()
+            print("=== 상주 실행 종료 ===")
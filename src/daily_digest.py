@@ -0,0 +1,209 @@
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from threading import Lock
+
+from kst_time import KST, today
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+DIGEST_PATH = os.path.join(DATA_DIR, 'digest.sqlite3')
+PREVIEW_CHARS = 100
+
+
+def _empty_digest(day):
+    return {
+        'day': day,
+        'thread_count': 0,
+        'news_count': 0,
+        'total_chars': 0,
+        'categories': {},
+        'threads': [],
+        'top_stories': [],
+    }
+
+
+class DailyDigestStore:
+    """실행마다 생성한 쓰레드를 날짜별로 쌓고 일간 요약을 바로 갱신 (SQLite)
+
+    threads: 날짜/시간대별 원문 (기록용), days: 날짜별 요약 1행 (개수, 카테고리별 개수, 미리보기, 인기 뉴스 상위)
+    요약은 추가할 때마다 그 행만 고쳐서, 하루 끝 요약은 행 1개만 읽으면 된다.
+    """
+
+    def __init__(self, path=DIGEST_PATH, top_stories=5, retention_days=30):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = Lock()
+        self.top_stories = top_stories
+        self.retention_days = retention_days
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS threads (
+                    day TEXT NOT NULL,
+                    time_slot TEXT NOT NULL,
+                    category TEXT,
+                    content TEXT NOT NULL,
+                    news_count INTEGER NOT NULL,
+                    generated_at TEXT,
+                    PRIMARY KEY (day, time_slot)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS days (
+                    day TEXT PRIMARY KEY,
+                    digest TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+
+    def _stories(self, news_items, time_slot):
+        """이번 쓰레드의 상위 뉴스 top_stories개 (요약에 남길 필드만)"""
+        return [
+            {
+                'title': item['title'],
+                'link': item['link'],
+                'popularity_score': item.get('popularity_score', 0),
+                'time_slot': time_slot,
+            }
+            for item in news_items[:self.top_stories] if item.get('link')
+        ]
+
+    def _merge_top(self, top_stories, stories):
+        """기존 상위 뉴스 + 새 뉴스 → 인기도 순 top_stories개 (같은 링크는 높은 점수로)"""
+        merged = {story['link']: story for story in top_stories}
+        for story in stories:
+            previous = merged.get(story['link'])
+            if not previous or story['popularity_score'] > previous['popularity_score']:
+                merged[story['link']] = story
+        ranked = sorted(merged.values(), key=lambda story: -story['popularity_score'])
+        return ranked[:self.top_stories]
+
+    def append(self, thread_data, day=None):
+        """쓰레드 1개 추가 + 그날 요약 갱신 (같은 시간대를 다시 실행하면 이전 것 대신)"""
+        day = day or today()
+        time_slot = thread_data['time_slot']
+        category = thread_data.get('category') or '기타'
+        content = thread_data['content']
+        news_items = thread_data.get('source_news') or []
+        stories = self._stories(news_items, time_slot)
+
+        with self.lock, self.conn:
+            row = self.conn.execute('SELECT digest FROM days WHERE day = ?', (day,)).fetchone()
+            digest = json.loads(row[0]) if row else _empty_digest(day)
+            previous = self.conn.execute(
+                'SELECT category, content, news_count FROM threads WHERE day = ? AND time_slot = ?',
+                (day, time_slot),
+            ).fetchone()
+
+            if previous:
+                # 재실행: 이전 결과 몫을 빼고 다시 더함
+                old_category, old_content, old_news_count = previous
+                digest['thread_count'] -= 1
+                digest['news_count'] -= old_news_count
+                digest['total_chars'] -= len(old_content)
+                digest['categories'][old_category] -= 1
+                if not digest['categories'][old_category]:
+                    del digest['categories'][old_category]
+                digest['threads'] = [thread for thread in digest['threads'] if thread['time_slot'] != time_slot]
+                # 인기 뉴스도 다른 시간대 것만으로 다시 계산 (이전 결과의 뉴스가 남지 않도록)
+                if all('top_stories' in thread for thread in digest['threads']):
+                    digest['top_stories'] = self._merge_top([], [story for thread in digest['threads'] for story in thread['top_stories']])
+                else:
+                    # 시간대별 뉴스를 남기기 전 요약: 이 시간대 몫만 뺌
+                    digest['top_stories'] = [story for story in digest['top_stories'] if story['time_slot'] != time_slot]
+
+            digest['thread_count'] += 1
+            digest['news_count'] += len(news_items)
+            digest['total_chars'] += len(content)
+            digest['categories'][category] = digest['categories'].get(category, 0) + 1
+            digest['threads'].append({
+                'time_slot': time_slot,
+                'category': category,
+                'content': content[:PREVIEW_CHARS],
+                'top_stories': stories,
+            })
+            digest['threads'].sort(key=lambda thread: thread['time_slot'])
+            digest['top_stories'] = self._merge_top(digest['top_stories'], stories)
+
+            self.conn.execute(
+                'INSERT OR REPLACE INTO threads (day, time_slot, category, content, news_count, generated_at) VALUES (?, ?, ?, ?, ?, ?)',
+                (day, time_slot, category, content, len(news_items), thread_data.get('generated_at')),
+            )
+            self.conn.execute(
+                'INSERT OR REPLACE INTO days (day, digest, updated_at) VALUES (?, ?, ?)',
+                (day, json.dumps(digest, ensure_ascii=False), time.time()),
+            )
+        return digest
+
+    def get(self, day=None):
+        """그날 요약 (행 1개 조회, 없으면 None)"""
+        with self.lock:
+            row = self.conn.execute('SELECT digest FROM days WHERE day = ?', (day or today(),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def prune(self, day=None):
+        """retention_days보다 오래된 날짜 삭제"""
+        if not self.retention_days:
+            return 0
+        current = datetime.strptime(day or today(), '%Y-%m-%d')
+        cutoff = (current - timedelta(days=self.retention_days)).strftime('%Y-%m-%d')
+        with self.lock, self.conn:
+            self.conn.execute('DELETE FROM threads WHERE day < ?', (cutoff,))
+            return self.conn.execute('DELETE FROM days WHERE day < ?', (cutoff,)).rowcount
+
+    def close(self):
+        self.conn.close()
+
+
+def build_digest_thread_data(digest):
+    """일간 요약 → Discord/Slack 포맷터가 쓰는 쓰레드 데이터 (참고 뉴스 = 오늘 인기 뉴스 상위)"""
+    lines = [f"📊 {digest['day']} 인기 뉴스 쓰레드 요약 ({digest['thread_count']}개)"]
+    for thread in digest['threads']:
+        first_line = thread['content'].strip().split('\n')[0]
+        lines.append(f"• {thread['time_slot']} {thread['category']}: {first_line}")
+
+    categories = ', '.join(f"{category} {count}" for category, count in digest['categories'].items())
+    return {
+        'time_slot': '일간 요약',
+        'category': categories or '-',
+        'content': '\n'.join(lines),
+        'generated_at': datetime.now(KST).isoformat(),
+        'trending_info': f"뉴스 {digest['news_count']}개 / {digest['total_chars']}자",
+        'source_news': digest['top_stories'],
+    }
+
+
+def create_digest_store(digest_config, root_dir):
+    """설정으로 일간 요약 저장소 생성 (꺼져 있으면 None)"""
+    if not digest_config.get('enabled', True):
+        return None
+    path = digest_config.get('path')
+    return DailyDigestStore(
+        path=os.path.join(root_dir, path) if path else DIGEST_PATH,
+        top_stories=digest_config.get('top_stories', 5),
+        retention_days=digest_config.get('retention_days', 30),
+    )
+
+
+# 한 달치를 쌓은 뒤 일간 요약 조회 시간 측정 (하루 4회)
+if __name__ == "__main__":
+    store = DailyDigestStore(':memory:')
+    slots = {'07:00': '오전 이슈', '12:00': '정오 이슈', '18:00': '저녁 이슈', '20:00': '오늘의 핫이슈'}
+    for day in range(30):
+        for slot, category in slots.items():
+            news = [{'title': f'{day}일 {slot} 뉴스 {i}', 'link': f'https://n.news.naver.com/article/001/{day}{i:04d}',
+                     'popularity_score': (day * 7 + i * 13) % 100} for i in range(10)]
+            started = time.perf_counter()
+            store.append({'time_slot': slot, 'category': category, 'content': f'{slot} 이슈 정리\n' * 10,
+                          'source_news': news}, day=f'2026-09-{day + 1:02d}')
+    print(f"추가 1회 {(time.perf_counter() - started) * 1000:.2f}ms")
+
+    started = time.perf_counter()
+    digest = store.get('2026-09-30')
+    thread_data = build_digest_thread_data(digest)
+    print(f"일간 요약 {(time.perf_counter() - started) * 1000:.2f}ms")
+    print(thread_data['content'])
+    print(f"카테고리: {thread_data['category']}, 상위 뉴스: {[story['popularity_score'] for story in thread_data['source_news']]}")
@@ -1,16 +1,9 @@
-python
-import requests
+import http_client
 import os
 from datetime import datetime
 
-def send_to_discord(thread_data):
-    """Discord 웹훅으로 인기 뉴스 쓰레드 전송"""
-    webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
-    
-    if not webhook_url:
-        print("Discord 웹훅 URL이 설정되지 않았습니다.")
-        return False
-    
+def build_discord_payload(thread_data):
+    """인기 뉴스 쓰레드 Discord 웹훅 payload 생성"""
     # 참고 뉴스 링크들 정리
     news_links = ""
     if 'source_news' in thread_data:
@@ -58,8 +51,20 @@ def send_to_discord(thread_data):
         "embeds": [embed]
     }
     
+    return payload
+
+def send_to_discord(thread_data, timeout=None):
+    """Discord 웹훅으로 인기 뉴스 쓰레드 전송"""
+    webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
+    
+    if not webhook_url:
+        print("Discord 웹훅 URL이 설정되지 않았습니다.")
+        return False
+    
+    payload = build_discord_payload(thread_data)
+    
     try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = http_client.post(webhook_url, json=payload, timeout=timeout)
         if response.status_code == 204:
             print("✅ Discord 웹훅 전송 성공!")
             return True
@@ -67,6 +72,9 @@ def send_to_discord(thread_data):
             print(f"❌ Discord 웹훅 전송 실패: HTTP {response.status_code}")
             print(f"응답: {response.text}")
             return False
+    except http_client.DeliveryUnknown:
+        # 웹훅이 받았을 수도 있음 - 보관함에서 재전송하지 않도록 구분
+        raise
     except Exception as e:
         print(f"❌ Discord 웹훅 오류: {e}")
         return False
@@ -91,13 +99,13 @@ def send_error_notification(error_message, time_slot):
     }
     
     try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = http_client.post(webhook_url, json=payload)
         return response.status_code == 204
     except:
         return False
 
 def send_daily_summary(threads_list):
-    """하루 생성된 쓰레드 요약 전송 (선택사항)"""
+    """하루 생성된 쓰레드 요약 전송 (threads_list: DailyDigestStore.get()['threads'])"""
     webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
     
     if not webhook_url or not threads_list:
@@ -114,7 +122,7 @@ def send_daily_summary(threads_list):
     }
     
     try:
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = http_client.post(webhook_url, json=payload)
         return response.status_code == 204
     except Exception as e:
         print(f"일간 요약 전송 오류: {e}")
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+
+
+class DiskCache:
+    """키별 파일 디스크 캐시 (TTL + 개수 제한 LRU, 최근 사용 시각 = 파일 수정 시각)
+
+    get/set: JSON으로 저장하는 값 (ttl_seconds가 지나면 없는 것으로)
+    read/write: 키 + 확장자별 원본 바이트 (본문과 메타데이터를 따로 두는 경우)
+    """
+
+    def __init__(self, cache_dir, ttl_seconds=None, max_entries=None):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def path(self, key, suffix='json'):
+        return os.path.join(self.cache_dir, f"{key}.{suffix}")
+
+    def read(self, key, suffix='json'):
+        try:
+            with open(self.path(key, suffix), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def write(self, key, data, suffix='json'):
+        # 중간에 죽어도 깨진 캐시가 남지 않도록 임시 파일에 쓰고 교체
+        path = self.path(key, suffix)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def remove(self, key, suffix='json'):
+        try:
+            os.remove(self.path(key, suffix))
+        except OSError:
+            pass
+
+    def _count(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key):
+        """저장된 값 (없거나 깨졌거나 만료면 None)"""
+        try:
+            entry = json.loads(self.read(key) or b'null')
+        except ValueError:
+            entry = None
+        # 이전 형식으로 저장된 파일도 없는 것으로
+        if not isinstance(entry, dict) or 'value' not in entry:
+            self._count(False)
+            return None
+
+        if self.ttl_seconds is not None and time.time() - entry['created_at'] > self.ttl_seconds:
+            self.remove(key)
+            self._count(False)
+            return None
+
+        try:
+            os.utime(self.path(key))
+        except OSError:
+            pass
+        self._count(True)
+        return entry['value']
+
+    def set(self, key, value):
+        self.write(key, json.dumps({'created_at': time.time(), 'value': value}, ensure_ascii=False).encode('utf-8'))
+        self.evict()
+
+    def evict(self):
+        """개수 제한을 넘으면 가장 오래 안 쓴 키부터 삭제 (.json 수정 시각 기준, 같은 키의 다른 파일도 함께)"""
+        if not self.max_entries:
+            return
+
+        files = {}
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.tmp'):
+                continue
+            key, _, suffix = name.partition('.')
+            files.setdefault(key, []).append(name)
+            if suffix == 'json':
+                try:
+                    entries.append((os.path.getmtime(os.path.join(self.cache_dir, name)), key))
+                except OSError:
+                    continue
+
+        if len(entries) <= self.max_entries:
+            return
+
+        entries.sort()
+        for _, key in entries[:len(entries) - self.max_entries]:
+            for name in files[key]:
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def stats(self):
+        with self.lock:
+            return {'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,186 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def start_server(handler_class):
+    """로컬 포트에 가짜 서버 실행 → (서버, 기본 URL)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler_class)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+class _QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length) if length else b''
+        return json.loads(body) if body else {}
+
+    def _send(self, code, body=b'', content_type='application/json'):
+        self.send_response(code)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def make_naver_handler(pages, fallback=None):
+    """경로별 저장된 HTML 응답 ({'/ranking': bytes}), 없는 경로는 fallback (기사 페이지 등)"""
+
+    class FakeNaver(_QuietHandler):
+        def do_GET(self):
+            body = pages.get(self.path.split('?')[0], fallback)
+            if body is None:
+                self._send(404)
+            else:
+                self._send(200, body, 'text/html; charset=utf-8')
+
+    return FakeNaver
+
+
+def fake_completion(prompt):
+    """프롬프트 종류에 맞는 가짜 응답 텍스트 (묶음 요청이면 '### 작업ID' 구역별로)"""
+    sections = re.findall(r'^### ([A-Za-z0-9_-]+)\n(.*?)(?=^### |\Z)', prompt, re.MULTILINE | re.DOTALL)
+    if sections:
+        return '\n\n'.join(f"### {task_id}\n{fake_completion(body)}" for task_id, body in sections)
+    if '10개' in prompt:
+        return '\n'.join(f"{i}. 오늘 화제된 뉴스 요약 {i}번이야" for i in range(1, 11))
+    if '한 줄' in prompt:
+        return '이거 진짜 난리 났대'
+    return '오늘 제일 핫한 뉴스는 이거야. ' * 8
+
+
+def fake_tool_input(tool_name, prompt):
+    """도구 지정 요청(tool_choice)에 대한 가짜 도구 입력"""
+    if tool_name == 'submit_issue_fixes':
+        # '고칠 번호: 3(42자, 너무 김), 10(없음)' → 해당 번호만 새로
+        targets = prompt.rsplit('고칠 번호:', 1)[-1]
+        return {'fixes': [{'number': int(number), 'text': f"다시 정리한 뉴스 요약 {number}번이야"}
+                          for number in re.findall(r'(\d+)\(', targets)]}
+    lines = [re.sub(r'^\d+\.\s*', '', line) for line in fake_completion(prompt).split('\n')]
+    return {'issues': lines}
+
+
+def make_anthropic_handler(latency=0.2, chunk_delay=0.005):
+    """가짜 Anthropic Messages API (/v1/messages) - 첫 응답까지 latency초, 스트리밍 지원"""
+
+    cached_prefixes = set()
+    lock = threading.Lock()
+
+    def _text(content):
+        if isinstance(content, str):
+            return content
+        return ''.join(block.get('text', '') for block in content)
+
+    def _cache_usage(system):
+        """cache_control 붙은 시스템 프롬프트: 처음엔 캐시 쓰기, 그 다음부터 캐시 읽기"""
+        if isinstance(system, str) or not any(block.get('cache_control') for block in system):
+            return 0, 0
+        prefix = _text(system)
+        with lock:
+            hit = prefix in cached_prefixes
+            cached_prefixes.add(prefix)
+        return (len(prefix) // 2, 0) if hit else (0, len(prefix) // 2)
+
+    class FakeAnthropic(_QuietHandler):
+        def do_POST(self):
+            request = self._read_json()
+            prompt = _text(request['messages'][-1]['content'])
+            system = request.get('system', '')
+            cache_read, cache_write = _cache_usage(system)
+            text = fake_completion(prompt)
+            input_tokens = (len(prompt) + len(_text(system))) // 2 - cache_read - cache_write
+            output_tokens = len(text) // 2
+            usage = {
+                'input_tokens': input_tokens, 'output_tokens': output_tokens,
+                'cache_read_input_tokens': cache_read, 'cache_creation_input_tokens': cache_write,
+            }
+
+            if request.get('tools'):
+                tool_name = request.get('tool_choice', {}).get('name') or request['tools'][0]['name']
+                tool_input = fake_tool_input(tool_name, prompt)
+                content = [{'type': 'tool_use', 'id': 'toolu_fake', 'name': tool_name, 'input': tool_input}]
+                usage['output_tokens'] = len(json.dumps(tool_input, ensure_ascii=False)) // 2
+                stop_reason = 'tool_use'
+            else:
+                content = [{'type': 'text', 'text': text}]
+                stop_reason = 'end_turn'
+
+            time.sleep(latency)
+            if request.get('stream'):
+                self._stream(request, content[0], dict(usage, output_tokens=1), usage['output_tokens'], stop_reason)
+                return
+
+            message = {
+                'id': 'msg_fake', 'type': 'message', 'role': 'assistant', 'model': request['model'],
+                'content': content,
+                'stop_reason': stop_reason, 'stop_sequence': None,
+                'usage': usage,
+            }
+            self._send(200, json.dumps(message, ensure_ascii=False).encode('utf-8'))
+
+        def _event(self, name, data):
+            self.wfile.write(f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode('utf-8'))
+            self.wfile.flush()
+
+        def _stream(self, request, block, start_usage, output_tokens, stop_reason):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+
+            # 텍스트는 줄 단위, 도구 입력은 JSON 문자열을 잘게 나눈 input_json_delta로
+            if block['type'] == 'tool_use':
+                start_block = dict(block, input={})
+                payload = json.dumps(block['input'], ensure_ascii=False)
+                deltas = [{'type': 'input_json_delta', 'partial_json': payload[i:i + 7]} for i in range(0, len(payload), 7)]
+            else:
+                start_block = {'type': 'text', 'text': ''}
+                deltas = [{'type': 'text_delta', 'text': chunk} for chunk in re.findall(r'[^\n]*\n?', block['text']) if chunk]
+
+            try:
+                self._event('message_start', {'type': 'message_start', 'message': {
+                    'id': 'msg_fake', 'type': 'message', 'role': 'assistant', 'model': request['model'],
+                    'content': [], 'stop_reason': None, 'stop_sequence': None,
+                    'usage': start_usage,
+                }})
+                self._event('content_block_start', {'type': 'content_block_start', 'index': 0,
+                                                    'content_block': start_block})
+                for delta in deltas:
+                    time.sleep(chunk_delay)
+                    self._event('content_block_delta', {'type': 'content_block_delta', 'index': 0, 'delta': delta})
+                self._event('content_block_stop', {'type': 'content_block_stop', 'index': 0})
+                self._event('message_delta', {'type': 'message_delta',
+                                              'delta': {'stop_reason': stop_reason, 'stop_sequence': None},
+                                              'usage': {'output_tokens': output_tokens}})
+                self._event('message_stop', {'type': 'message_stop'})
+            except (BrokenPipeError, ConnectionResetError):
+                # 클라이언트가 10개 받고 스트림을 먼저 닫은 경우
+                pass
+            self.close_connection = True
+
+    return FakeAnthropic
+
+
+def make_webhook_handler(latency=0.05):
+    """가짜 Telegram Bot API(/bot.../sendMessage), Discord(/discord), Slack(/slack) 웹훅"""
+
+    class FakeWebhooks(_QuietHandler):
+        def do_POST(self):
+            self._read_json()
+            time.sleep(latency)
+            if self.path.startswith('/discord'):
+                self._send(204)
+            elif self.path.startswith('/slack'):
+                self._send(200, b'ok', 'text/plain')
+            else:
+                self._send(200, b'{"ok": true, "result": {}}')
+
+    return FakeWebhooks
@@ -0,0 +1,133 @@
+import glob
+import hashlib
+import os
+import random
+import re
+import time
+from struct import unpack
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures')
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# 괄호 태그([단독], (종합) 등), 따옴표, 문장부호, 공백 제거
+_BRACKET_TAG = re.compile(r'\[[^\]]*\]|\([^)]*\)|【[^】]*】')
+_NON_WORD = re.compile(r'[^\w]+')
+
+
+def normalize_title(title):
+    return _NON_WORD.sub('', _BRACKET_TAG.sub('', title)).lower()
+
+
+def char_shingles(title, n=3):
+    """정규화한 제목의 문자 n-gram 집합 (한글은 띄어쓰기가 달라도 비슷하게 나옴)"""
+    text = normalize_title(title)
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class MinHashLSH:
+    """문자 n-gram MinHash + LSH 밴딩으로 비슷한 제목 후보만 비교"""
+
+    def __init__(self, num_perm=64, bands=16, ngram=3, threshold=0.5, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm은 bands로 나누어 떨어져야 합니다")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self.threshold = threshold
+
+        rng = random.Random(seed)
+        self.permutations = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingles):
+        hashes = [unpack('<I', hashlib.blake2b(s.encode('utf-8'), digest_size=4).digest())[0] for s in shingles]
+        if not hashes:
+            return (_MAX_HASH,) * self.num_perm
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self.permutations
+        )
+
+    def band_keys(self, signature):
+        return [(band, signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    @staticmethod
+    def estimate_similarity(sig_a, sig_b):
+        return sum(a == b for a, b in zip(sig_a, sig_b)) / len(sig_a)
+
+
+def cluster_headlines(news_items, lsh=None):
+    """비슷한 제목끼리 묶어 순위가 가장 높은 기사 1개만 남김
+
+    대표 기사에는 cluster_size(묶인 기사 수)와 cluster_titles를 붙이고,
+    결과는 원래 순위 순서를 유지한 채 rank를 다시 매긴다.
+    """
+    lsh = lsh or MinHashLSH()
+    buckets = {}
+    parent = list(range(len(news_items)))
+    signatures = []
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for index, item in enumerate(news_items):
+        signature = lsh.signature(char_shingles(item['title'], lsh.ngram))
+        signatures.append(signature)
+
+        # 같은 밴드 버킷에 들어간 후보끼리만 유사도 확인
+        candidates = set()
+        for key in lsh.band_keys(signature):
+            candidates.update(buckets.setdefault(key, []))
+            buckets[key].append(index)
+
+        for other in candidates:
+            root_a, root_b = find(other), find(index)
+            if root_a != root_b and lsh.estimate_similarity(signature, signatures[other]) >= lsh.threshold:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters = {}
+    for index in range(len(news_items)):
+        clusters.setdefault(find(index), []).append(index)
+
+    representatives = []
+    for root in sorted(clusters):
+        members = clusters[root]
+        representative = dict(news_items[members[0]])
+        # 이미 묶인 결과(전체 수집 모드)를 다시 묶어도 보도 수가 유지되도록 합산
+        representative['cluster_size'] = sum(news_items[i].get('cluster_size', 1) for i in members)
+        representative['cluster_titles'] = [
+            title for i in members for title in news_items[i].get('cluster_titles', [news_items[i]['title']])
+        ]
+        representatives.append(representative)
+
+    return [dict(item, rank=rank) for rank, item in enumerate(representatives, 1)]
+
+
+# 저장된 랭킹 페이지로 실행당 클러스터링 비용 측정
+if __name__ == "__main__":
+    from html_extractor import extract_ranking_news
+
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, 'naver_ranking_*.html'))):
+        with open(path, 'rb') as f:
+            items = extract_ranking_news(f.read(), limit=1000, max_sections=100, per_section=100)
+
+        # 수백 개 후보 규모로 늘려서 측정 (언론사별 표기 차이 흉내)
+        candidates = [dict(item, title=f"{item['title']} {suffix}") for suffix in ('', '(종합)', '[단독]', '…') for item in items]
+
+        started = time.perf_counter()
+        clustered = cluster_headlines(candidates)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        print(f"{os.path.basename(path)}: 후보 {len(candidates)}개 → 클러스터 {len(clustered)}개, {elapsed_ms:.1f}ms")
+        for item in clustered[:3]:
+            print(f"  {item['rank']}. {item['title']} (x{item['cluster_size']})")
@@ -0,0 +1,144 @@
+import os
+import re
+import sqlite3
+import time
+from threading import Lock
+from urllib.parse import parse_qs, urlparse
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+HISTORY_PATH = os.path.join(DATA_DIR, 'history.sqlite3')
+
+# n.news.naver.com/article/{oid}/{aid} 또는 ...?oid=...&aid=...
+_ARTICLE_PATH = re.compile(r'/(?:mnews/)?article/(\d+)/(\d+)')
+
+
+def extract_article_id(url):
+    """네이버 기사 URL에서 '언론사ID/기사ID' 추출 (없으면 None)"""
+    parsed = urlparse(url)
+    match = _ARTICLE_PATH.search(parsed.path)
+    if match:
+        return f"{match.group(1)}/{match.group(2)}"
+
+    query = parse_qs(parsed.query)
+    if 'oid' in query and 'aid' in query:
+        return f"{query['oid'][0]}/{query['aid'][0]}"
+    return None
+
+
+def normalize_url(url):
+    """같은 기사를 가리키는 URL을 하나로 정규화 (ntype 등 추적 파라미터 제거)"""
+    article_id = extract_article_id(url)
+    if article_id:
+        return f"https://n.news.naver.com/article/{article_id}"
+
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc.lower()}{parsed.path.rstrip('/')}"
+
+
+class HistoryStore:
+    """수집한 헤드라인 이력 (SQLite) - 시간대 간 중복 확인용"""
+
+    def __init__(self, path=HISTORY_PATH):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = Lock()
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS headlines (
+                    url_key TEXT PRIMARY KEY,
+                    article_id TEXT,
+                    title TEXT NOT NULL,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    last_rank INTEGER,
+                    best_rank INTEGER,
+                    seen_count INTEGER NOT NULL DEFAULT 1
+                )
+            """)
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_headlines_article_id ON headlines(article_id)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_headlines_last_seen ON headlines(last_seen)')
+
+    def record(self, news_items, seen_at=None):
+        """수집한 뉴스 기록 (이미 있으면 last_seen/rank/횟수 갱신)"""
+        seen_at = seen_at or time.time()
+        rows = [
+            (normalize_url(item['link']), extract_article_id(item['link']), item['title'],
+             seen_at, seen_at, item.get('rank'), item.get('rank'))
+            for item in news_items
+        ]
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO headlines (url_key, article_id, title, first_seen, last_seen, last_rank, best_rank)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url_key) DO UPDATE SET
+                    title = excluded.title,
+                    last_seen = excluded.last_seen,
+                    last_rank = excluded.last_rank,
+                    best_rank = MIN(COALESCE(best_rank, excluded.best_rank), excluded.best_rank),
+                    seen_count = seen_count + 1
+            """, rows)
+
+    def seen_since(self, news_items, since):
+        """since(epoch 초) 이후에 이미 수집된 뉴스의 정규화 URL 집합 (PK 인덱스 조회)"""
+        url_keys = list({normalize_url(item['link']) for item in news_items})
+        if not url_keys:
+            return set()
+
+        placeholders = ','.join('?' * len(url_keys))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT url_key FROM headlines WHERE url_key IN ({placeholders}) AND last_seen >= ?",
+                url_keys + [since],
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def get(self, url):
+        """기사 1개 이력 (정규화 URL 기준)"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url_key, article_id, title, first_seen, last_seen, last_rank, best_rank, seen_count "
+                "FROM headlines WHERE url_key = ?",
+                (normalize_url(url),),
+            ).fetchone()
+        if not row:
+            return None
+        keys = ('url_key', 'article_id', 'title', 'first_seen', 'last_seen', 'last_rank', 'best_rank', 'seen_count')
+        return dict(zip(keys, row))
+
+    def filter_repeats(self, news_items, since, mode='downrank'):
+        """이전 시간대에 나온 뉴스 제외(filter) 또는 뒤로 보내기(downrank), 순위 다시 매김"""
+        seen = self.seen_since(news_items, since)
+        fresh = [item for item in news_items if normalize_url(item['link']) not in seen]
+        # 뒤로 보낸 반복 뉴스는 표시 (프롬프트 구성 시 novelty 점수)
+        repeats = [dict(item, repeat=True) for item in news_items if normalize_url(item['link']) in seen]
+
+        print(f"이력 확인: 새 뉴스 {len(fresh)}개, 반복 뉴스 {len(repeats)}개")
+
+        ordered = fresh if mode == 'filter' else fresh + repeats
+        return [dict(item, rank=rank) for rank, item in enumerate(ordered, 1)]
+
+    def close(self):
+        self.conn.close()
+
+
+# 몇 달치 이력에서 조회 속도 확인
+if __name__ == "__main__":
+    store = HistoryStore(':memory:')
+    now = time.time()
+
+    # 하루 4회 x 15개 x 180일
+    for run in range(4 * 180):
+        store.record([
+            {'title': f'테스트 뉴스 {run}-{i}', 'link': f'https://n.news.naver.com/article/001/{run * 15 + i:010d}?ntype=RANKING', 'rank': i + 1}
+            for i in range(15)
+        ], seen_at=now - (4 * 180 - run) * 6 * 3600)
+
+    candidates = [{'title': '', 'link': f'https://n.news.naver.com/article/001/{n:010d}'} for n in range(10790, 10805)]
+    number = 1000
+    started = time.perf_counter()
+    for _ in range(number):
+        store.seen_since(candidates, now - 12 * 3600)
+    elapsed_ms = (time.perf_counter() - started) / number * 1000
+    print(f"이력 {4 * 180 * 15}건, 후보 15개 조회: {elapsed_ms:.3f}ms")
@@ -0,0 +1,192 @@
+import glob
+import io
+import os
+import timeit
+
+try:
+    import lxml.etree
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures')
+
+# 클래스 목록에 rankingnews_box / list_title 이 포함된 요소 (CSS 선택자와 같은 의미)
+_BOX_XPATH = "//div[contains(concat(' ', normalize-space(@class), ' '), ' rankingnews_box ')]"
+_TITLE_XPATH = ".//*[contains(concat(' ', normalize-space(@class), ' '), ' list_title ')]"
+
+
+def _news_link(news_url):
+    if news_url.startswith('/'):
+        return f"https://news.naver.com{news_url}"
+    return news_url
+
+
+def _collect_items(sections, limit, max_sections=3, per_section=5):
+    """(제목, 링크) 섹션 목록에서 랭킹 뉴스 dict 생성 - 백엔드 공통 규칙"""
+    news_items = []
+
+    for section in sections[:max_sections]:  # 상위 3개 언론사
+        for title, news_url in section[:per_section]:  # 각 언론사에서 5개씩
+            if title and len(title) > 10:  # 너무 짧은 제목 제외
+                news_items.append({
+                    'title': title,
+                    'link': _news_link(news_url),
+                    'source': '네이버뉴스',
+                    'rank': len(news_items) + 1
+                })
+
+                if len(news_items) >= limit:
+                    return news_items
+
+    return news_items
+
+
+def _soup_sections(content, max_sections):
+    """기존 방식: html.parser로 전체 트리 생성 후 CSS 선택자"""
+    from bs4 import BeautifulSoup  # 기본(lxml) 경로에서는 import 안 함
+
+    soup = BeautifulSoup(content, 'html.parser')
+    sections = []
+    for box in soup.select('.rankingnews_box')[:max_sections]:
+        sections.append([
+            (link.get_text(strip=True), link.get('href', ''))
+            for link in box.select('.list_title')
+        ])
+    return sections
+
+
+def _lxml_sections(content, max_sections):
+    """빠른 방식: lxml(C 파서)로 랭킹 박스만 XPath로 바로 추출"""
+    if isinstance(content, bytes):
+        # 네이버 뉴스는 UTF-8로 응답
+        root = lxml.html.document_fromstring(content, parser=lxml.html.HTMLParser(encoding='utf-8'))
+    else:
+        root = lxml.html.document_fromstring(content)
+
+    return [_box_links(box) for box in root.xpath(_BOX_XPATH)[:max_sections]]
+
+
+def _box_links(box):
+    return [
+        (''.join(text.strip() for text in link.itertext()), link.get('href', ''))
+        for link in box.xpath(_TITLE_XPATH)
+    ]
+
+
+def _lxml_iter_sections(content):
+    """전체 수집용: 랭킹 박스가 끝날 때마다 yield 하고 이미 읽은 트리는 버림 (페이지 크기와 무관한 메모리)"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+
+    events = lxml.etree.iterparse(io.BytesIO(content), events=('end',), tag='div', html=True, encoding='utf-8')
+    for _, element in events:
+        if ' rankingnews_box ' not in f" {' '.join((element.get('class') or '').split())} ":
+            continue
+        yield _box_links(element)
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+def _soup_iter_sections(content):
+    """html.parser는 스트리밍이 안 돼서 전체 트리 생성 후 박스별로"""
+    yield from _soup_sections(content, None)
+
+
+EXTRACTORS = {
+    'html.parser': _soup_sections,
+}
+SECTION_ITERATORS = {
+    'html.parser': _soup_iter_sections,
+}
+if HAS_LXML:
+    EXTRACTORS['lxml'] = _lxml_sections
+    SECTION_ITERATORS['lxml'] = _lxml_iter_sections
+
+
+def get_extractor_name(name):
+    """요청한 백엔드가 없으면 html.parser로 대체"""
+    if name in EXTRACTORS:
+        return name
+    print(f"HTML 추출기 '{name}' 사용 불가, html.parser 사용")
+    return 'html.parser'
+
+
+def extract_ranking_news(content, limit=10, backend='lxml', max_sections=3, per_section=5):
+    """랭킹 페이지 HTML에서 title/link/rank dict 목록 추출"""
+    sections = EXTRACTORS[get_extractor_name(backend)](content, max_sections)
+    return _collect_items(sections, limit, max_sections, per_section)
+
+
+def iter_ranking_news(content, backend='lxml'):
+    """랭킹 페이지의 모든 언론사 박스에서 뉴스를 하나씩 yield (전체 수집 모드)
+
+    rank 대신 section(박스 순서)과 section_rank(박스 안 순위)를 붙인다.
+    """
+    for section, links in enumerate(SECTION_ITERATORS[get_extractor_name(backend)](content), 1):
+        section_rank = 0
+        for title, news_url in links:
+            if title and len(title) > 10:
+                section_rank += 1
+                yield {
+                    'title': title,
+                    'link': _news_link(news_url),
+                    'source': '네이버뉴스',
+                    'section': section,
+                    'section_rank': section_rank,
+                }
+
+
+def check_parity(fixture_dir=FIXTURE_DIR, limit=10):
+    """저장된 랭킹 페이지에서 모든 백엔드 결과가 같은지 확인"""
+    all_match = True
+    for path in sorted(glob.glob(os.path.join(fixture_dir, 'naver_ranking_*.html'))):
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        expected = extract_ranking_news(content, limit, backend='html.parser')
+        for name in EXTRACTORS:
+            result = extract_ranking_news(content, limit, backend=name)
+            match = result == expected
+            all_match = all_match and match
+            print(f"{'✅' if match else '❌'} {os.path.basename(path)} [{name}] {len(result)}개")
+
+        # 전체 수집(스트리밍)도 같은 박스/제목을 빠짐없이 읽는지
+        expected = [(item['title'], item['link']) for item in extract_ranking_news(content, 10000, 'html.parser', None, None)]
+        for name in SECTION_ITERATORS:
+            result = [(item['title'], item['link']) for item in iter_ranking_news(content, backend=name)]
+            match = result == expected
+            all_match = all_match and match
+            print(f"{'✅' if match else '❌'} {os.path.basename(path)} [{name}, 전체] {len(result)}개")
+    return all_match
+
+
+def benchmark(fixture_dir=FIXTURE_DIR, limit=10, number=50):
+    """백엔드별 1회 추출 시간(ms)과 html.parser 대비 속도"""
+    results = {}
+    for path in sorted(glob.glob(os.path.join(fixture_dir, 'naver_ranking_*.html'))):
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        timings = {}
+        for name in EXTRACTORS:
+            seconds = timeit.timeit(lambda: extract_ranking_news(content, limit, backend=name), number=number)
+            timings[name] = seconds / number * 1000
+
+        baseline = timings['html.parser']
+        for name, ms in timings.items():
+            print(f"{os.path.basename(path)} [{name}] {ms:.2f}ms (x{baseline / ms:.1f})")
+        results[os.path.basename(path)] = timings
+    return results
+
+
+# 파서 일치 확인 + 마이크로 벤치마크
+if __name__ == "__main__":
+    print("=== 백엔드 결과 비교 ===")
+    parity = check_parity()
+    print(f"결과: {'일치' if parity else '불일치'}")
+
+    print("\n=== 추출 속도 ===")
+    benchmark()
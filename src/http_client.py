@@ -0,0 +1,164 @@
+import json
+import os
+from threading import Lock
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config.json')
+
+DEFAULT_HTTP_CONFIG = {
+    'connect_timeout': 3.05,
+    'read_timeout': 10,
+    'max_retries': 3,
+    'backoff_factor': 0.5,
+    'backoff_jitter': 0.5,
+    'pool_connections': 10,
+    'pool_maxsize': 10,
+}
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+_session = None
+_session_lock = Lock()
+
+# 실행 중 새로 맺은 연결(TCP/TLS 핸드셰이크) 수 - 호스트별
+_handshakes = {}
+_handshake_lock = Lock()
+
+
+def _record_handshake(host):
+    with _handshake_lock:
+        _handshakes[host] = _handshakes.get(host, 0) + 1
+
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _record_handshake(self.host)
+        return super()._new_conn()
+
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _record_handshake(self.host)
+        return super()._new_conn()
+
+
+class _PooledAdapter(HTTPAdapter):
+    """새 연결이 생길 때마다 핸드셰이크 수를 세는 어댑터"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _CountingHTTPConnectionPool,
+            'https': _CountingHTTPSConnectionPool,
+        }
+
+
+class _SafeRetry(Retry):
+    """GET 등 멱등 요청만 읽기 타임아웃/5xx 재시도, POST는 연결 오류와 429만 재시도
+
+    POST(메시지 전송)는 서버가 받고 늦게 응답한 경우에도 다시 보내면 중복 전송이 되므로,
+    요청이 서버에 닿지 않은 연결 오류와 처리하지 않았다고 알려 준 429만 다시 보낸다.
+    """
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if not self._is_method_retryable(method):
+            return status_code == 429 and bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class DeliveryUnknown(Exception):
+    """요청을 보낸 뒤 응답 전에 읽기 타임아웃 - 상대가 받았는지 알 수 없음 (다시 보내면 중복될 수 있음)"""
+
+
+class _TimeoutSession(requests.Session):
+    """timeout을 안 주면(None) 기본 (connect, read) timeout, 숫자 하나면 읽기 timeout만 바꿈"""
+
+    def __init__(self, timeout):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        timeout = kwargs.get('timeout')
+        if timeout is None:
+            kwargs['timeout'] = self.default_timeout
+        elif not isinstance(timeout, tuple):
+            kwargs['timeout'] = (min(self.default_timeout[0], timeout), timeout)
+        return super().request(method, url, **kwargs)
+
+
+def load_http_config():
+    """config.json의 http 설정 (없으면 기본값)"""
+    http_config = dict(DEFAULT_HTTP_CONFIG)
+    try:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            http_config.update(json.load(f).get('http', {}))
+    except (OSError, ValueError) as e:
+        print(f"HTTP 설정 로드 실패, 기본값 사용: {e}")
+    return http_config
+
+
+def create_session(http_config=None):
+    """커넥션 풀 + keep-alive + 재시도(GET은 429/5xx, POST는 연결 오류/429만, 지터 백오프) 세션 생성"""
+    http_config = http_config or load_http_config()
+
+    # 429 응답의 Retry-After는 그대로 따름, allowed_methods는 기본값(멱등 메서드)
+    retry = _SafeRetry(
+        total=http_config['max_retries'],
+        backoff_factor=http_config['backoff_factor'],
+        backoff_jitter=http_config['backoff_jitter'],
+        status_forcelist=RETRY_STATUS,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = _PooledAdapter(
+        pool_connections=http_config['pool_connections'],
+        pool_maxsize=http_config['pool_maxsize'],
+        max_retries=retry,
+    )
+
+    session = _TimeoutSession((http_config['connect_timeout'], http_config['read_timeout']))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """크롤러와 알림 모듈이 같이 쓰는 공유 세션"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+
+def get(url, **kwargs):
+    return get_session().get(url, **kwargs)
+
+
+def post(url, session=None, **kwargs):
+    """POST 전송 - 보낸 뒤 응답을 못 받고 타임아웃이면 DeliveryUnknown (연결 자체 실패는 그대로 예외)"""
+    try:
+        return (session or get_session()).post(url, **kwargs)
+    except requests.exceptions.ReadTimeout as e:
+        raise DeliveryUnknown(f"응답 대기 시간 초과, 전송 여부 알 수 없음 ({e})") from e
+
+
+def get_handshake_stats():
+    """호스트별 새 연결 수 (연결 재사용 확인용)"""
+    with _handshake_lock:
+        return dict(_handshakes)
+
+
+def get_handshake_count():
+    with _handshake_lock:
+        return sum(_handshakes.values())
+
+
+def reset_handshake_stats():
+    """실행(시간대)마다 새로 세도록 초기화 (데몬 모드에서 누적되지 않게)"""
+    with _handshake_lock:
+        _handshakes.clear()
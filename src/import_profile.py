@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""실행 경로별 import 시간 측정 (python -X importtime 결과 요약)
+
+    python import_profile.py [--top 10] [--budget-ms 100]
+
+entry: main.py 자체 import (모든 실행의 시작 비용)
+drain: --drain-outbox 경로 (전송 모듈만)
+run:   정기 실행 경로 (크롤러 + AI 생성 + 전송, AI 캐시 미적중이라 anthropic 포함)
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PROFILES = {
+    'entry': 'import main',
+    'drain': 'import main, outbox',
+    'run': 'import main, naver_crawler, issue_generator, notifiers, outbox, anthropic',
+}
+
+
+def parse_importtime(stderr):
+    """-X importtime 출력 → [(모듈, 자체 us, 누적 us, 깊이)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def profile_imports(code):
+    """새 인터프리터에서 code 실행 시 import 시간 → {'total_ms', 'top'}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True,
+    )
+    rows = parse_importtime(result.stderr)
+    # 최상위(깊이 0) 모듈의 누적 시간 = 실제로 기다린 시간
+    top = sorted((row for row in rows if row[3] == 0), key=lambda row: row[2], reverse=True)
+    return {
+        'total_ms': round(sum(row[1] for row in rows) / 1000, 2),
+        'modules': len(rows),
+        'top': [(name, round(cumulative / 1000, 2)) for name, _, cumulative, _ in top],
+    }
+
+
+def profile_all(profiles=PROFILES):
+    return {name: profile_imports(code) for name, code in profiles.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="실행 경로별 import 시간 측정")
+    parser.add_argument('--top', type=int, default=10, help="경로별 출력할 모듈 수")
+    parser.add_argument('--budget-ms', type=float, help="entry import 시간 상한 (넘으면 종료 코드 1)")
+    args = parser.parse_args()
+
+    results = profile_all()
+    for name, result in results.items():
+        print(f"=== {name}: {result['total_ms']}ms, 모듈 {result['modules']}개 ({PROFILES[name]}) ===")
+        for module, cumulative_ms in result['top'][:args.top]:
+            print(f"  {cumulative_ms:>9.2f}ms  {module}")
+
+    if args.budget_ms is not None and results['entry']['total_ms'] > args.budget_ms:
+        print(f"❌ main.py import {results['entry']['total_ms']}ms > 상한 {args.budget_ms}ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,405 @@
 import os
+import re
+import json
 import time
-from anthropic import Anthropic
-from datetime import datetime
-import pytz
+import asyncio
+from llm_cache import LLMCache, cache_key
+from prompt_builder import count_tokens, create_prompt_builder
+from issue_schema import ISSUE_LIST_TOOL, ISSUE_LIST_VALIDATOR, REPAIR_PROMPT, REPAIR_TOOL
+import metrics
+
+CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'config.json')
+MODEL = "claude-sonnet-4-20250514"
+MAX_ISSUES = 10
+
+# 고정 지시문 (말투 + 작업별 형식 규칙) - 시스템 프롬프트로 보냄
+# 요청마다 그 작업의 규칙만 붙임 (다른 작업 규칙까지 매번 입력 토큰으로 내지 않도록)
+PERSONA = "너는 오늘의 인기 뉴스를 정리해 주는 이슈 정리봇이야. 항상 20대 여성 말투의 친근한 반말로 써."
+
+TASK_RULES = {
+    'issue_list': "[이슈 리스트] 받은 뉴스를 10개로 요약. 각 35자 이내. 형식: 1. 내용요약 (도구가 주어지면 번호 없이 내용만 제출)",
+    'issue_repair': "[이슈 리스트 수정] 지정한 번호만 35자 이내로 다시 써서 제출.",
+    'hot_issue': "[핫이슈] 뉴스 1개를 300자 이내로 요약. 배경설명 포함.",
+    'blurb': "[한 줄 요약] 뉴스 1개를 한 줄(35자 이내)로 요약.",
+}
+
+# tool_choice로 도구를 지정하면 API가 앞에 붙이는 도구 사용 시스템 프롬프트 (Claude 4 모델 기준)
+# 요청 본문에는 안 보이지만 입력 토큰으로 과금되므로 토큰 예산에 포함
+TOOL_USE_SYSTEM_TOKENS = 313
+
+# 프롬프트 캐싱 최소 길이 (Sonnet 1024토큰) - 더 짧은 시스템 프롬프트는 캐시되지 않으므로 cache_control을 붙이지 않음
+CACHE_MIN_TOKENS = 1024
+
+# 실행마다 바뀌는 부분 (뉴스 제목/본문)만 사용자 메시지로
+ISSUE_LIST_PROMPT = """[이슈 리스트] 다음 뉴스를 10개 요약해줘.
+
+{news_titles}
+
+시간: {time_slot}"""
+
+HOT_ISSUE_PROMPT = """[핫이슈] 이 뉴스를 요약해줘:
+
+제목: {title}
+{context}"""
+
+BLURB_PROMPT = """[한 줄 요약] 이 뉴스를 요약해줘:
+
+제목: {title}"""
+
+# 숫자로 시작하는 줄 (1., 2., 3. 등)
+NUMBERED_LINE = re.compile(r'^\d+\.')
+
+# 묶음 요청 응답의 작업 구분 줄 (### 작업ID)
+BATCH_SECTION = re.compile(r'^###\s*([A-Za-z0-9_-]+)\s*$', re.MULTILINE)
+
+# 형식별 (max_tokens, temperature)
+VARIANT_PARAMS = {
+    'issue_list': (400, 0.1),
+    'hot_issue': (200, 0.3),
+}
+
+
+def sampling(temperature):
+    """temperature 요청 인자 (최신 SDK의 messages.create/stream에는 temperature 인자가 없어 요청 본문에 직접 추가)"""
+    return {'extra_body': {'temperature': temperature}}
+
+
+class IssueLineParser:
+    """스트리밍 응답을 받는 대로 줄 단위로 잘라 번호 줄만 모음"""
+    
+    def __init__(self, max_items=MAX_ISSUES):
+        self.max_items = max_items
+        self.items = []
+        self._buffer = ''
+    
+    @property
+    def done(self):
+        return len(self.items) >= self.max_items
+    
+    def _add_line(self, line):
+        line_clean = line.strip()
+        if line_clean and NUMBERED_LINE.match(line_clean) and not self.done:
+            self.items.append(line_clean)
+            return True
+        return False
+    
+    def feed(self, text):
+        """받은 텍스트 조각 추가, 새로 완성된 번호 줄 수 반환"""
+        self._buffer += text
+        *lines, self._buffer = self._buffer.split('\n')
+        return sum(self._add_line(line) for line in lines)
+    
+    def finish(self):
+        """스트림 종료 시 마지막 줄 처리"""
+        added = self._add_line(self._buffer)
+        self._buffer = ''
+        return added
+    
+    def result(self):
+        return '\n'.join(self.items)
+
+
+class IssueJsonParser:
+    """도구 입력 JSON 스트림({"issues": ["...", ...]})에서 닫힌 항목 문자열만 받는 대로 모음"""
+    
+    _ARRAY_START = re.compile(r'"issues"\s*:\s*\[')
+    # 다음 항목 (닫는 따옴표까지 온 문자열만, 이스케이프 포함)
+    _NEXT_ITEM = re.compile(r'\s*,?\s*"((?:[^"\\]|\\.)*)"')
+    
+    def __init__(self, max_items=MAX_ISSUES):
+        self.max_items = max_items
+        self.items = []
+        self._buffer = ''
+        self._pos = None
+    
+    @property
+    def done(self):
+        return len(self.items) >= self.max_items
+    
+    def feed(self, partial_json):
+        """받은 JSON 조각 추가, 새로 완성된 항목 수 반환"""
+        self._buffer += partial_json
+        if self._pos is None:
+            match = self._ARRAY_START.search(self._buffer)
+            if not match:
+                return 0
+            self._pos = match.end()
+        
+        added = 0
+        while not self.done:
+            match = self._NEXT_ITEM.match(self._buffer, self._pos)
+            if not match:
+                break
+            self.items.append(json.loads(f'"{match.group(1)}"'))
+            self._pos = match.end()
+            added += 1
+        return added
+    
+    def finish(self):
+        """닫히지 않은 문자열은 버림 (JSON은 줄 단위가 아님)"""
+        return 0
+
 
 class IssueGenerator:
     def __init__(self):
-        self.client = Anthropic(api_key=os.getenv('CLAUDE_API_KEY'))
+        # anthropic 클라이언트는 첫 AI 요청 때 생성 (캐시 적중이면 SDK import 생략)
+        self._client = None
+        self._async_client = None
         
         # 아이콘 리스트
         self.icons = ['🔥', '⚡', '💥', '🚨', '📢', '🎯', '💡', '🌟', '🔔', '💫']
+        
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+        
+        # 같은 입력이면 AI 재요청 없이 이전 결과 사용
+        cache_config = self.config.get('llm_cache', {})
+        self.cache = None
+        if cache_config.get('enabled', True):
+            self.cache = LLMCache(
+                ttl_seconds=cache_config.get('ttl_seconds', 86400),
+                max_entries=cache_config.get('max_entries', 500),
+            )
+        
+        # 비동기 생성 시 동시 요청 수 / 재시도 횟수 (동기 생성도 같은 횟수)
+        generation_config = self.config.get('generation', {})
+        self.max_concurrency = generation_config.get('max_concurrency', 4)
+        self.max_retries = generation_config.get('max_retries', 3)
+        
+        # 이슈 리스트는 스트리밍으로 받으면서 10개 모이면 바로 중단
+        # (structured_output이 켜져 있으면 도구 입력 JSON을 받는 대로 항목 단위로 파싱)
+        self.streaming = generation_config.get('streaming', True)
+        
+        # 여러 형식 묶음 생성 방식 ('combined': 요청 1개, 'batches': Message Batches API)
+        self.batch_mode = generation_config.get('batch_mode', 'combined')
+        self.batch_poll_interval = generation_config.get('batch_poll_interval', 10)
+        self.batch_timeout = generation_config.get('batch_timeout', 3600)
+        
+        # 이슈 리스트를 도구(JSON 스키마)로 받고 로컬 검사 → 잘못된 항목만 다시 요청
+        self.structured_output = generation_config.get('structured_output', True)
+        
+        # 고정 지시문(시스템 프롬프트) 프롬프트 캐싱
+        self.prompt_caching = generation_config.get('prompt_caching', True)
+        self.last_stream_metrics = None
+        
+        # 입력 토큰 예산 안에서 프롬프트에 넣을 제목/본문 선택
+        self.prompt_builder = create_prompt_builder(self.config.get('prompt', {}))
+        self._semaphore = None
+        self._semaphore_loop = None
+    
+    @property
+    def client(self):
+        if self._client is None:
+            from anthropic import Anthropic
+            self._client = Anthropic(api_key=os.getenv('CLAUDE_API_KEY'))
+        return self._client
+    
+    @property
+    def async_client(self):
+        if self._async_client is None:
+            from anthropic import AsyncAnthropic
+            self._async_client = AsyncAnthropic(api_key=os.getenv('CLAUDE_API_KEY'))
+        return self._async_client
+    
+    def _cached_result(self, prompt, max_tokens, temperature, kind):
+        """캐시 키와 캐시된 결과 반환 (캐시 꺼져 있거나 없으면 결과는 None)"""
+        if not self.cache:
+            return None, None
+        
+        # 이슈 리스트는 도구/텍스트 응답 방식이 다르면 다른 결과로 취급
+        mode = ('tool' if self.structured_output else 'text') if kind == 'issue_list' else None
+        key = cache_key(MODEL, prompt, temperature, max_tokens, system=self._system_text(kind), mode=mode)
+        cached = self.cache.get(key)
+        if cached:
+            print(f"💾 AI 응답 캐시 사용 ({self.cache.stats()})")
+        return key, cached
+    
+    def _store_result(self, key, result):
+        if self.cache and key:
+            self.cache.set(key, result)
+    
+    def fixed_tokens(self, kind, template):
+        """요청마다 고정으로 들어가는 입력 토큰 추정 (시스템 프롬프트 + 빈 템플릿 + 도구 정의)"""
+        tokens = count_tokens(self._system_text(kind)) + count_tokens(template)
+        if kind == 'issue_list' and self.structured_output:
+            tokens += count_tokens(json.dumps(ISSUE_LIST_TOOL, ensure_ascii=False)) + TOOL_USE_SYSTEM_TOKENS
+        return tokens
+    
+    def _issue_list_prompt(self, news_items, time_slot):
+        """이슈 리스트 프롬프트 (요청 전체 입력 토큰 예산 안에서 제목 선택/정리)"""
+        fixed_tokens = self.fixed_tokens('issue_list', ISSUE_LIST_PROMPT.format(news_titles='', time_slot=time_slot))
+        news_titles = ""
+        for i, title in enumerate(self.prompt_builder.select_headlines(news_items, fixed_tokens), 1):
+            news_titles += f"{i}. {title}\n"
+            metrics.debug(f"  뉴스 {i}: {title}")
+        
+        return ISSUE_LIST_PROMPT.format(news_titles=news_titles, time_slot=time_slot)
+    
+    def _parse_issue_list(self, content):
+        """AI 응답에서 번호로 시작하는 줄만 최대 10개 추출 (35자 넘는 항목은 자르고 번호 다시 매김)"""
+        items = ISSUE_LIST_VALIDATOR.from_text(content)
+        metrics.debug(f"🔍 번호 줄 {len(items)}개: {items}")
+        
+        result = ISSUE_LIST_VALIDATOR.format(ISSUE_LIST_VALIDATOR.finalize(items))
+        print(f"🎯 최종 결과 길이: {len(result)}자")
+        metrics.debug(f"🎯 최종 결과: {result}")
+        return result
+    
+    def _hot_issue_prompt(self, news_items):
+        """핫이슈 프롬프트 (가장 인기 있는 뉴스 1개)"""
+        # 시스템 프롬프트와 제목 정리 후 남은 토큰 예산만큼 기사 본문을 배경 설명 재료로 전달
+        fixed_tokens = self.fixed_tokens('hot_issue', HOT_ISSUE_PROMPT.format(title='', context=''))
+        title, body = self.prompt_builder.hot_issue_material(news_items[0], fixed_tokens)
+        print(f"📰 선택된 뉴스: {title}")
+        
+        context = f"\n본문 일부: {body}\n" if body else ''
+        return HOT_ISSUE_PROMPT.format(title=title, context=context)
+    
+    def _system_text(self, *kinds):
+        """말투 + 이번 요청 작업의 규칙만"""
+        return PERSONA + "\n\n작업별 규칙:\n" + "\n".join(TASK_RULES[kind] for kind in dict.fromkeys(kinds))
+    
+    def _system(self, *kinds):
+        """시스템 프롬프트 (캐싱 켜져 있고 최소 길이를 넘으면 cache_control 블록 - 두 번째 요청부터 캐시에서 읽음)"""
+        system = self._system_text(*kinds)
+        if not self.prompt_caching or count_tokens(system) < CACHE_MIN_TOKENS:
+            return system
+        return [{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}]
+    
+    def _record_usage(self, attrs, usage, output_tokens=None):
+        """토큰 사용량(캐시 읽기/쓰기 포함)을 구간 속성과 누적 카운터에 기록 (output_tokens를 주면 출력 토큰은 그 값으로)"""
+        if usage is None:
+            return
+        if output_tokens is None:
+            output_tokens = usage.output_tokens
+        attrs['tokens_in'] = usage.input_tokens
+        attrs['tokens_out'] = output_tokens
+        metrics.increment('generate.tokens', usage.input_tokens, direction='in')
+        metrics.increment('generate.tokens', output_tokens, direction='out')
+        
+        # 캐시 적중 시 cache_read, 캐시 새로 만들 때 cache_write (캐싱 안 되면 0/None)
+        cache_read = getattr(usage, 'cache_read_input_tokens', None) or 0
+        cache_write = getattr(usage, 'cache_creation_input_tokens', None) or 0
+        attrs['tokens_cache_read'] = cache_read
+        attrs['tokens_cache_write'] = cache_write
+        metrics.increment('generate.tokens', cache_read, direction='cache_read')
+        metrics.increment('generate.tokens', cache_write, direction='cache_write')
+    
+    @staticmethod
+    def _stream_chunks(stream, structured):
+        """받는 대로 텍스트 조각 (structured면 도구 입력 JSON 조각)"""
+        if not structured:
+            yield from stream.text_stream
+            return
+        for event in stream:
+            if event.type == 'content_block_delta' and event.delta.type == 'input_json_delta':
+                yield event.delta.partial_json
+    
+    def _stream_issue_list(self, prompt, structured=False):
+        """스트리밍으로 이슈 리스트 요청 - 항목 10개가 모이면 스트림 중단 → 파서 (structured면 도구 요청)"""
+        parser = IssueJsonParser() if structured else IssueLineParser()
+        request = dict(
+            model=MODEL,
+            max_tokens=400,
+            **sampling(0.1),
+            system=self._system('issue_list'),
+            messages=[{"role": "user", "content": prompt}]
+        )
+        if structured:
+            request.update(tools=[ISSUE_LIST_TOOL], tool_choice={"type": "tool", "name": ISSUE_LIST_TOOL['name']})
+        started = time.perf_counter()
+        first_item_at = None
+        received = []
+        
+        with metrics.span('generate.request', kind='issue_list', mode='stream_tool' if structured else 'stream') as attrs:
+            with self.client.messages.stream(**request) as stream:
+                for text in self._stream_chunks(stream, structured):
+                    received.append(text)
+                    if parser.feed(text) and first_item_at is None:
+                        first_item_at = time.perf_counter()
+                    if parser.done:
+                        break
+                # 중간에 끊으면 최종 output_tokens가 오는 message_delta 전에 닫혀서
+                # 스냅샷의 출력 토큰은 message_start 값(≈1) → 받은 텍스트로 추정해 기록하고 추정치임을 표시
+                output_tokens = None
+                if parser.done:
+                    output_tokens = count_tokens(''.join(received))
+                    attrs['tokens_out_estimated'] = True
+                self._record_usage(attrs, getattr(stream.current_message_snapshot, 'usage', None), output_tokens)
+            
+            if not parser.done and parser.finish() and first_item_at is None:
+                first_item_at = time.perf_counter()
+            
+            total = time.perf_counter() - started
+            self.last_stream_metrics = {
+                'time_to_first_item': round(first_item_at - started, 3) if first_item_at else None,
+                'total_latency': round(total, 3),
+                'items': len(parser.items),
+                'stopped_early': parser.done,
+            }
+            attrs.update(self.last_stream_metrics)
+        metrics.debug(f"⏱️ 스트리밍 지표: {self.last_stream_metrics}")
+        
+        return parser
+    
+    def _tool_request(self, prompt, tool, max_tokens, kind):
+        """도구 1개만 쓰도록 지정해서 요청 → 응답 content 블록"""
+        with metrics.span('generate.request', kind=kind, mode='tool') as attrs:
+            response = self.client.messages.create(
+                model=MODEL,
+                max_tokens=max_tokens,
+                **sampling(0.1),
+                system=self._system(kind),
+                tools=[tool],
+                tool_choice={"type": "tool", "name": tool['name']},
+                messages=[{"role": "user", "content": prompt}]
+            )
+            self._record_usage(attrs, getattr(response, 'usage', None))
+        return response.content
+    
+    def _check_issue_list(self, raw_items):
+        """받은 항목 검사 → 조금 넘친 항목은 로컬에서 자름 (항목, 남은 문제)"""
+        validator = ISSUE_LIST_VALIDATOR
+        return validator.repair_locally(*validator.validate(raw_items))
+    
+    def _repair_prompt(self, prompt, items, problems):
+        """잘못된/빠진 번호만 다시 써 달라는 수정 요청 프롬프트"""
+        validator = ISSUE_LIST_VALIDATOR
+        targets = validator.describe(items, problems)
+        print(f"🩹 이슈 {len(problems)}개만 다시 요청: {targets}")
+        metrics.increment('generate.repairs', len(problems), kind='issue_list')
+        return REPAIR_PROMPT.format(
+            prompt=prompt, max_chars=validator.max_chars, current=validator.format(items), targets=targets,
+        )
+    
+    def _apply_repair(self, items, problems, fixes):
+        """요청한 번호의 수정만 반영해서 최종 이슈 리스트"""
+        validator = ISSUE_LIST_VALIDATOR
+        return validator.format(validator.apply_fixes(items, {index: text for index, text in fixes.items() if index in problems}))
+    
+    def _structured_issue_list(self, prompt):
+        """구조화 응답으로 이슈 리스트 요청 → 검사 → 조금 넘친 항목은 자르고 나머지 문제 항목만 다시 요청
+        
+        streaming이 켜져 있으면 도구 입력을 스트리밍으로 받으면서 10개 모이면 중단
+        """
+        if self.streaming:
+            raw_items = self._stream_issue_list(prompt, structured=True).items
+        else:
+            raw_items = ISSUE_LIST_VALIDATOR.from_content(self._tool_request(prompt, ISSUE_LIST_TOOL, 400, 'issue_list'))
+        items, problems = self._check_issue_list(raw_items)
+        if not problems:
+            return ISSUE_LIST_VALIDATOR.format(items)
+        
+        # 전체를 다시 만들지 않고 잘못된/빠진 번호만 (짧은 요청 1번)
+        repair_prompt = self._repair_prompt(prompt, items, problems)
+        try:
+            fixes = ISSUE_LIST_VALIDATOR.fixes_from_content(self._tool_request(repair_prompt, REPAIR_TOOL, 40 * len(problems) + 60, 'issue_repair'))
+        except Exception as e:
+            # 수정 요청이 실패해도 지금 결과를 잘라서라도 사용
+            print(f"❌ 이슈 수정 요청 실패: {e}")
+            fixes = {}
+        
+        return self._apply_repair(items, problems, fixes)
     
     def generate_issue_list(self, news_items, time_slot):
         """이슈 리스트 생성 (10개, 35자 이내) - 디버깅 추가"""
@@ -19,72 +409,48 @@ class IssueGenerator:
             print(f"❌ 뉴스 개수 부족: {len(news_items)}개")
             return None
         
-        # 뉴스 제목을 더 간단하게 정리 (8개만, 제목 단축)
-        news_titles = ""
-        for i, news in enumerate(news_items[:8], 1):
-            title = news['title'][:60]  # 60자로 제한
-            news_titles += f"{i}. {title}\n"
-            print(f"  뉴스 {i}: {title}")
-        
-        # 매우 간단한 프롬프트
-        prompt = f"""다음 뉴스를 20대 여성 반말로 10개 요약해줘. 각 35자 이내.
-
-{news_titles}
-
-형식: 1. 내용요약
-시간: {time_slot}"""
+        prompt = self._issue_list_prompt(news_items, time_slot)
 
         print(f"📝 프롬프트 길이: {len(prompt)}자")
-        print(f"📝 프롬프트 내용: {prompt[:200]}...")
+        metrics.debug(f"📝 프롬프트 내용: {prompt[:200]}...")
+        
+        key, cached = self._cached_result(prompt, 400, 0.1, 'issue_list')
+        if cached:
+            return cached
 
-        # 재시도 로직
-        max_retries = 3
+        # 재시도 로직 (generation.max_retries)
+        max_retries = self.max_retries
         for attempt in range(max_retries):
             try:
                 print(f"AI 요청 시도 {attempt + 1}/{max_retries}")
                 
-                response = self.client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=400,  # 250에서 400으로 늘림 (토큰 제한 완화)
-                    temperature=0.1,  # 더 정확하게
-                    messages=[{"role": "user", "content": prompt}]
-                )
-                
-                content = response.content[0].text.strip()
-                print(f"✅ AI 응답 받음 - 길이: {len(content)}자")
-                print(f"📄 AI 응답 내용: {content}")
-                
-                # 번호 그대로 유지 (아이콘 교체 안 함)
-                lines = content.split('\n')
-                print(f"🔍 응답을 {len(lines)}개 줄로 분리")
-                
-                result_lines = []
-                
-                for line in lines:
-                    line_clean = line.strip()
-                    print(f"  줄: '{line_clean}'")
+                if self.structured_output:
+                    result = self._structured_issue_list(prompt)
+                elif self.streaming:
+                    result = self._parse_issue_list(self._stream_issue_list(prompt).result())
+                else:
+                    with metrics.span('generate.request', kind='issue_list', attempt=attempt + 1) as attrs:
+                        response = self.client.messages.create(
+                            model=MODEL,
+                            max_tokens=400,  # 250에서 400으로 늘림 (토큰 제한 완화)
+                            **sampling(0.1),  # 더 정확하게
+                            system=self._system('issue_list'),
+                            messages=[{"role": "user", "content": prompt}]
+                        )
+                        self._record_usage(attrs, getattr(response, 'usage', None))
                     
-                    if line_clean:  # 빈 줄 건너뛰기
-                        # 숫자로 시작하는 줄 찾기 (1., 2., 3. 등)
-                        import re
-                        if re.match(r'^\d+\.', line_clean):
-                            result_lines.append(line_clean)  # 번호 그대로 사용
-                            print(f"    → 추가: '{line_clean}'")
-                            
-                            if len(result_lines) >= 10:  # 최대 10개
-                                break
-                        else:
-                            print(f"    → 숫자 패턴 없음: '{line_clean[:20]}'")
-                
-                result = '\n'.join(result_lines)
-                print(f"🎯 최종 결과 길이: {len(result)}자")
-                print(f"🎯 최종 결과: {result}")
+                    content = response.content[0].text.strip()
+                    print(f"✅ AI 응답 받음 - 길이: {len(content)}자")
+                    metrics.debug(f"📄 AI 응답 내용: {content}")
+                    
+                    result = self._parse_issue_list(content)
                 print(f"✅ AI 요청 성공 (시도 {attempt + 1})")
                 
                 if not result.strip():
                     print("❌ 빈 결과 반환")
                     return None
                 
+                self._store_result(key, result)
                 return result
                 
             except Exception as e:
@@ -93,6 +459,7 @@ class IssueGenerator:
                     print("모든 재시도 실패")
                     return None
                 print(f"⏳ {2 * (attempt + 1)}초 후 재시도...")
+                metrics.increment('generate.retries', kind='issue_list')
                 time.sleep(2 * (attempt + 1))  # 지수적 백오프
     
     def generate_hot_issue(self, news_items):
@@ -103,42 +470,40 @@ class IssueGenerator:
             print("❌ 뉴스 없음")
             return None
         
-        # 가장 인기 있는 뉴스 1개 선택
-        top_news = news_items[0]
-        title = top_news['title'][:80]  # 제목 80자로 제한
-        print(f"📰 선택된 뉴스: {title}")
-        
-        # 매우 간단한 프롬프트
-        prompt = f"""이 뉴스를 20대 여성 반말로 300자 이내 요약:
-
-제목: {title}
-
-조건: 친근한 반말, 배경설명 포함"""
+        prompt = self._hot_issue_prompt(news_items)
 
         print(f"📝 핫이슈 프롬프트 길이: {len(prompt)}자")
+        
+        key, cached = self._cached_result(prompt, 200, 0.3, 'hot_issue')
+        if cached:
+            return cached
 
-        # 재시도 로직
-        max_retries = 3
+        # 재시도 로직 (generation.max_retries)
+        max_retries = self.max_retries
         for attempt in range(max_retries):
             try:
                 print(f"핫이슈 AI 요청 시도 {attempt + 1}/{max_retries}")
                 
-                response = self.client.messages.create(
-                    model="claude-sonnet-4-20250514",
-                    max_tokens=200,  # 더 줄임
-                    temperature=0.3,
-                    messages=[{"role": "user", "content": prompt}]
-                )
+                with metrics.span('generate.request', kind='hot_issue', attempt=attempt + 1) as attrs:
+                    response = self.client.messages.create(
+                        model=MODEL,
+                        max_tokens=200,  # 더 줄임
+                        **sampling(0.3),
+                        system=self._system('hot_issue'),
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                    self._record_usage(attrs, getattr(response, 'usage', None))
                 
                 result = response.content[0].text.strip()
                 print(f"✅ 핫이슈 AI 응답 받음 - 길이: {len(result)}자")
-                print(f"📄 핫이슈 내용: {result}")
+                metrics.debug(f"📄 핫이슈 내용: {result}")
                 print(f"✅ 핫이슈 AI 요청 성공 (시도 {attempt + 1})")
                 
                 if not result.strip():
                     print("❌ 빈 핫이슈 결과 반환")
                     return None
                 
+                self._store_result(key, result)
                 return result
                 
             except Exception as e:
@@ -147,8 +512,284 @@ class IssueGenerator:
                     print("핫이슈 모든 재시도 실패")
                     return None
                 print(f"⏳ {2 * (attempt + 1)}초 후 재시도...")
+                metrics.increment('generate.retries', kind='hot_issue')
                 time.sleep(2 * (attempt + 1))
 
+    def _variant_prompt(self, variant):
+        """묶음 생성 작업 1개의 프롬프트 (tone이 있으면 말투 지정 추가)"""
+        if variant['format'] == 'hot_issue':
+            prompt = self._hot_issue_prompt(variant['news_items'])
+        else:
+            prompt = self._issue_list_prompt(variant['news_items'], variant.get('time_slot', ''))
+        
+        if variant.get('tone'):
+            prompt += f"\n말투: {variant['tone']}"
+        return prompt
+    
+    def _slot_variant(self, news_items, time_slot):
+        return {'format': 'hot_issue' if time_slot == '20:00' else 'issue_list',
+                'news_items': news_items, 'time_slot': time_slot}
+    
+    def build_prompt(self, news_items, time_slot):
+        """시간대에 맞는 생성 프롬프트 (generate_hot_issue/generate_issue_list와 같은 프롬프트)"""
+        return self._variant_prompt(self._slot_variant(news_items, time_slot))
+    
+    def dry_run(self, news_items, time_slot):
+        """AI 요청 없이 프롬프트와 캐시된 결과만 (재현/회귀 테스트용) → (프롬프트, 캐시 결과 또는 None)"""
+        variant = self._slot_variant(news_items, time_slot)
+        prompt = self._variant_prompt(variant)
+        max_tokens, temperature = VARIANT_PARAMS[variant['format']]
+        _, cached = self._cached_result(prompt, max_tokens, temperature, variant['format'])
+        return prompt, cached
+    
+    def _finish_variant(self, variant, text):
+        """작업 형식에 맞게 결과 정리 (이슈 리스트는 번호 줄만)"""
+        if not text:
+            return None
+        if variant['format'] == 'issue_list':
+            return self._parse_issue_list(text) or None
+        return text.strip() or None
+    
+    def _generate_combined(self, variants):
+        """모든 작업을 요청 1개로 생성하고 '### 작업ID' 줄 기준으로 나눔"""
+        sections = [f"### {variant['id']}\n{self._variant_prompt(variant)}" for variant in variants]
+        prompt = (
+            f"아래 {len(variants)}개 작업을 각각 수행해줘. "
+            "각 결과는 반드시 '### 작업ID' 줄로 시작하고, 다른 설명은 쓰지 마.\n\n"
+            + "\n\n".join(sections)
+        )
+        max_tokens = sum(VARIANT_PARAMS[variant['format']][0] for variant in variants)
+        temperature = min(VARIANT_PARAMS[variant['format']][1] for variant in variants)
+        
+        with metrics.span('generate.request', kind='batch_combined', variants=len(variants)) as attrs:
+            response = self.client.messages.create(
+                model=MODEL,
+                max_tokens=max_tokens,
+                **sampling(temperature),
+                system=self._system(*(variant['format'] for variant in variants)),
+                messages=[{"role": "user", "content": prompt}]
+            )
+            self._record_usage(attrs, getattr(response, 'usage', None))
+        content = response.content[0].text
+        
+        # split 결과: [앞부분, id1, 본문1, id2, 본문2, ...]
+        parts = BATCH_SECTION.split(content)
+        return dict(zip(parts[1::2], parts[2::2]))
+    
+    def _generate_with_batches(self, variants, batches):
+        """Message Batches API로 작업별 요청을 한 번에 제출하고 끝날 때까지 대기"""
+        requests = []
+        for variant in variants:
+            max_tokens, temperature = VARIANT_PARAMS[variant['format']]
+            requests.append({
+                'custom_id': variant['id'],
+                'params': {
+                    'model': MODEL,
+                    'max_tokens': max_tokens,
+                    'temperature': temperature,
+                    'system': self._system(variant['format']),
+                    'messages': [{"role": "user", "content": self._variant_prompt(variant)}],
+                },
+            })
+        
+        batch = batches.create(requests=requests)
+        deadline = time.time() + self.batch_timeout
+        # 짧은 배치는 1초부터 자주 확인하고, 길어지면 batch_poll_interval까지 간격을 늘림
+        interval = 1
+        while batch.processing_status != 'ended':
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                print(f"❌ 배치 처리 시간 초과: {batch.id}")
+                return {}
+            time.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.batch_poll_interval)
+            batch = batches.retrieve(batch.id)
+        
+        texts = {}
+        for entry in batches.results(batch.id):
+            if entry.result.type == 'succeeded':
+                texts[entry.custom_id] = entry.result.message.content[0].text
+            else:
+                print(f"❌ 배치 작업 실패: {entry.custom_id} ({entry.result.type})")
+        return texts
+    
+    def generate_batch(self, variants, mode=None, batches=None):
+        """여러 뉴스 묶음/형식/말투를 한 번에 생성해서 작업 ID별로 돌려줌
+        
+        variants: [{'id', 'format': 'issue_list'|'hot_issue', 'news_items', 'time_slot', 'tone'}]
+        batches: Message Batches 클라이언트 (기본값 self.client.messages.batches)
+        """
+        mode = mode or self.batch_mode
+        print(f"📦 묶음 생성 시작 - 작업 {len(variants)}개 ({mode})")
+        
+        try:
+            if mode == 'batches':
+                texts = self._generate_with_batches(variants, batches or self.client.messages.batches)
+            else:
+                texts = self._generate_combined(variants)
+        except Exception as e:
+            print(f"❌ 묶음 생성 실패: {e}")
+            return {variant['id']: None for variant in variants}
+        
+        results = {variant['id']: self._finish_variant(variant, texts.get(variant['id'])) for variant in variants}
+        print(f"📦 묶음 생성 완료 - 성공 {sum(1 for text in results.values() if text)}/{len(variants)}")
+        return results
+    
+    def _get_semaphore(self):
+        """현재 이벤트 루프용 동시 요청 제한 세마포어"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+    
+    async def _retry_async(self, label, request):
+        """비동기 요청 재시도 (재시도 대기 중에도 다른 요청 진행) → 결과 또는 None"""
+        for attempt in range(self.max_retries):
+            try:
+                result = await request(attempt)
+                print(f"✅ {label} AI 응답 받음 - 길이: {len(result)}자 (시도 {attempt + 1})")
+                return result
+                
+            except Exception as e:
+                print(f"❌ {label} AI 요청 실패 (시도 {attempt + 1}): {e}")
+                if attempt == self.max_retries - 1:
+                    print(f"{label} 모든 재시도 실패")
+                    return None
+                print(f"⏳ {label} {2 * (attempt + 1)}초 후 재시도...")
+                metrics.increment('generate.retries', kind=label)
+                await asyncio.sleep(2 * (attempt + 1))
+    
+    async def _request_async(self, prompt, max_tokens, temperature, label, kind):
+        """비동기 AI 요청 (세마포어로 동시 요청 제한)"""
+        async def request(attempt):
+            async with self._get_semaphore():
+                with metrics.span('generate.request', kind=label, mode='async', attempt=attempt + 1) as attrs:
+                    response = await self.async_client.messages.create(
+                        model=MODEL,
+                        max_tokens=max_tokens,
+                        **sampling(temperature),
+                        system=self._system(kind),
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+                    self._record_usage(attrs, getattr(response, 'usage', None))
+            return response.content[0].text.strip()
+        
+        return await self._retry_async(label, request)
+    
+    async def _tool_request_async(self, prompt, tool, max_tokens, kind):
+        """도구 1개만 쓰도록 지정해서 요청 (비동기) → 응답 content 블록"""
+        async with self._get_semaphore():
+            with metrics.span('generate.request', kind=kind, mode='async_tool') as attrs:
+                response = await self.async_client.messages.create(
+                    model=MODEL,
+                    max_tokens=max_tokens,
+                    **sampling(0.1),
+                    system=self._system(kind),
+                    tools=[tool],
+                    tool_choice={"type": "tool", "name": tool['name']},
+                    messages=[{"role": "user", "content": prompt}]
+                )
+                self._record_usage(attrs, getattr(response, 'usage', None))
+        return response.content
+    
+    async def _structured_issue_list_async(self, prompt):
+        """_structured_issue_list와 같은 검사/부분 수정 (비동기)"""
+        content = await self._tool_request_async(prompt, ISSUE_LIST_TOOL, 400, 'issue_list')
+        items, problems = self._check_issue_list(ISSUE_LIST_VALIDATOR.from_content(content))
+        if not problems:
+            return ISSUE_LIST_VALIDATOR.format(items)
+        
+        repair_prompt = self._repair_prompt(prompt, items, problems)
+        try:
+            fixes = ISSUE_LIST_VALIDATOR.fixes_from_content(
+                await self._tool_request_async(repair_prompt, REPAIR_TOOL, 40 * len(problems) + 60, 'issue_repair'))
+        except Exception as e:
+            print(f"❌ 이슈 수정 요청 실패: {e}")
+            fixes = {}
+        
+        return self._apply_repair(items, problems, fixes)
+    
+    async def generate_issue_list_async(self, news_items, time_slot):
+        """이슈 리스트 생성 (비동기) - 동기 생성과 같은 형식 (structured_output이면 도구 응답 검사/수정)"""
+        if not news_items or len(news_items) < 8:
+            print(f"❌ 뉴스 개수 부족: {len(news_items)}개")
+            return None
+        
+        prompt = self._issue_list_prompt(news_items, time_slot)
+        key, cached = self._cached_result(prompt, 400, 0.1, 'issue_list')
+        if cached:
+            return cached
+        
+        if self.structured_output:
+            result = await self._retry_async('이슈 리스트', lambda attempt: self._structured_issue_list_async(prompt))
+        else:
+            content = await self._request_async(prompt, 400, 0.1, '이슈 리스트', 'issue_list')
+            result = self._parse_issue_list(content) if content else None
+        
+        if not result or not result.strip():
+            print("❌ 빈 결과 반환")
+            return None
+        
+        self._store_result(key, result)
+        return result
+    
+    async def generate_hot_issue_async(self, news_items):
+        """오늘의 핫이슈 생성 (비동기)"""
+        if not news_items:
+            print("❌ 뉴스 없음")
+            return None
+        
+        prompt = self._hot_issue_prompt(news_items)
+        key, cached = self._cached_result(prompt, 200, 0.3, 'hot_issue')
+        if cached:
+            return cached
+        
+        result = await self._request_async(prompt, 200, 0.3, '핫이슈', 'hot_issue')
+        if not result:
+            return None
+        
+        self._store_result(key, result)
+        return result
+    
+    async def generate_cluster_blurb_async(self, news_item):
+        """같은 사건으로 묶인 뉴스 1건 한 줄 요약 (비동기)"""
+        prompt = BLURB_PROMPT.format(title=news_item['title'][:80])
+        
+        # 같은 사건의 다른 언론사 제목도 같이 전달
+        other_titles = news_item.get('cluster_titles', [])[1:4]
+        if other_titles:
+            prompt += "\n같은 사건 다른 제목: " + " / ".join(title[:60] for title in other_titles)
+        
+        key, cached = self._cached_result(prompt, 80, 0.3, 'blurb')
+        if cached:
+            return cached
+        
+        result = await self._request_async(prompt, 80, 0.3, '한 줄 요약', 'blurb')
+        if not result:
+            return None
+        
+        self._store_result(key, result)
+        return result
+    
+    async def generate_all_async(self, news_items, time_slot, blurb_count=0):
+        """이슈 리스트, 핫이슈, 뉴스별 한 줄 요약을 동시에 생성
+
+        전체 소요 시간은 가장 느린 요청 1개 수준 (동시 요청 수는 max_concurrency로 제한)
+        """
+        tasks = [
+            self.generate_issue_list_async(news_items, time_slot),
+            self.generate_hot_issue_async(news_items),
+        ]
+        tasks += [self.generate_cluster_blurb_async(item) for item in news_items[:blurb_count]]
+        
+        results = await asyncio.gather(*tasks)
+        return {
+            'issue_list': results[0],
+            'hot_issue': results[1],
+            'blurbs': list(results[2:]),
+        }
+
 # 테스트용
 if __name__ == "__main__":
     generator = IssueGenerator()
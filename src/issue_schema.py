@@ -0,0 +1,222 @@
+import re
+import time
+
+MAX_ITEM_CHARS = 35
+ISSUE_COUNT = 10
+
+# 이슈 리스트 구조화 응답 (tool_choice로 이 도구만 쓰게 해서 JSON으로 받음)
+ISSUE_LIST_TOOL = {
+    "name": "submit_issue_list",
+    "description": "이슈 리스트 제출. 항목마다 번호 없이 요약 내용만.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "issues": {
+                "type": "array",
+                "items": {"type": "string", "maxLength": MAX_ITEM_CHARS},
+                "minItems": ISSUE_COUNT,
+                "maxItems": ISSUE_COUNT,
+            },
+        },
+        "required": ["issues"],
+    },
+}
+
+# 잘못된 항목만 다시 받을 때 (번호 → 새 내용)
+REPAIR_TOOL = {
+    "name": "submit_issue_fixes",
+    "description": "지정한 번호의 이슈만 고쳐서 제출.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "fixes": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "number": {"type": "integer", "minimum": 1, "maximum": ISSUE_COUNT},
+                        "text": {"type": "string", "maxLength": MAX_ITEM_CHARS},
+                    },
+                    "required": ["number", "text"],
+                },
+            },
+        },
+        "required": ["fixes"],
+    },
+}
+
+REPAIR_PROMPT = """{prompt}
+
+[이슈 리스트 수정] 지금 결과에서 아래 번호만 고쳐줘. 각 {max_chars}자 이내, 다른 항목과 겹치지 않게.
+
+지금 결과:
+{current}
+
+고칠 번호: {targets}"""
+
+# 줄 앞 번호 ("1.", "1)", "01 .") / 어절 경계 / 끝에 남는 쉼표·말줄임
+_NUMBERED = re.compile(r'^\s*(\d{1,2})\s*[.)]\s*(.*?)\s*$')
+_LEADING_NUMBER = re.compile(r'^\s*\d{1,2}\s*[.)]\s*')
+_SPACES = re.compile(r'\s+')
+_TRAILING = re.compile(r'[\s,·…:;\-]+$')
+
+_REASONS = {
+    'too_long': '{chars}자, 너무 김',
+    'empty': '빈 항목',
+    'duplicate': '중복',
+    'missing': '없음',
+}
+
+
+class IssueListValidator:
+    """JSON 스키마의 제약(항목 글자 수, 항목 수)을 한 번만 읽어 두고 응답을 바로 검사/수리
+
+    problems: {0부터 시작하는 번호: 'too_long'|'empty'|'duplicate'|'missing'}
+    """
+
+    def __init__(self, schema, truncate_slack=8):
+        issues = schema['properties']['issues']
+        self.max_chars = issues['items']['maxLength']
+        self.min_items = issues.get('minItems', 1)
+        self.max_items = issues.get('maxItems', self.min_items)
+        # 이만큼까지 넘친 항목은 다시 요청하지 않고 어절 단위로 자름
+        self.truncate_slack = truncate_slack
+
+    def normalize(self, text):
+        if not isinstance(text, str):
+            return ''
+        return _SPACES.sub(' ', _LEADING_NUMBER.sub('', text)).strip()
+
+    def from_text(self, content):
+        """일반 텍스트 응답에서 번호 줄만 (번호는 떼고 내용만)"""
+        items = []
+        for line in content.split('\n'):
+            match = _NUMBERED.match(line)
+            if match:
+                items.append(match.group(2))
+        return items
+
+    def from_content(self, blocks, tool_name=ISSUE_LIST_TOOL['name']):
+        """응답 content 블록 → 항목 목록 (도구 입력 우선, 없으면 텍스트의 번호 줄)"""
+        for block in blocks:
+            if getattr(block, 'type', None) == 'tool_use' and block.name == tool_name:
+                issues = (block.input or {}).get('issues')
+                if isinstance(issues, str):
+                    # 배열 대신 줄바꿈 문자열로 오는 경우
+                    return self.from_text(issues) or issues.split('\n')
+                if isinstance(issues, list):
+                    return issues
+        text = ''.join(getattr(block, 'text', '') for block in blocks)
+        return self.from_text(text)
+
+    def fixes_from_content(self, blocks):
+        """수정 응답 → {0부터 시작하는 번호: 새 내용}"""
+        for block in blocks:
+            if getattr(block, 'type', None) == 'tool_use' and block.name == REPAIR_TOOL['name']:
+                fixes = {}
+                for fix in (block.input or {}).get('fixes') or []:
+                    if isinstance(fix, dict) and isinstance(fix.get('number'), int):
+                        fixes[fix['number'] - 1] = fix.get('text', '')
+                return fixes
+        fixes = {}
+        for line in ''.join(getattr(block, 'text', '') for block in blocks).split('\n'):
+            match = _NUMBERED.match(line)
+            if match:
+                fixes[int(match.group(1)) - 1] = match.group(2)
+        return fixes
+
+    def validate(self, items):
+        """(정리한 항목, 문제 목록) - 최대 개수 초과분은 버림"""
+        items = [self.normalize(item) for item in items][:self.max_items]
+        problems = {}
+        seen = set()
+        for index, item in enumerate(items):
+            if not item:
+                problems[index] = 'empty'
+            elif item in seen:
+                problems[index] = 'duplicate'
+            elif len(item) > self.max_chars:
+                problems[index] = 'too_long'
+            seen.add(item)
+        for index in range(len(items), self.min_items):
+            problems[index] = 'missing'
+        return items, problems
+
+    def shorten(self, text):
+        """max_chars 이내로 - 어절 경계에서 자르고 끝의 쉼표/말줄임 정리"""
+        if len(text) <= self.max_chars:
+            return text
+        cut = text[:self.max_chars + 1]
+        boundary = cut.rfind(' ')
+        cut = cut[:boundary] if boundary > self.max_chars // 2 else text[:self.max_chars]
+        return _TRAILING.sub('', cut)
+
+    def repair_locally(self, items, problems):
+        """조금 넘친 항목은 자르고, 남은 문제만 반환 (다시 요청할 대상)"""
+        items = list(items)
+        remaining = {}
+        for index, reason in problems.items():
+            if reason == 'too_long' and len(items[index]) - self.max_chars <= self.truncate_slack:
+                items[index] = self.shorten(items[index])
+            else:
+                remaining[index] = reason
+        return items, remaining
+
+    def describe(self, items, problems):
+        """다시 요청할 번호 설명 ('3(42자, 너무 김), 10(없음)')"""
+        return ', '.join(
+            f"{index + 1}({_REASONS[reason].format(chars=len(items[index]) if index < len(items) else 0)})"
+            for index, reason in sorted(problems.items())
+        )
+
+    def apply_fixes(self, items, fixes):
+        """다시 받은 항목 반영 → 다시 검사 → 그래도 안 되는 항목은 자르거나 뺌"""
+        items = list(items)
+        for index, text in sorted(fixes.items()):
+            if 0 <= index < len(items):
+                items[index] = text
+            elif index == len(items) and index < self.max_items:
+                items.append(text)
+        return self.finalize(items)
+
+    def finalize(self, items):
+        """최종 정리: 넘친 항목은 잘라서, 빈/중복 항목은 빼서 항상 제약을 지키는 목록"""
+        items, problems = self.validate(items)
+        result = []
+        for index, item in enumerate(items):
+            reason = problems.get(index)
+            if reason == 'too_long':
+                item = self.shorten(item)
+            elif reason in ('empty', 'duplicate'):
+                continue
+            result.append(item)
+        return result
+
+    def format(self, items):
+        return '\n'.join(f"{number}. {item}" for number, item in enumerate(items, 1))
+
+
+# 모듈을 읽을 때 한 번만 스키마에서 제약을 꺼내 둠
+ISSUE_LIST_VALIDATOR = IssueListValidator(ISSUE_LIST_TOOL['input_schema'])
+
+
+# 응답 검사/로컬 수리 시간과 다시 요청이 필요한 경우 확인
+if __name__ == "__main__":
+    validator = ISSUE_LIST_VALIDATOR
+    samples = {
+        '정상': [f"오늘 화제된 뉴스 요약 {i}번이야" for i in range(1, 11)],
+        '조금 김': [f"오늘 화제된 뉴스 요약 {i}번이야, 이건 조금 더 길게 써 본 설명이야" for i in range(1, 11)],
+        '많이 김/빠짐': ["너무 길게 써서 도저히 그냥 자르면 뜻이 안 통하는 아주 아주 긴 요약 문장이야 진짜로"]
+                     + [f"오늘 화제된 뉴스 요약 {i}번이야" for i in range(2, 9)],
+        '번호 붙은 텍스트': "1. 첫 번째 소식\n2) 두 번째 소식\n설명 줄\n3. 두 번째 소식",
+    }
+    for name, sample in samples.items():
+        raw = validator.from_text(sample) if isinstance(sample, str) else sample
+        started = time.perf_counter()
+        for _ in range(1000):
+            items, problems = validator.validate(raw)
+            items, remaining = validator.repair_locally(items, problems)
+        elapsed = (time.perf_counter() - started) / 1000
+        print(f"{name}: 검사+로컬 수리 {elapsed * 1e6:.0f}µs, 문제 {len(problems)}개 → "
+              f"다시 요청 {validator.describe(items, remaining) or '없음'}")
+    print(validator.format(validator.finalize(items)))
@@ -0,0 +1,10 @@
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+# 한국시간 (GitHub Actions 러너는 UTC)
+KST = ZoneInfo('Asia/Seoul')
+
+
+def today():
+    """한국시간 기준 날짜 'YYYY-MM-DD' (UTC 러너에서 07:00 KST 실행이 전날로 잡히지 않도록)"""
+    return datetime.now(KST).strftime('%Y-%m-%d')
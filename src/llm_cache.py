@@ -0,0 +1,25 @@
+import hashlib
+import json
+import os
+
+from disk_cache import DiskCache
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'llm')
+
+
+def cache_key(model, prompt, temperature, max_tokens, system=None, mode=None):
+    """(모델, 시스템 프롬프트, 프롬프트, temperature, max_tokens, 응답 방식) 내용 해시"""
+    params = {'model': model, 'prompt': prompt, 'temperature': temperature, 'max_tokens': max_tokens}
+    if system:
+        params['system'] = system
+    if mode:
+        params['mode'] = mode
+    payload = json.dumps(params, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LLMCache(DiskCache):
+    """AI 응답 디스크 캐시 (TTL + 개수 제한 LRU)"""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl_seconds=86400, max_entries=500):
+        super().__init__(cache_dir, ttl_seconds, max_entries)
@@ -4,45 +4,169 @@
 import os
 import sys
 import json
-from datetime import datetime
-import pytz
+import argparse
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from naver_crawler import NaverNewsCrawler
-from issue_generator import IssueGenerator
-from telegram_bot import send_to_telegram_simple, send_error_notification_telegram
+# anthropic/lxml 등 무거운 모듈은 필요한 실행 경로에서만 import (--drain-outbox 등 빠른 시작)
+import metrics
 
-def main():
-    """메인 실행: 네이버 뉴스 → 이슈 정리 → 텔레그램 전송"""
-    print("=== 네이버 뉴스 이슈 정리봇 시작 ===")
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CONFIG_PATH = os.path.join(ROOT_DIR, 'config.json')
+
+def load_config():
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    # 로그 레벨 / 구간 지표 JSON lines 파일
+    metrics_config = config.get('metrics', {})
+    jsonl_path = metrics_config.get('jsonl_path')
+    metrics.configure(
+        log_level=metrics_config.get('log_level'),
+        jsonl_path=os.path.join(ROOT_DIR, jsonl_path) if jsonl_path else None,
+        jsonl_max_bytes=metrics_config.get('jsonl_max_bytes'),
+        jsonl_backups=metrics_config.get('jsonl_backups'),
+    )
+    return config
+
+def write_metrics(config):
+    """실행 끝 구간 요약 출력 + Prometheus 텍스트 파일 저장 (설정된 경우)"""
+    print(f"⏱️ 구간별 시간: {metrics.summary()}")
+    prometheus_path = config.get('metrics', {}).get('prometheus_path')
+    if prometheus_path:
+        metrics.write_prometheus(os.path.join(ROOT_DIR, prometheus_path))
+
+def create_outbox(config):
+    """전송 보관함 (설정에서 끄면 None)"""
+    from outbox import Outbox
     
-    # 환경 변수 확인
+    outbox_config = config.get('outbox', {})
+    if not outbox_config.get('enabled', True):
+        return None
+    
+    return Outbox(
+        max_attempts=outbox_config.get('max_attempts', 5),
+        max_age_hours=outbox_config.get('max_age_hours', 12),
+        lease_seconds=outbox_config.get('lease_seconds', 120),
+    )
+
+def drain_outbox():
+    """보관함에 남은 미전송 내용만 다시 전송 (크롤링/생성 없음)"""
+    from outbox import deliver_pending
+    
+    config = load_config()
+    outbox = create_outbox(config)
+    if not outbox:
+        print("보관함이 꺼져 있습니다.")
+        return
+    
+    results = deliver_pending(outbox, timeout=config.get('notifications', {}).get('timeout', 30))
+    print(f"📮 재전송 {len(results)}건, 남은 미전송 {outbox.pending_count()}건")
+    if outbox.unknown_count():
+        print(f"❓ 전송 여부 불명 {outbox.unknown_count()}건 (응답 전 타임아웃 - 중복을 피해 자동 재전송 안 함)")
+    if outbox.pending_count():
+        sys.exit(1)
+
+def fail(error_msg, time_slot):
+    """오류 출력 + 텔레그램 알림"""
+    from telegram_bot import send_error_notification_telegram
+    
+    print(f"❌ {error_msg}")
+    send_error_notification_telegram(error_msg, time_slot)
+    return False
+
+def check_env():
+    """필수 환경 변수 확인"""
     required_env = ['CLAUDE_API_KEY', 'TELEGRAM_BOT_TOKEN', 'TELEGRAM_CHAT_ID']
     missing_env = [env for env in required_env if not os.getenv(env)]
     
     if missing_env:
         print(f"❌ 필수 환경 변수 누락: {missing_env}")
         sys.exit(1)
+
+def create_digest(config):
+    """일간 요약 저장소 (설정에서 끄면 None)"""
+    from daily_digest import create_digest_store
+    
+    return create_digest_store(config.get('digest', {}), ROOT_DIR)
+
+def send_digest(digest, config, outbox=None, day=None):
+    """쌓아 둔 일간 요약을 Discord/Slack으로 전송 (이전 시간대 다시 읽기/생성 없음)"""
+    from daily_digest import build_digest_thread_data
+    from notifiers import dispatch, get_notifiers
+    from outbox import deliver_pending
+    
+    summary = digest.get(day)
+    if not summary:
+        print(f"일간 요약 없음: {day or '오늘'}")
+        return False
+    
+    digest_config = config.get('digest', {})
+    timeout = config.get('notifications', {}).get('timeout', 30)
+    thread_data = build_digest_thread_data(summary)
+    # 텔레그램은 스레드 복사용이라 요약은 보내지 않음
+    destinations = digest_config.get('destinations', ['discord', 'slack'])
+    notifiers = [notifier for notifier in get_notifiers() if notifier.name in destinations]
+    if not notifiers:
+        print("일간 요약을 보낼 대상 없음")
+        return False
+    
+    print(f"\n📊 일간 요약 전송 중... (쓰레드 {summary['thread_count']}개)")
+    if outbox:
+        entry_id = outbox.enqueue(thread_data, [notifier.name for notifier in notifiers])
+        results = deliver_pending(outbox, [entry_id], timeout).get(entry_id, [])
+    else:
+        results = dispatch(thread_data, notifiers, timeout=timeout)
+    return any(result['success'] for result in results)
+
+def create_enricher(config):
+    """기사 본문 수집기 (설정에서 끄면 None)"""
+    from article_fetcher import create_article_fetcher
+    
+    return create_article_fetcher(config.get('enrichment', {}))
+
+def run_slot(current_schedule, crawler, generator, outbox, config, article_fetcher=None, digest=None):
+    """시간대 1회 실행: 네이버 뉴스 → 이슈 정리 → 전송 → 일간 요약 갱신 (성공 여부 반환)"""
+    from notifiers import build_thread_data, dispatch, get_notifiers
+    from outbox import deliver_pending
+    from http_client import get_handshake_stats, reset_handshake_stats
+    
+    timeout = config.get('notifications', {}).get('timeout', 30)
+    reset_handshake_stats()
+    
+    # 0. 이전 실행에서 못 보낸 내용 먼저 전송 (다시 생성하지 않음)
+    if outbox:
+        try:
+            deliver_pending(outbox, timeout=timeout)
+        except Exception as e:
+            print(f"❌ 보관함 재전송 오류: {e}")
     
     try:
         # 1. 네이버 뉴스 수집
         print("📰 네이버 뉴스 수집 중...")
-        crawler = NaverNewsCrawler()
-        current_schedule = crawler.get_current_schedule()
         news_items = crawler.get_naver_news(current_schedule)
+        archive_run_id = crawler.archive_run_id
 
         if not news_items:
-            error_msg = "네이버 뉴스 수집 실패"
-            print(f"❌ {error_msg}")
-            send_error_notification_telegram(error_msg, current_schedule)
-            sys.exit(1)
+            return fail("네이버 뉴스 수집 실패", current_schedule)
         
         print(f"✅ {len(news_items)}개 뉴스 수집 완료")
         
+        # 1-1. 상위 뉴스 기사 본문 추가 (시간 예산 안에서만, 실패하면 제목만으로 생성)
+        enrichment_config = config.get('enrichment', {})
+        if article_fetcher and current_schedule in enrichment_config.get('slots', ['20:00']):
+            from article_fetcher import enrich_news_items
+            try:
+                news_items = enrich_news_items(news_items, article_fetcher, enrichment_config.get('max_articles', 3))
+            except Exception as e:
+                print(f"기사 본문 수집 오류: {e}")
+        
+        # 재현(--replay)이 이력/인기 점수/본문까지 반영된 같은 입력으로 프롬프트를 다시 만들도록 보관
+        if archive_run_id:
+            crawler.archive_inputs(archive_run_id, news_items, generator.build_prompt(news_items, current_schedule))
+        
         # 2. 이슈 정리 생성
         print("📝 이슈 정리 생성 중...")
-        generator = IssueGenerator()
         
         if current_schedule == '20:00':
             # 핫이슈 생성
@@ -52,33 +176,283 @@ def main():
             content = generator.generate_issue_list(news_items, current_schedule)
         
         if not content:
-            error_msg = "이슈 정리 생성 실패"
-            print(f"❌ {error_msg}")
-            send_error_notification_telegram(error_msg, current_schedule)
-            sys.exit(1)
+            return fail("이슈 정리 생성 실패", current_schedule)
         
         # 3. 생성 결과 출력
         print(f"\n=== 생성된 이슈 정리 ({current_schedule}) ===")
         print(content)
         
-        # 4. 텔레그램 전송 (본문만)
-        print("\n📤 텔레그램 전송 중...")
-        success = send_to_telegram_simple(content)
+        # 4. 텔레그램/Discord/Slack 동시 전송 (텔레그램은 본문만)
+        print("\n📤 전송 중...")
+        category = config['news_sources'].get(current_schedule, {}).get('category', '')
+        thread_data = build_thread_data(content, current_schedule, category, news_items)
         
-        if success:
-            print("✅ 텔레그램 전송 성공!")
-            print("📱 텔레그램에서 복사해서 스레드에 붙여넣으세요!")
+        if outbox:
+            # 전송 전에 먼저 저장 (실패하거나 중간에 죽어도 다음 실행에서 남은 곳만 재전송)
+            entry_id = outbox.enqueue(thread_data, [notifier.name for notifier in get_notifiers()])
+            # 저장됐으면 전송은 보관함이 마무리하므로 이번 후보를 이력에 기록
+            crawler.record_history()
+            results = deliver_pending(outbox, [entry_id], timeout).get(entry_id, [])
+            delivered = outbox.undelivered_count(entry_id) == 0 or any(result['success'] for result in results)
         else:
-            error_msg = "텔레그램 전송 실패"
-            print(f"❌ {error_msg}")
-            send_error_notification_telegram(error_msg, current_schedule)
-            sys.exit(1)
+            results = dispatch(thread_data, timeout=timeout)
+            delivered = any(result['success'] for result in results)
+            if delivered:
+                crawler.record_history()
+        
+        if not delivered:
+            return fail("전송 실패: " + ", ".join(result['name'] for result in results), current_schedule)
+        
+        print("✅ 전송 성공!")
+        print("📱 텔레그램에서 복사해서 스레드에 붙여넣으세요!")
+        
+        # 5. 일간 요약에 추가 (마지막 시간대면 요약 전송, 실패해도 이번 실행은 성공)
+        if digest:
+            try:
+                digest.append(thread_data)
+                digest.prune()
+                if current_schedule == config.get('digest', {}).get('send_after_slot', '20:00'):
+                    send_digest(digest, config, outbox)
+            except Exception as e:
+                print(f"❌ 일간 요약 오류: {e}")
+        
+        # 연결 재사용 확인 (호스트별 새 연결 수)
+        print(f"🔌 HTTP 새 연결 수: {get_handshake_stats()}")
+        if generator.cache:
+            print(f"💾 AI 응답 캐시: {generator.cache.stats()}")
+        return True
 
     except Exception as e:
-        error_msg = f"예상치 못한 오류: {str(e)}"
-        print(f"❌ {error_msg}")
-        send_error_notification_telegram(error_msg, current_schedule if 'current_schedule' in locals() else 'Unknown')
+        return fail(f"예상치 못한 오류: {str(e)}", current_schedule)
+
+def main():
+    """메인 실행: 네이버 뉴스 → 이슈 정리 → 텔레그램/Discord/Slack 전송"""
+    print("=== 네이버 뉴스 이슈 정리봇 시작 ===")
+    check_env()
+    config = load_config()
+    from naver_crawler import NaverNewsCrawler
+    from issue_generator import IssueGenerator
+    
+    try:
+        crawler = NaverNewsCrawler()
+        generator = IssueGenerator()
+        outbox = create_outbox(config)
+        article_fetcher = create_enricher(config)
+        digest = create_digest(config)
+    except Exception as e:
+        fail(f"초기화 오류: {str(e)}", 'Unknown')
         sys.exit(1)
+    
+    current_schedule = crawler.get_current_schedule()
+    success = run_slot(current_schedule, crawler, generator, outbox, config, article_fetcher, digest)
+    write_metrics(config)
+    if not success:
+        sys.exit(1)
+
+def diff_inputs(news_items, recorded):
+    """다시 파싱한 뉴스 목록과 실제 실행이 생성에 넘긴 입력 비교 → 차이 설명 목록 (같으면 빈 목록)"""
+    def key(item):
+        return item.get('link') or item['title']
+
+    replayed = {key(item): item for item in news_items}
+    live = {key(item): item for item in recorded}
+    changes = []
+    added = [k for k in replayed if k not in live]
+    removed = [k for k in live if k not in replayed]
+    if added:
+        changes.append(f"추가 {len(added)}개")
+    if removed:
+        changes.append(f"빠짐 {len(removed)}개")
+    if [k for k in replayed if k in live] != [k for k in live if k in replayed]:
+        changes.append("순서 다름")
+    retitled = sum(1 for k in replayed if k in live and replayed[k]['title'] != live[k]['title'])
+    if retitled:
+        changes.append(f"제목 다름 {retitled}개")
+    return changes
+
+def with_recorded_bodies(news_items, recorded):
+    """기사 본문은 보관된 페이지에 없으므로 실제 실행 입력에 있던 본문을 같은 링크에 붙임"""
+    bodies = {item['link']: item['body'] for item in recorded if item.get('link') and item.get('body')}
+    return [dict(item, body=bodies[item['link']]) if item.get('link') in bodies else item for item in news_items]
+
+def replay_run(crawler, generator, archive, run, call_llm=False):
+    """보관된 실행 1회를 페이지부터 다시 파싱해서 재현 → 결과 dict (뉴스 0개면 None)
+    
+    항상 보관된 랭킹 페이지를 crawler로 다시 파싱하고(파서/묶기/인기 점수 변경 확인),
+    입력 기록이 있으면 실제 실행의 뉴스 목록/프롬프트 해시와 비교한다.
+    """
+    from snapshot_archive import prompt_hash
+    
+    crawler.load_replay(archive.load_pages(run['id']), run['started_at'])
+    news_items = crawler.get_naver_news(run['time_slot'])
+    if not news_items:
+        return None
+    
+    recorded, live_hash = archive.load_inputs(run['id']) or (None, None)
+    changes = None
+    if recorded is not None:
+        news_items = with_recorded_bodies(news_items, recorded)
+        changes = diff_inputs(news_items, recorded)
+    
+    prompt, content = generator.dry_run(news_items, run['time_slot'])
+    if call_llm and not content:
+        if run['time_slot'] == '20:00':
+            content = generator.generate_hot_issue(news_items)
+        else:
+            content = generator.generate_issue_list(news_items, run['time_slot'])
+    
+    return {
+        'news_items': news_items,
+        'changes': changes,
+        'prompt': prompt,
+        'prompt_hash': prompt_hash(prompt),
+        'live_hash': live_hash,
+        'content': content,
+    }
+
+def replay(prefix, call_llm=False):
+    """보관된 랭킹 페이지로 프롬프트/생성 재현 (수집 요청/전송 없음)
+    
+    실행마다 페이지를 다시 파싱하고, 입력 기록이 있으면 실제 실행의 입력/프롬프트 해시와 차이를 출력한다.
+    (재현에는 이력 반영이 없으므로 반복 뉴스를 밀어낸 실행은 입력이 다르게 나올 수 있음)
+    
+    prefix: 실행 시각 앞부분 ('2026-10-18T12:00' 1회, '2026-10-18' 하루, '2026-10' 한 달)
+    call_llm: 캐시에 없는 결과를 실제 AI 요청으로 생성 (기본은 프롬프트만 확인)
+    """
+    import time
+    from naver_crawler import NaverNewsCrawler
+    from issue_generator import IssueGenerator
+    from prompt_builder import count_tokens
+    from snapshot_archive import create_archive
+    
+    config = load_config()
+    archive = create_archive(dict(config.get('archive', {}), enabled=True), ROOT_DIR)
+    runs = archive.find_runs(prefix)
+    if not runs:
+        print(f"❌ 보관된 실행 없음: {prefix}")
+        sys.exit(1)
+    
+    print(f"=== 재현: {prefix} ({len(runs)}회) ===")
+    crawler = NaverNewsCrawler()
+    generator = IssueGenerator()
+    started = time.perf_counter()
+    failed = 0
+    mismatched = 0
+    
+    # 인기 점수가 이전 실행 상태에 이어지도록 실행 순서대로
+    for run in runs:
+        result = replay_run(crawler, generator, archive, run, call_llm)
+        if not result:
+            failed += 1
+            print(f"🔁 {run['run_time']} ({run['time_slot']}) 뉴스 0개 - 수집 실패")
+            continue
+        
+        if result['changes'] is None:
+            inputs = '입력 기록 없음'
+        else:
+            inputs = '입력 같음' if not result['changes'] else '입력 다름: ' + ', '.join(result['changes'])
+        if result['live_hash'] is None:
+            match = '비교 대상 없음'
+        elif result['prompt_hash'] == result['live_hash']:
+            match = '실제 실행과 같음'
+        else:
+            match = f"실제 실행 {result['live_hash']}와 다름"
+        if result['changes'] or (result['live_hash'] and result['prompt_hash'] != result['live_hash']):
+            mismatched += 1
+        
+        print(f"🔁 {run['run_time']} ({run['time_slot']}) 뉴스 {len(result['news_items'])}개 ({inputs}), "
+              f"프롬프트 {result['prompt_hash']} {count_tokens(result['prompt'])}토큰 ({match}), "
+              f"결과 {'있음' if result['content'] else '없음'}")
+        if result['content'] and len(runs) == 1:
+            print(result['content'])
+    
+    print(f"⏱️ {len(runs)}회 재현 {time.perf_counter() - started:.2f}초, 수집 실패 {failed}회, 실제 실행과 다름 {mismatched}회")
+    if failed:
+        sys.exit(1)
+
+def generate_slots(crawler, generator, slots, mode=None, batches=None):
+    """여러 시간대를 수집한 뒤 결과를 묶음 요청 1번(또는 Message Batches)으로 생성 → {시간대: 결과 또는 None}"""
+    variants = []
+    for slot in slots:
+        news_items = crawler.get_naver_news(slot)
+        if not news_items:
+            print(f"❌ {slot} 뉴스 수집 실패")
+            continue
+        # 작업 ID는 '### 작업ID' 구분 줄에 쓰이므로 영문/숫자만
+        variants.append(dict(generator._slot_variant(news_items, slot), id='slot_' + slot.replace(':', '')))
+    
+    results = generator.generate_batch(variants, mode, batches) if variants else {}
+    return {slot: results.get('slot_' + slot.replace(':', '')) for slot in slots}
+
+def run_batch(slots, mode=None):
+    """시간대별 결과를 한 번에 미리 생성해서 출력 (전송/보관/이력 기록 없음)"""
+    config = load_config()
+    from naver_crawler import NaverNewsCrawler
+    from issue_generator import IssueGenerator
+    
+    crawler = NaverNewsCrawler()
+    crawler.archive = None
+    generator = IssueGenerator()
+    slots = slots or sorted(config['news_sources'])
+    
+    results = generate_slots(crawler, generator, slots, mode)
+    for slot, content in results.items():
+        print(f"\n=== {slot} ===")
+        print(content or "❌ 생성 실패")
+    write_metrics(config)
+    if not all(results.values()):
+        sys.exit(1)
+
+def run_daemon():
+    """상주 실행: 클라이언트/HTTP 연결/캐시를 한 번만 만들고 시간대마다 실행"""
+    print("=== 네이버 뉴스 이슈 정리봇 상주 실행 ===")
+    check_env()
+    config = load_config()
+    daemon_config = config.get('daemon', {})
+    from naver_crawler import NaverNewsCrawler
+    from issue_generator import IssueGenerator
+    from daemon import NewsDaemon
+    
+    crawler = NaverNewsCrawler()
+    generator = IssueGenerator()
+    outbox = create_outbox(config)
+    article_fetcher = create_enricher(config)
+    digest = create_digest(config)
+    
+    daemon = NewsDaemon(
+        lambda slot: run_slot(slot, crawler, generator, outbox, config, article_fetcher, digest),
+        slots=sorted(config['news_sources']),
+        host=daemon_config.get('host', '127.0.0.1'),
+        port=daemon_config.get('port', 8080),
+        # 시간대 사이에도 랭킹을 주기적으로 받아 순위 변화 추적
+        poll=crawler.poll_trends if crawler.trend_scorer else None,
+        poll_seconds=daemon_config.get('poll_minutes', 15) * 60,
+    )
+    daemon.serve_forever()
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="네이버 뉴스 이슈 정리봇")
+    parser.add_argument('--drain-outbox', action='store_true', help="보관함의 미전송 내용만 재전송")
+    parser.add_argument('--daemon', action='store_true', help="상주 실행 (내부 스케줄러 + /health, /metrics)")
+    parser.add_argument('--send-digest', nargs='?', const='', metavar='DAY', help="쌓아 둔 일간 요약만 전송 (기본 오늘, 예: 2026-10-18)")
+    parser.add_argument('--replay', metavar='TIMESTAMP', help="보관된 랭킹 페이지로 재현 (예: 2026-10-18T12:00, 2026-10)")
+    parser.add_argument('--replay-llm', action='store_true', help="재현 시 캐시에 없는 결과를 AI로 생성")
+    parser.add_argument('--batch', nargs='*', metavar='SLOT', help="여러 시간대 결과를 한 번에 미리 생성 (전송 없음, 기본 전체 시간대)")
+    parser.add_argument('--batch-mode', choices=['combined', 'batches'], help="--batch 생성 방식 (기본 generation.batch_mode)")
+    args = parser.parse_args()
+    
+    if args.batch is not None:
+        run_batch(args.batch, args.batch_mode)
+    elif args.replay:
+        replay(args.replay, args.replay_llm)
+    elif args.send_digest is not None:
+        config = load_config()
+        digest = create_digest(dict(config, digest=dict(config.get('digest', {}), enabled=True)))
+        if not send_digest(digest, config, create_outbox(config), args.send_digest or None):
+            sys.exit(1)
+    elif args.drain_outbox:
+        drain_outbox()
+    elif args.daemon:
+        run_daemon()
+    else:
+        main()
@@ -0,0 +1,40 @@
+import itertools
+from types import SimpleNamespace
+
+
+class LocalMessageBatches:
+    """Message Batches API 로컬 대체 (client.messages.batches 와 같은 create/retrieve/results)
+
+    요청을 create 시점에 일반 messages.create로 바로 처리해서 결과를 보관한다.
+    오프라인 확인이나 가짜 Messages 서버와 같이 쓸 때 사용.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, messages_client):
+        self.messages_client = messages_client
+        self._batches = {}
+
+    def create(self, requests):
+        batch_id = f"msgbatch_local_{next(self._ids)}"
+        results = []
+        for request in requests:
+            # 배치 요청 params는 API 본문 형식 → SDK에 없는 temperature 인자는 요청 본문으로
+            params = dict(request['params'])
+            if 'temperature' in params:
+                params['extra_body'] = {'temperature': params.pop('temperature')}
+            try:
+                message = self.messages_client.create(**params)
+                result = SimpleNamespace(type='succeeded', message=message)
+            except Exception as e:
+                result = SimpleNamespace(type='errored', error=str(e))
+            results.append(SimpleNamespace(custom_id=request['custom_id'], result=result))
+
+        self._batches[batch_id] = results
+        return self.retrieve(batch_id)
+
+    def retrieve(self, batch_id):
+        return SimpleNamespace(id=batch_id, processing_status='ended')
+
+    def results(self, batch_id):
+        return iter(self._batches[batch_id])
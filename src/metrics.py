@@ -0,0 +1,146 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30}
+
+_state = {
+    'log_level': LOG_LEVELS.get(os.getenv('NEWS_BOT_LOG_LEVEL', 'INFO').upper(), 20),
+    'jsonl_path': None,
+    # 파일이 이 크기를 넘으면 .1, .2 ...로 밀어내고 새 파일 (backups개까지만 보관)
+    'jsonl_max_bytes': 1024 * 1024,
+    'jsonl_backups': 1,
+    'jsonl_size': 0,
+}
+_lock = threading.Lock()
+
+# 구간별 누적 (Prometheus 출력용): 이름 → {'count', 'errors', 'seconds'}
+_spans = {}
+# 카운터 (토큰 수, 재시도 등): (이름, 라벨) → 값
+_counters = {}
+
+
+def configure(log_level=None, jsonl_path=None, jsonl_max_bytes=None, jsonl_backups=None):
+    """로그 레벨과 JSON lines 출력 파일 설정 (환경 변수 NEWS_BOT_LOG_LEVEL 우선)"""
+    level = os.getenv('NEWS_BOT_LOG_LEVEL') or log_level
+    if level:
+        _state['log_level'] = LOG_LEVELS.get(level.upper(), 20)
+    if jsonl_max_bytes is not None:
+        _state['jsonl_max_bytes'] = jsonl_max_bytes
+    if jsonl_backups is not None:
+        _state['jsonl_backups'] = jsonl_backups
+    if jsonl_path:
+        os.makedirs(os.path.dirname(os.path.abspath(jsonl_path)), exist_ok=True)
+        with _lock:
+            _state['jsonl_path'] = jsonl_path
+            _state['jsonl_size'] = os.path.getsize(jsonl_path) if os.path.exists(jsonl_path) else 0
+
+
+def is_debug():
+    return _state['log_level'] <= LOG_LEVELS['DEBUG']
+
+
+def debug(message):
+    """디버그 레벨일 때만 출력 (AI 응답 전문 등 자세한 로그)"""
+    if is_debug():
+        print(message)
+
+
+def _rotate(path):
+    """path → path.1 → path.2 ... (backups개 넘는 가장 오래된 파일은 삭제)"""
+    backups = _state['jsonl_backups']
+    if backups <= 0:
+        os.remove(path)
+        return
+    for index in range(backups - 1, 0, -1):
+        if os.path.exists(f"{path}.{index}"):
+            os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+    os.replace(path, f"{path}.1")
+
+
+def _emit(record):
+    if not _state['jsonl_path']:
+        return
+    line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+    with _lock:
+        path = _state['jsonl_path']
+        max_bytes = _state['jsonl_max_bytes']
+        if max_bytes and _state['jsonl_size'] and _state['jsonl_size'] + len(line) > max_bytes:
+            _rotate(path)
+            _state['jsonl_size'] = 0
+        with open(path, 'ab') as f:
+            f.write(line)
+        _state['jsonl_size'] += len(line)
+
+
+def increment(name, value=1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+@contextmanager
+def span(name, **attrs):
+    """구간 시간 측정 - with 블록 안에서 attrs에 값(토큰 수 등)을 추가할 수 있음"""
+    started = time.perf_counter()
+    error = None
+    try:
+        yield attrs
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        with _lock:
+            stats = _spans.setdefault(name, {'count': 0, 'errors': 0, 'seconds': 0.0})
+            stats['count'] += 1
+            stats['errors'] += error is not None
+            stats['seconds'] += duration
+
+        record = {'ts': round(time.time(), 3), 'span': name, 'duration_ms': round(duration * 1000, 2)}
+        record.update(attrs)
+        if error is not None:
+            record['error'] = str(error)
+        _emit(record)
+        debug(f"⏱️ {name} {record['duration_ms']}ms {attrs}")
+
+
+def _label_text(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+def prometheus_text():
+    """누적 지표를 Prometheus 텍스트 형식으로"""
+    lines = []
+    with _lock:
+        if _spans:
+            lines.append('# TYPE news_bot_span_seconds summary')
+            for name, stats in sorted(_spans.items()):
+                lines.append(f'news_bot_span_seconds_count{{span="{name}"}} {stats["count"]}')
+                lines.append(f'news_bot_span_seconds_sum{{span="{name}"}} {stats["seconds"]:.6f}')
+            lines.append('# TYPE news_bot_span_errors_total counter')
+            for name, stats in sorted(_spans.items()):
+                lines.append(f'news_bot_span_errors_total{{span="{name}"}} {stats["errors"]}')
+
+        for (name, labels), value in sorted(_counters.items()):
+            lines.append(f'news_bot_{name.replace(".", "_")}_total{_label_text(labels)} {value}')
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def write_prometheus(path):
+    """node_exporter textfile 수집용 파일 저장"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(prometheus_text())
+    os.replace(tmp_path, path)
+
+
+def summary():
+    """구간별 횟수/총 시간 (실행 끝 요약 출력용)"""
+    with _lock:
+        return {name: {'count': stats['count'], 'seconds': round(stats['seconds'], 3)} for name, stats in _spans.items()}
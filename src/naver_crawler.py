@@ -1,22 +1,92 @@
-import requests
-from bs4 import BeautifulSoup
+import http_client
 import json
+import os
+import time
 from datetime import datetime
-import pytz
+from concurrent.futures import ThreadPoolExecutor
+from threading import BoundedSemaphore, Lock
+from urllib.parse import urlparse
+from zoneinfo import ZoneInfo
+from response_cache import ResponseCache, content_hash
+from html_extractor import extract_ranking_news
+from history_store import HistoryStore
+from headline_cluster import MinHashLSH, cluster_headlines
+from snapshot_archive import create_archive
+from trend_score import create_trend_scorer, order_by_trend
+from coverage_pipeline import crawl_full_coverage
+import metrics
+
+RANKING_URL = "https://news.naver.com/main/ranking/popularDay.naver"
+# 주기 수집(poll_trends)에서 대신 쓰는 가벼운 소스 타입 (전체 수집은 페이지 8개라 실제 실행에서만)
+POLL_SOURCE_TYPES = {'naver_ranking_full': 'naver_ranking'}
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+CONFIG_PATH = os.path.join(ROOT_DIR, 'config.json')
+KST = ZoneInfo('Asia/Seoul')
 
 class NaverNewsCrawler:
     def __init__(self):
-        with open('../config.json', 'r', encoding='utf-8') as f:
+        with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
             self.config = json.load(f)
         
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        
+        # 동시 수집 설정 (전체 워커 수, 호스트별 동시 요청 수)
+        crawler_config = self.config.get('crawler', {})
+        self.max_workers = crawler_config.get('max_workers', 8)
+        self.per_host_limit = crawler_config.get('per_host_limit', 4)
+        self.extractor = crawler_config.get('extractor', 'lxml')
+        self.candidate_limit = crawler_config.get('candidate_limit', 15)
+        self.max_sections = crawler_config.get('max_sections', 3)
+        self.per_section = crawler_config.get('per_section', 5)
+        # 전체 수집 모드 (naver_ranking_full): 모든 언론사 박스 + 섹션별 랭킹 페이지
+        self.full_coverage = crawler_config.get('full_coverage', {})
+        self._host_semaphores = {}
+        self._host_lock = Lock()
+        
+        # 랭킹 페이지 응답 캐시 (조건부 요청 + 본문 해시)
+        cache_config = self.config.get('http_cache', {})
+        self.response_cache = None
+        if cache_config.get('enabled', True):
+            self.response_cache = ResponseCache(ttl_seconds=cache_config.get('ttl_seconds', 300))
+        
+        # 이전 시간대에 나온 뉴스 이력 (반복 요약 방지)
+        self.history_config = self.config.get('history', {})
+        self.history_store = None
+        if self.history_config.get('enabled', True):
+            self.history_store = HistoryStore()
+        # 이번 실행 후보 - 보관함에 저장된 뒤 record_history()로 기록
+        self.history_candidates = []
+        
+        # 같은 사건의 언론사별 제목 묶기
+        cluster_config = self.config.get('clustering', {})
+        self.lsh = None
+        if cluster_config.get('enabled', True):
+            self.lsh = MinHashLSH(threshold=cluster_config.get('threshold', 0.5))
+        
+        # 수집할 때마다 순위 변화로 인기 점수 갱신 (빠르게 오르는 뉴스 우선)
+        self.trend_config = self.config.get('trends', {})
+        self.trend_scorer = create_trend_scorer(self.trend_config, ROOT_DIR, out_rank=self.candidate_limit + 1)
+        
+        # 받은 랭킹 페이지 원본 보관 (--replay 재현용)
+        self.archive = create_archive(self.config.get('archive', {}), ROOT_DIR)
+        self.archive_run_id = None
+        # 재현 모드: 요청 대신 보관된 페이지 사용 {url: 본문}
+        self.replay_pages = None
+        # 재현 모드에서 인기 점수 계산에 쓰는 수집 시각
+        self.replay_time = None
+        
+        # 소스 타입별 수집 함수 (config.json의 sources[].type)
+        self.source_handlers = {
+            'naver_ranking': self.crawl_naver_ranking_news,
+            'naver_hot_issue': self.crawl_naver_hot_issue,
+            'naver_ranking_full': self.crawl_naver_ranking_full,
+        }
     
     def get_current_schedule(self):
         """현재 시간에 맞는 스케줄 반환"""
-        kst = pytz.timezone('Asia/Seoul')
-        now = datetime.now(kst)
+        now = datetime.now(KST)
         current_hour = now.strftime('%H:00')
         
         schedules = ['07:00', '12:00', '18:00', '20:00']
@@ -32,48 +102,237 @@ class NaverNewsCrawler:
         
         return current_hour
     
-    def crawl_naver_ranking_news(self, limit=10):
+    def _host_semaphore(self, url):
+        """호스트별 동시 요청 제한용 세마포어"""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = BoundedSemaphore(self.per_host_limit)
+            return self._host_semaphores[host]
+    
+    def _fetch(self, url, headers=None):
+        """호스트별 동시 요청 수를 지키면서 페이지 요청"""
+        with self._host_semaphore(url):
+            with metrics.span('crawl.fetch', url=url) as attrs:
+                response = http_client.get(url, headers=headers or self.headers)
+                attrs['status'] = response.status_code
+                attrs['bytes'] = len(response.content)
+                return response
+    
+    def parse_ranking_page(self, content, limit=10):
+        """랭킹 페이지 HTML에서 상위 뉴스 추출"""
+        with metrics.span('crawl.parse', backend=self.extractor) as attrs:
+            news_items = extract_ranking_news(content, limit, self.extractor, self.max_sections, self.per_section)
+            attrs['items'] = len(news_items)
+            return news_items
+    
+    def _parse_key(self, limit):
+        """캐시된 파싱 결과 구분용 키 (추출 범위가 바뀌면 다시 파싱)"""
+        return f"{limit}:{self.max_sections}:{self.per_section}"
+    
+    def load_replay(self, pages, captured_at=None):
+        """재현 모드로 전환 - 요청/캐시/이력/보관 없이 보관된 페이지만 파싱
+        
+        인기 점수는 메모리에서 보관 시각(captured_at) 기준으로 다시 계산 (실행 순서대로 불러야 같은 결과)
+        """
+        if self.trend_scorer and self.replay_pages is None:
+            self.trend_scorer = create_trend_scorer(dict(self.trend_config, path=':memory:'), ROOT_DIR, out_rank=self.candidate_limit + 1)
+        self.replay_pages = pages
+        self.replay_time = captured_at
+        self.response_cache = None
+        self.history_store = None
+        self.archive = None
+    
+    def archive_inputs(self, run_id, news_items, prompt=None):
+        """이번 실행에서 생성에 넘긴 최종 뉴스 목록/프롬프트 보관 (재현이 같은 입력을 쓰도록, 실패해도 계속)"""
+        if not self.archive or not run_id:
+            return
+        try:
+            self.archive.record_inputs(run_id, news_items, prompt)
+        except Exception as e:
+            print(f"생성 입력 보관 오류: {e}")
+    
+    def _archive_page(self, url, body):
+        """이번 실행에서 받은 페이지 보관 (실패해도 수집은 계속)"""
+        if not self.archive or not self.archive_run_id or not body:
+            return
+        try:
+            self.archive.record(self.archive_run_id, url, body)
+        except Exception as e:
+            print(f"랭킹 페이지 보관 오류: {e}")
+    
+    def crawl_naver_ranking_news(self, limit=10, url=RANKING_URL):
         """네이버 뉴스 랭킹에서 상위 뉴스 수집"""
         try:
-            url = "https://news.naver.com/main/ranking/popularDay.naver"
-            response = requests.get(url, headers=self.headers)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            if self.replay_pages is not None:
+                if url not in self.replay_pages:
+                    print(f"보관된 페이지 없음: {url}")
+                    return []
+                return self.parse_ranking_page(self.replay_pages[url], limit)
             
-            news_items = []
+            if self.response_cache:
+                return self._crawl_cached(url, limit)
             
-            # 랭킹 뉴스 추출 (여러 섹션에서)
-            ranking_sections = soup.select('.rankingnews_box')
-            
-            for section in ranking_sections[:3]:  # 상위 3개 언론사
-                news_links = section.select('.list_title')
-                
-                for link in news_links[:5]:  # 각 언론사에서 5개씩
-                    title = link.get_text(strip=True)
-                    news_url = link.get('href', '')
-                    
-                    if title and len(title) > 10:  # 너무 짧은 제목 제외
-                        if news_url.startswith('/'):
-                            news_url = f"https://news.naver.com{news_url}"
-                        
-                        news_items.append({
-                            'title': title,
-                            'link': news_url,
-                            'source': '네이버뉴스',
-                            'rank': len(news_items) + 1
-                        })
-                        
-                        if len(news_items) >= limit:
-                            break
-                
-                if len(news_items) >= limit:
-                    break
-            
-            return news_items[:limit]
+            response = self._fetch(url)
+            if response.status_code == 200:
+                self._archive_page(url, response.content)
+            return self.parse_ranking_page(response.content, limit)
             
         except Exception as e:
             print(f"네이버 뉴스 크롤링 오류: {e}")
             return []
     
+    def _cached_items(self, url, entry, limit):
+        """캐시된 파싱 결과 반환 (이 limit으로 파싱한 적 없으면 저장된 본문 파싱)"""
+        key = self._parse_key(limit)
+        if key in entry['parsed']:
+            self.response_cache.touch(url, entry)
+            return entry['parsed'][key]
+        
+        news_items = self.parse_ranking_page(self.response_cache.get_body(url), limit)
+        self.response_cache.touch(url, entry, {key: news_items})
+        return news_items
+    
+    def _crawl_cached(self, url, limit):
+        """TTL 이내면 요청 생략, 304 또는 본문 해시가 같으면 파싱 생략"""
+        cache = self.response_cache
+        entry = cache.get(url)
+        
+        if entry and cache.is_fresh(entry):
+            print(f"랭킹 캐시 사용 (TTL 이내): {url}")
+            if self.archive:
+                self._archive_page(url, cache.get_body(url))
+            return self._cached_items(url, entry, limit)
+        
+        headers = dict(self.headers)
+        if entry:
+            headers.update(cache.conditional_headers(entry))
+        
+        response = self._fetch(url, headers)
+        
+        if entry and response.status_code == 304:
+            print(f"랭킹 변경 없음 (304): {url}")
+            if self.archive:
+                self._archive_page(url, cache.get_body(url))
+            return self._cached_items(url, entry, limit)
+        
+        if response.status_code == 200:
+            self._archive_page(url, response.content)
+        
+        if entry and content_hash(response.content) == entry['content_hash']:
+            print(f"랭킹 변경 없음 (본문 해시 동일): {url}")
+            return self._cached_items(url, entry, limit)
+        
+        news_items = self.parse_ranking_page(response.content, limit)
+        if response.status_code == 200:
+            cache.store(url, response.headers, response.content, {self._parse_key(limit): news_items})
+        return news_items
+    
+    def crawl_naver_hot_issue(self, limit=1, url=RANKING_URL):
+        """핫이슈용 랭킹 최상위 뉴스 수집"""
+        return self.crawl_naver_ranking_news(limit=limit, url=url)
+    
+    def _page_body(self, url):
+        """랭킹 페이지 본문 (재현 모드면 보관본, 캐시가 있으면 조건부 요청) - 받은 페이지는 보관"""
+        if self.replay_pages is not None:
+            return self.replay_pages.get(url)
+        
+        cache = self.response_cache
+        entry = cache.get(url) if cache else None
+        if entry and cache.is_fresh(entry):
+            body = cache.get_body(url)
+        else:
+            headers = dict(self.headers)
+            if entry:
+                headers.update(cache.conditional_headers(entry))
+            response = self._fetch(url, headers)
+            if entry and response.status_code == 304:
+                body = cache.get_body(url)
+            else:
+                response.raise_for_status()
+                body = response.content
+                if cache:
+                    cache.store(url, response.headers, body, {})
+        
+        self._archive_page(url, body)
+        return body
+    
+    def crawl_naver_ranking_full(self, limit=10, url=RANKING_URL):
+        """전체 수집: 모든 언론사 박스와 섹션별 랭킹 페이지를 스트리밍으로 읽어 묶은 뒤 점수 상위 limit개"""
+        urls = list(dict.fromkeys([url] + self.full_coverage.get('section_urls', [])))
+        return crawl_full_coverage(
+            self._page_body,
+            urls,
+            limit,
+            lsh=self.lsh,
+            backend=self.extractor,
+            max_workers=min(self.full_coverage.get('max_workers', 4), self.per_host_limit),
+            max_clusters=self.full_coverage.get('max_clusters', 1000),
+            max_seen=self.full_coverage.get('max_seen', 10000),
+        )
+    
+    def _crawl_source(self, source, limit):
+        """config.json의 소스 1개 수집"""
+        handler = self.source_handlers.get(source.get('type'))
+        if not handler:
+            print(f"알 수 없는 소스 타입: {source.get('type')} ({source.get('name')})")
+            return []
+        
+        return handler(limit=limit, url=source.get('url', RANKING_URL))
+    
+    def _merge_ranked(self, results, limit):
+        """소스별 결과를 순위 기준으로 합치고 중복 링크 제거"""
+        candidates = []
+        for source_index, items in enumerate(results):
+            for item in items:
+                candidates.append((item['rank'], source_index, item))
+        candidates.sort(key=lambda candidate: (candidate[0], candidate[1]))
+        
+        merged = []
+        seen_links = set()
+        for _, _, item in candidates:
+            if item['link'] in seen_links:
+                continue
+            seen_links.add(item['link'])
+            merged.append(dict(item, rank=len(merged) + 1))
+            
+            if len(merged) >= limit:
+                break
+        
+        return merged
+    
+    def crawl_sources(self, time_slot, limit=10, archive=True, poll=False):
+        """시간대에 설정된 모든 소스를 동시에 수집해서 하나의 랭킹으로 합침
+        
+        poll: 주기 수집 - 무거운 소스는 POLL_SOURCE_TYPES의 가벼운 타입(첫 페이지만)으로 대신
+        """
+        slot_config = self.config.get('news_sources', {}).get(time_slot, {})
+        sources = slot_config.get('sources', [])
+        if poll:
+            sources = [dict(source, type=POLL_SOURCE_TYPES.get(source.get('type'), source.get('type'))) for source in sources]
+        
+        if not sources:
+            print(f"{time_slot} 시간대에 설정된 소스 없음")
+            return []
+        
+        # 이번 실행에서 받는 페이지를 (시각, 시간대)로 묶어 보관
+        self.archive_run_id = None
+        if self.archive and archive:
+            try:
+                self.archive.prune()
+                self.archive_run_id = self.archive.start_run(time_slot)
+            except Exception as e:
+                print(f"랭킹 보관소 오류: {e}")
+                self.archive_run_id = None
+        
+        # 가장 느린 소스 1개 시간 안에 끝나도록 소스 수만큼 동시 실행
+        workers = min(self.max_workers, len(sources))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self._crawl_source, source, limit) for source in sources]
+            results = [future.result() for future in futures]
+        
+        return self._merge_ranked(results, limit)
+    
     def get_naver_news(self, time_slot=None):
         """네이버 뉴스 수집"""
         if not time_slot:
@@ -82,8 +341,58 @@ class NaverNewsCrawler:
         # 핫이슈 시간대는 1개만, 나머지는 10개
         limit = 1 if time_slot == '20:00' else 10
         
-        news_items = self.crawl_naver_ranking_news(limit=limit)
-        return news_items
+        # 묶기/반복 뉴스 제외 후에도 개수가 남도록 후보를 넉넉히 수집
+        candidates = self.crawl_sources(time_slot, limit=max(limit, self.candidate_limit))
+        candidates = self._score_trends(candidates)
+        news_items = candidates
+        self.history_candidates = []
+        
+        if self.lsh:
+            news_items = cluster_headlines(news_items, self.lsh)
+        
+        if self.history_store and time_slot not in self.history_config.get('exclude_slots', []):
+            since = time.time() - self.history_config.get('window_hours', 12) * 3600
+            news_items = self.history_store.filter_repeats(news_items, since, self.history_config.get('mode', 'downrank'))
+            # 생성/저장 전에 실패한 실행의 후보가 재시도/다음 시간대에서 밀려나지 않도록 기록은 나중에
+            self.history_candidates = candidates
+        
+        if self.trend_scorer:
+            news_items = order_by_trend(news_items)
+        
+        return news_items[:limit]
+    
+    def record_history(self):
+        """이번 실행 후보를 이력에 기록 (보관함 저장 후 호출, 실패해도 전송은 계속)"""
+        candidates, self.history_candidates = self.history_candidates, []
+        if not self.history_store or not candidates:
+            return
+        try:
+            self.history_store.record(candidates)
+        except Exception as e:
+            print(f"이력 기록 오류: {e}")
+    
+    def _score_trends(self, news_items):
+        """순위 변화 상태 갱신 + popularity_score 추가 (실패해도 원래 순위 그대로)"""
+        if not self.trend_scorer or not news_items:
+            return news_items
+        try:
+            with metrics.span('trends.update', items=len(news_items)):
+                scored = self.trend_scorer.update(news_items, self.replay_time)
+                self.trend_scorer.prune(self.replay_time)
+                return scored
+        except Exception as e:
+            print(f"인기 점수 계산 오류: {e}")
+            return news_items
+    
+    def poll_trends(self, time_slot=None):
+        """요약 없이 랭킹만 수집해서 인기 점수 상태 갱신 (상주 실행 중 시간대 사이 주기 수집)"""
+        if not self.trend_scorer:
+            return 0
+        if not time_slot:
+            time_slot = self.get_current_schedule()
+        # 주기 수집 페이지는 보관하지 않음 (재현은 실제 실행 단위로), 전체 수집 시간대도 첫 페이지만
+        candidates = self.crawl_sources(time_slot, limit=self.candidate_limit, archive=False, poll=True)
+        return len(self._score_trends(candidates))
 
 if __name__ == "__main__":
     crawler = NaverNewsCrawler()
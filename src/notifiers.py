@@ -0,0 +1,149 @@
+import asyncio
+import os
+import time
+from datetime import datetime
+
+import metrics
+
+from http_client import DeliveryUnknown
+from telegram_bot import send_to_telegram_simple
+from discord_webhook import send_to_discord
+from slack_webhook import send_to_slack
+from telegram_broadcast import BroadcastQueue, get_broadcast_chat_ids
+
+
+class Notifier:
+    """전송 대상 공통 인터페이스"""
+
+    name = ''
+    required_env = ()
+    # 여러 채팅에 보내는 대상의 채팅별 완료 기록 (보관함에서 전송할 때만 설정)
+    progress = None
+
+    def is_configured(self):
+        return all(os.getenv(env) for env in self.required_env)
+
+    def send(self, thread_data, timeout=None):
+        """전송 성공 여부 반환 (timeout: 요청별 응답 대기 초, 응답 전에 넘으면 DeliveryUnknown)"""
+        raise NotImplementedError
+
+
+class TelegramNotifier(Notifier):
+    name = 'telegram'
+    required_env = ('TELEGRAM_BOT_TOKEN', 'TELEGRAM_CHAT_ID')
+
+    def send(self, thread_data, timeout=None):
+        # 텔레그램은 복사용으로 본문만 전송
+        return send_to_telegram_simple(thread_data['content'], timeout)
+
+
+class DiscordNotifier(Notifier):
+    name = 'discord'
+    required_env = ('DISCORD_WEBHOOK_URL',)
+
+    def send(self, thread_data, timeout=None):
+        return send_to_discord(thread_data, timeout)
+
+
+class SlackNotifier(Notifier):
+    name = 'slack'
+    required_env = ('SLACK_WEBHOOK_URL',)
+
+    def send(self, thread_data, timeout=None):
+        return send_to_slack(thread_data, timeout)
+
+
+class TelegramBroadcastNotifier(Notifier):
+    name = 'telegram_broadcast'
+    required_env = ('TELEGRAM_BOT_TOKEN', 'TELEGRAM_BROADCAST_CHAT_IDS')
+
+    def send(self, thread_data, timeout=None):
+        # 전송 제한을 지키면서 여러 채팅/채널에 본문 전송 (이미 보낸 채팅은 건너뜀)
+        chat_ids = get_broadcast_chat_ids()
+        finished = self.progress.finished() if self.progress else set()
+        remaining = [chat_id for chat_id in chat_ids if chat_id not in finished]
+        if not remaining:
+            return True
+        if finished:
+            print(f"📣 텔레그램 다중 전송: 이미 보낸 {len(finished)}개 제외, 남은 {len(remaining)}개만")
+
+        sender = BroadcastQueue(timeout=timeout)
+        deadline = time.monotonic() + sender.time_budget(len(remaining))
+        if self.progress:
+            # 보관함 점유(lease)가 끝나기 전에 멈춤 (다른 실행이 같은 채팅에 보내지 않도록)
+            deadline = min(deadline, self.progress.deadline)
+        stats = sender.broadcast(
+            thread_data['content'], remaining,
+            on_chat=self.progress.record if self.progress else None, deadline=deadline,
+        )
+        # 실패/시간 초과로 못 보낸 채팅이 있으면 실패 → 다음 실행에서 그 채팅만 다시 전송
+        return stats['failed'] == 0 and stats['pending'] == 0
+
+
+NOTIFIERS = [TelegramNotifier, TelegramBroadcastNotifier, DiscordNotifier, SlackNotifier]
+
+
+def get_notifiers():
+    """환경 변수가 설정된 전송 대상만 반환"""
+    return [notifier_class() for notifier_class in NOTIFIERS if notifier_class().is_configured()]
+
+
+def get_notifier(name):
+    """이름으로 전송 대상 생성"""
+    for notifier_class in NOTIFIERS:
+        if notifier_class.name == name:
+            return notifier_class()
+    raise ValueError(f"알 수 없는 전송 대상: {name}")
+
+
+def build_thread_data(content, time_slot, category, news_items=None):
+    """Discord/Slack 포맷터가 쓰는 쓰레드 데이터 생성"""
+    return {
+        'time_slot': time_slot,
+        'category': category,
+        'content': content,
+        'generated_at': datetime.now().isoformat(),
+        'trending_info': '네이버 뉴스 랭킹 기반',
+        'source_news': news_items or [],
+    }
+
+
+async def _send_one(notifier, thread_data, timeout, on_result=None):
+    """전송 대상 1곳 전송 - 결과와 소요 시간 기록 (끝나는 즉시 on_result 호출)
+
+    스레드는 중간에 취소할 수 없어서 시간 제한은 HTTP 요청 timeout으로 건다.
+    status: 'sent' | 'failed' (안 보내짐, 다시 보내도 됨) | 'unknown' (보냈는데 응답 전에 타임아웃)
+    """
+    started = time.perf_counter()
+    result = {'name': notifier.name, 'success': False, 'status': 'failed', 'error': None}
+    with metrics.span('deliver', destination=notifier.name) as attrs:
+        try:
+            result['success'] = bool(await asyncio.to_thread(notifier.send, thread_data, timeout))
+            result['status'] = 'sent' if result['success'] else 'failed'
+        except DeliveryUnknown as e:
+            result['status'] = 'unknown'
+            result['error'] = str(e)
+        except Exception as e:
+            result['error'] = str(e)
+        attrs['success'] = result['success']
+        attrs['status'] = result['status']
+    result['latency'] = round(time.perf_counter() - started, 3)
+    if on_result:
+        on_result(result)
+    return result
+
+
+async def dispatch_async(thread_data, notifiers=None, timeout=30, on_result=None):
+    """모든 전송 대상에 동시에 전송 (느린 곳이 있어도 다른 곳은 먼저 끝남)"""
+    notifiers = get_notifiers() if notifiers is None else notifiers
+    results = await asyncio.gather(*[_send_one(notifier, thread_data, timeout, on_result) for notifier in notifiers])
+
+    for result in results:
+        status = {'sent': '✅', 'unknown': '❓'}.get(result['status'], '❌')
+        error = f" ({result['error']})" if result['error'] else ''
+        print(f"{status} {result['name']} 전송 {result['latency']}초{error}")
+    return list(results)
+
+
+def dispatch(thread_data, notifiers=None, timeout=30, on_result=None):
+    return asyncio.run(dispatch_async(thread_data, notifiers, timeout, on_result))
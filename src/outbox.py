@@ -0,0 +1,241 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+
+from kst_time import today
+from notifiers import dispatch, get_notifier
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+OUTBOX_PATH = os.path.join(DATA_DIR, 'outbox.sqlite3')
+
+
+class Outbox:
+    """생성한 내용을 전송 전에 먼저 저장하고 전송 대상별 완료 여부 기록 (SQLite)
+
+    전송 실패나 중간 종료 시 다음 실행/재전송 명령이 다시 생성하지 않고 남은 대상에만 보낸다.
+    status: 'pending' → 'delivered' | 'unknown' (보냈는데 응답 전에 타임아웃, 중복을 피해 자동 재전송 안 함) | 'expired'
+    """
+
+    def __init__(self, path=OUTBOX_PATH, max_attempts=5, max_age_hours=12, lease_seconds=120):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.lock = Lock()
+        self.max_attempts = max_attempts
+        self.max_age_hours = max_age_hours
+        self.lease_seconds = lease_seconds
+
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedup_key TEXT NOT NULL UNIQUE,
+                time_slot TEXT,
+                thread_data TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS deliveries (
+                entry_id INTEGER NOT NULL REFERENCES entries(id),
+                destination TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_until REAL NOT NULL DEFAULT 0,
+                last_error TEXT,
+                delivered_at REAL,
+                PRIMARY KEY (entry_id, destination)
+            )
+        """)
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_deliveries_status ON deliveries(status)')
+        # 여러 채팅에 보내는 대상(telegram_broadcast)의 채팅별 결과 - 다시 시도할 때 남은 채팅에만
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS chat_deliveries (
+                entry_id INTEGER NOT NULL REFERENCES entries(id),
+                destination TEXT NOT NULL,
+                chat_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (entry_id, destination, chat_id)
+            )
+        """)
+
+    def enqueue(self, thread_data, destinations):
+        """전송 전 저장 - 같은 날 같은 시간대의 같은 내용이면 기존 항목 재사용"""
+        # 날짜는 한국시간 기준 (러너는 UTC라 07:00 KST 실행이 전날로 잡히지 않도록)
+        dedup_key = hashlib.sha256(f"{today()}|{thread_data['time_slot']}|{thread_data['content']}".encode('utf-8')).hexdigest()
+
+        with self.lock:
+            return self._enqueue(dedup_key, thread_data, destinations)
+
+    def _enqueue(self, dedup_key, thread_data, destinations):
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = self.conn.execute('SELECT id FROM entries WHERE dedup_key = ?', (dedup_key,)).fetchone()
+            if row:
+                entry_id = row[0]
+                print(f"📮 같은 내용이 이미 보관함에 있음 (#{entry_id})")
+            else:
+                entry_id = self.conn.execute(
+                    'INSERT INTO entries (dedup_key, time_slot, thread_data, created_at) VALUES (?, ?, ?, ?)',
+                    (dedup_key, thread_data['time_slot'], json.dumps(thread_data, ensure_ascii=False), time.time()),
+                ).lastrowid
+            self.conn.executemany(
+                'INSERT OR IGNORE INTO deliveries (entry_id, destination) VALUES (?, ?)',
+                [(entry_id, destination) for destination in destinations],
+            )
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+        return entry_id
+
+    def claim_pending(self, entry_ids=None):
+        """보낼 항목을 잠시 점유하고 (항목 ID, 쓰레드 데이터, 남은 전송 대상) 목록 반환
+
+        점유 시간(lease) 안에는 다른 실행이 같은 대상에 보내지 않는다.
+        """
+        with self.lock:
+            return self._claim_pending(entry_ids)
+
+    def _claim_pending(self, entry_ids):
+        now = time.time()
+        min_created = now - self.max_age_hours * 3600
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            rows = self.conn.execute("""
+                SELECT d.entry_id, d.destination, e.thread_data, e.created_at
+                FROM deliveries d JOIN entries e ON e.id = d.entry_id
+                WHERE d.status = 'pending' AND d.lease_until < ? AND d.attempts < ?
+                ORDER BY d.entry_id
+            """, (now, self.max_attempts)).fetchall()
+
+            claimed = {}
+            for entry_id, destination, thread_data, created_at in rows:
+                if entry_ids is not None and entry_id not in entry_ids:
+                    continue
+                if created_at < min_created:
+                    # 너무 오래된 내용은 보내지 않음
+                    self.conn.execute(
+                        "UPDATE deliveries SET status = 'expired' WHERE entry_id = ? AND destination = ?",
+                        (entry_id, destination),
+                    )
+                    continue
+                self.conn.execute(
+                    'UPDATE deliveries SET lease_until = ?, attempts = attempts + 1 WHERE entry_id = ? AND destination = ?',
+                    (now + self.lease_seconds, entry_id, destination),
+                )
+                claimed.setdefault(entry_id, (json.loads(thread_data), []))[1].append(destination)
+            self.conn.execute('COMMIT')
+        except Exception:
+            self.conn.execute('ROLLBACK')
+            raise
+
+        return [(entry_id, thread_data, destinations) for entry_id, (thread_data, destinations) in claimed.items()]
+
+    def mark_delivered(self, entry_id, destination):
+        with self.lock:
+            self.conn.execute(
+                "UPDATE deliveries SET status = 'delivered', delivered_at = ?, lease_until = 0, last_error = NULL "
+                "WHERE entry_id = ? AND destination = ?",
+                (time.time(), entry_id, destination),
+            )
+
+    def mark_failed(self, entry_id, destination, error):
+        # pending 유지 - 점유만 풀어서 다음 실행에서 다시 시도
+        with self.lock:
+            self.conn.execute(
+                'UPDATE deliveries SET lease_until = 0, last_error = ? WHERE entry_id = ? AND destination = ?',
+                (error, entry_id, destination),
+            )
+
+    def mark_unknown(self, entry_id, destination, error):
+        # 상대가 받았을 수 있음 - 점유(lease)를 그대로 두고 pending에서 빼서 다시 보내지 않음
+        with self.lock:
+            self.conn.execute(
+                "UPDATE deliveries SET status = 'unknown', last_error = ? WHERE entry_id = ? AND destination = ?",
+                (error, entry_id, destination),
+            )
+
+    def mark_chat(self, entry_id, destination, chat_id, status):
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO chat_deliveries (entry_id, destination, chat_id, status, updated_at) VALUES (?, ?, ?, ?, ?)',
+                (entry_id, destination, str(chat_id), status, time.time()),
+            )
+
+    def finished_chats(self, entry_id, destination):
+        """보냈거나 전송 여부를 알 수 없는 채팅 (다시 보내지 않음)"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT chat_id FROM chat_deliveries WHERE entry_id = ? AND destination = ? AND status IN ('sent', 'unknown')",
+                (entry_id, destination),
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def status(self, entry_id, destination):
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT status FROM deliveries WHERE entry_id = ? AND destination = ?', (entry_id, destination)
+            ).fetchone()
+        return row[0] if row else None
+
+    def undelivered_count(self, entry_id):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM deliveries WHERE entry_id = ? AND status != 'delivered'", (entry_id,)
+            ).fetchone()[0]
+
+    def pending_count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM deliveries WHERE status = 'pending'").fetchone()[0]
+
+    def unknown_count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM deliveries WHERE status = 'unknown'").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class ChatProgress:
+    """전송 대상 1곳의 채팅별 완료 기록 (점유 시간 안에 끝낼 수 있도록 deadline 포함)"""
+
+    def __init__(self, outbox, entry_id, destination):
+        self.outbox = outbox
+        self.entry_id = entry_id
+        self.destination = destination
+        # 점유는 방금 claim_pending에서 잡음 - 끝나기 조금 전까지만 (time.monotonic 기준)
+        self.deadline = time.monotonic() + outbox.lease_seconds * 0.9
+
+    def finished(self):
+        return self.outbox.finished_chats(self.entry_id, self.destination)
+
+    def record(self, chat_id, status):
+        if status in ('sent', 'unknown'):
+            self.outbox.mark_chat(self.entry_id, self.destination, chat_id, status)
+
+
+def deliver_pending(outbox, entry_ids=None, timeout=30):
+    """보관함의 미전송 항목 전송 → {항목 ID: 전송 대상별 결과}"""
+    results = {}
+    for entry_id, thread_data, destinations in outbox.claim_pending(entry_ids):
+        print(f"📮 보관함 #{entry_id} ({thread_data['time_slot']}) 전송: {destinations}")
+
+        def on_result(result, entry_id=entry_id):
+            # 대상별로 끝나는 즉시 기록 (중간에 죽어도 보낸 곳은 다시 안 보냄)
+            if result['success']:
+                outbox.mark_delivered(entry_id, result['name'])
+            elif result.get('status') == 'unknown':
+                outbox.mark_unknown(entry_id, result['name'], result['error'])
+            else:
+                outbox.mark_failed(entry_id, result['name'], result['error'] or '전송 실패')
+
+        notifiers = [get_notifier(destination) for destination in destinations]
+        for notifier in notifiers:
+            notifier.progress = ChatProgress(outbox, entry_id, notifier.name)
+        results[entry_id] = dispatch(thread_data, notifiers, timeout, on_result=on_result)
+    return results
@@ -0,0 +1,177 @@
+import glob
+import math
+import os
+import re
+
+import metrics
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures')
+
+# 로컬 토큰 수 추정 (Claude 토크나이저는 공개돼 있지 않아 보수적으로 크게 셈)
+# 한글/한자/가나 1자 = 1토큰, 영문 단어 4자당 1토큰, 숫자 3자리당 1토큰, 그 외 기호 1자 = 1토큰
+_TOKEN_PIECES = re.compile(r'([가-힣ㄱ-ㆎ一-鿿぀-ヿ])|([A-Za-z]+)|(\d+)|(\S)')
+# 정보가 없는 말머리/꼬리표: [단독], [속보], (종합), (2보), <사진>, 【영상】 등
+_TITLE_TAGS = re.compile(r'\s*[\[(<【]\s*(?:단독|속보|종합|종합\d?보|\d보|사진|영상|포토|르포|인터뷰|팩트체크|오늘의 운세)\s*[\])>】]\s*')
+_ELLIPSIS = re.compile(r'\s*(?:…|\.\.\.|···|⋯)\s*')
+_SPACES = re.compile(r'\s+')
+_SENTENCE = re.compile(r'[^.?!]*(?:[.?!]+\s*|$)')
+
+
+def count_tokens(text):
+    """프롬프트 토큰 수 추정"""
+    tokens = 0
+    for cjk, word, digits, other in _TOKEN_PIECES.findall(text):
+        if cjk or other:
+            tokens += 1
+        elif word:
+            tokens += math.ceil(len(word) / 4)
+        else:
+            tokens += math.ceil(len(digits) / 3)
+    # 줄바꿈/공백 (대부분 앞 토큰에 붙지만 줄바꿈은 따로 셈)
+    return tokens + text.count('\n')
+
+
+def clean_title(title):
+    """말머리/꼬리표와 말줄임표 정리"""
+    title = _TITLE_TAGS.sub(' ', title)
+    title = _ELLIPSIS.sub('… ', title)
+    return _SPACES.sub(' ', title).strip(' …')
+
+
+def trim_to_tokens(text, max_tokens):
+    """max_tokens 이내로 - 어절 단위로 자르고 잘렸으면 '…' 표시"""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    kept = []
+    used = count_tokens('…')
+    for word in text.split(' '):
+        word_tokens = count_tokens(word)
+        if used + word_tokens > max_tokens:
+            break
+        kept.append(word)
+        used += word_tokens
+    if not kept:
+        # 어절 하나가 예산보다 길면 글자 단위로
+        return text[:max_tokens - 1] + '…'
+    return ' '.join(kept) + '…'
+
+
+def trim_sentences(text, max_tokens):
+    """max_tokens 이내에서 문장 단위로 (본문 등 긴 글)"""
+    kept = []
+    used = 0
+    for sentence in _SENTENCE.findall(text):
+        sentence_tokens = count_tokens(sentence)
+        if not sentence.strip():
+            continue
+        if used + sentence_tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += sentence_tokens
+    if not kept:
+        return trim_to_tokens(text, max_tokens)
+    return ''.join(kept).strip()
+
+
+class PromptBuilder:
+    """입력 토큰 예산 안에서 정보가 많은 제목부터 골라 프롬프트 재료 구성
+
+    예산은 요청 1번의 전체 입력 (시스템 프롬프트 + 사용자 메시지 + 도구 정의)
+    점수 = 순위 + 같은 사건 보도 수(cluster_size) + 이전 시간대에 안 나온 뉴스(novelty)
+    """
+
+    def __init__(self, input_token_budget=750, hot_issue_budget=475, min_items=8, max_items=10,
+                 max_title_tokens=32, rank_weight=1.0, cluster_weight=0.5, repeat_penalty=0.5):
+        self.input_token_budget = input_token_budget
+        self.hot_issue_budget = hot_issue_budget
+        self.min_items = min_items
+        self.max_items = max_items
+        self.max_title_tokens = max_title_tokens
+        self.rank_weight = rank_weight
+        self.cluster_weight = cluster_weight
+        self.repeat_penalty = repeat_penalty
+
+    def score(self, item, position):
+        rank = item.get('rank') or position
+        score = self.rank_weight / rank
+        score += self.cluster_weight * math.log(item.get('cluster_size', 1))
+        if item.get('repeat'):
+            score *= self.repeat_penalty
+        return score
+
+    def select_headlines(self, news_items, fixed_tokens=0):
+        """예산 안에 들어가는 제목 목록 (원래 순위 순서, 점수 높은 뉴스 우선 선택)
+
+        fixed_tokens: 제목 외에 요청마다 고정으로 들어가는 토큰 (시스템 프롬프트, 템플릿, 도구 정의)
+        """
+        budget = self.input_token_budget - fixed_tokens
+        # 최소 개수는 항상 들어가도록 제목당 토큰 상한 조정
+        per_title = max(8, min(self.max_title_tokens, budget // max(1, self.min_items) - 3))
+
+        candidates = []
+        for position, item in enumerate(news_items, 1):
+            title = trim_to_tokens(clean_title(item['title']), per_title)
+            # 번호("1."), 줄바꿈 몫 3토큰
+            candidates.append((self.score(item, position), position, title, count_tokens(title) + 3))
+
+        chosen = []
+        used = 0
+        for score, position, title, tokens in sorted(candidates, key=lambda c: (-c[0], c[1])):
+            if len(chosen) >= self.max_items:
+                break
+            if used + tokens > budget and len(chosen) >= self.min_items:
+                continue
+            chosen.append((position, title))
+            used += tokens
+
+        metrics.debug(f"🧮 제목 {len(chosen)}/{len(news_items)}개 선택, 요청 전체 추정 {used + fixed_tokens}토큰 (예산 {self.input_token_budget})")
+        return [title for _, title in sorted(chosen)]
+
+    def hot_issue_material(self, news_item, fixed_tokens=0):
+        """핫이슈용 (제목, 본문) - 고정 토큰과 제목을 뺀 남은 예산만큼 본문을 문장 단위로"""
+        title = trim_to_tokens(clean_title(news_item['title']), self.max_title_tokens)
+        body = news_item.get('body')
+        if body:
+            remaining = self.hot_issue_budget - fixed_tokens - count_tokens(title)
+            body = trim_sentences(body, remaining) if remaining > 0 else None
+        return title, body
+
+
+def create_prompt_builder(prompt_config):
+    return PromptBuilder(
+        input_token_budget=prompt_config.get('input_token_budget', 750),
+        hot_issue_budget=prompt_config.get('hot_issue_budget', 475),
+        min_items=prompt_config.get('min_items', 8),
+        max_items=prompt_config.get('max_items', 10),
+        max_title_tokens=prompt_config.get('max_title_tokens', 32),
+        rank_weight=prompt_config.get('rank_weight', 1.0),
+        cluster_weight=prompt_config.get('cluster_weight', 0.5),
+        repeat_penalty=prompt_config.get('repeat_penalty', 0.5),
+    )
+
+
+# 저장된 랭킹 페이지로 기존 단일 프롬프트(지시문 포함, 8개 x 60자)와 지금 요청 1번의 전체 입력 토큰 비교
+# (시스템 프롬프트 + 사용자 메시지 + 도구 정의/도구 사용 시스템 프롬프트, 도구 응답/텍스트 응답 각각)
+if __name__ == "__main__":
+    from html_extractor import extract_ranking_news
+    from headline_cluster import cluster_headlines
+    from issue_generator import ISSUE_LIST_PROMPT, IssueGenerator
+
+    legacy_prompt = "다음 뉴스를 20대 여성 반말로 10개 요약해줘. 각 35자 이내.\n\n{news_titles}\n\n형식: 1. 내용요약\n시간: 07:00"
+    generator = IssueGenerator()
+    template = ISSUE_LIST_PROMPT.format(news_titles='', time_slot='07:00')
+    for path in sorted(glob.glob(os.path.join(FIXTURE_DIR, 'naver_ranking_*.html'))):
+        with open(path, 'rb') as f:
+            items = cluster_headlines(extract_ranking_news(f.read(), limit=30, max_sections=6, per_section=5))
+
+        legacy = ''.join(f"{i}. {item['title'][:60]}\n" for i, item in enumerate(items[:8], 1))
+        print(f"{os.path.basename(path)}: 기존 8개 {count_tokens(legacy_prompt.format(news_titles=legacy))}토큰 (예산 {generator.prompt_builder.input_token_budget})")
+        for structured in (True, False):
+            generator.structured_output = structured
+            fixed = generator.fixed_tokens('issue_list', template)
+            titles = generator.prompt_builder.select_headlines(items, fixed)
+            user = count_tokens(ISSUE_LIST_PROMPT.format(news_titles=''.join(f"{i}. {title}\n" for i, title in enumerate(titles, 1)), time_slot='07:00'))
+            system = count_tokens(generator._system_text('issue_list'))
+            tools = fixed - system - count_tokens(template)
+            print(f"  {'도구 응답' if structured else '텍스트 응답'}: {len(titles)}개 - 시스템 {system} + 사용자 {user} + 도구 {tools} = {system + user + tools}토큰")
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import os
+import time
+
+from disk_cache import DiskCache
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.cache', 'http')
+
+
+def content_hash(body):
+    return hashlib.sha256(body).hexdigest()
+
+
+class ResponseCache:
+    """URL별 응답 본문 + ETag/Last-Modified + 본문 해시 + 파싱 결과 디스크 캐시"""
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl_seconds=300):
+        self.ttl_seconds = ttl_seconds
+        # 만료된 항목도 조건부 요청에 쓰므로 파일 캐시 자체의 TTL/개수 제한은 없음
+        self.files = DiskCache(cache_dir)
+
+    def _key(self, url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _write_entry(self, url, entry):
+        self.files.write(self._key(url), json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+    def get(self, url):
+        """캐시 메타데이터 반환 (없거나 깨졌으면 None)"""
+        try:
+            return json.loads(self.files.read(self._key(url)) or b'null')
+        except ValueError:
+            return None
+
+    def get_body(self, url):
+        return self.files.read(self._key(url), 'body')
+
+    def is_fresh(self, entry):
+        """TTL 안이면 요청 없이 그대로 사용"""
+        return time.time() - entry['checked_at'] < self.ttl_seconds
+
+    def conditional_headers(self, entry):
+        """조건부 요청 헤더 (If-None-Match / If-Modified-Since)"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url, response_headers, body, parsed):
+        """새 본문 저장 (파싱 결과는 limit별로 보관)"""
+        entry = {
+            'url': url,
+            'etag': response_headers.get('ETag'),
+            'last_modified': response_headers.get('Last-Modified'),
+            'content_hash': content_hash(body),
+            'checked_at': time.time(),
+            'parsed': parsed,
+        }
+        self.files.write(self._key(url), body, 'body')
+        self._write_entry(url, entry)
+        return entry
+
+    def touch(self, url, entry, parsed=None):
+        """본문은 그대로, 확인 시각과 파싱 결과만 갱신"""
+        entry['checked_at'] = time.time()
+        if parsed:
+            entry['parsed'].update(parsed)
+        self._write_entry(url, entry)
+        return entry
@@ -1,16 +1,10 @@
 # src/slack_webhook.py (discord_webhook.py 대신 사용)
-import requests
+import http_client
 import os
 from datetime import datetime
 
-def send_to_slack(thread_data):
-    """Slack 웹훅으로 인기 뉴스 쓰레드 전송"""
-    webhook_url = os.getenv('SLACK_WEBHOOK_URL')  # Discord 대신 Slack
-    
-    if not webhook_url:
-        print("Slack 웹훅 URL이 설정되지 않았습니다.")
-        return False
-    
+def build_slack_message(thread_data):
+    """인기 뉴스 쓰레드 Slack 웹훅 메시지 생성"""
     # 참고 뉴스 링크들 정리
     news_links = ""
     if 'source_news' in thread_data:
@@ -52,8 +46,20 @@ def send_to_slack(thread_data):
             "footer": "이 링크들을 참고해서 쓰레드가 생성되었습니다"
         })
     
+    return message
+
+def send_to_slack(thread_data, timeout=None):
+    """Slack 웹훅으로 인기 뉴스 쓰레드 전송"""
+    webhook_url = os.getenv('SLACK_WEBHOOK_URL')  # Discord 대신 Slack
+    
+    if not webhook_url:
+        print("Slack 웹훅 URL이 설정되지 않았습니다.")
+        return False
+    
+    message = build_slack_message(thread_data)
+    
     try:
-        response = requests.post(webhook_url, json=message, timeout=10)
+        response = http_client.post(webhook_url, json=message, timeout=timeout)
         if response.status_code == 200:
             print("✅ Slack 웹훅 전송 성공!")
             return True
@@ -61,6 +67,8 @@ def send_to_slack(thread_data):
             print(f"❌ Slack 웹훅 전송 실패: HTTP {response.status_code}")
             print(f"응답: {response.text}")
             return False
+    except http_client.DeliveryUnknown:
+        raise
     except Exception as e:
         print(f"❌ Slack 웹훅 오류: {e}")
         return False
@@ -85,7 +93,7 @@ def send_error_notification(error_message, time_slot):
     }
     
     try:
-        response = requests.post(webhook_url, json=message, timeout=10)
+        response = http_client.post(webhook_url, json=message)
         return response.status_code == 200
     except:
         return False
@@ -0,0 +1,212 @@
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from threading import Lock
+from zoneinfo import ZoneInfo
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+ARCHIVE_PATH = os.path.join(DATA_DIR, 'snapshots.sqlite3')
+KST = ZoneInfo('Asia/Seoul')
+
+
+def prompt_hash(prompt):
+    """프롬프트 비교용 짧은 해시"""
+    return hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:12]
+
+
+def format_run_time(timestamp):
+    """실행 시각 → 'YYYY-MM-DDTHH:MM' (한국시간, --replay 인자와 같은 형식)"""
+    return datetime.fromtimestamp(timestamp, KST).strftime('%Y-%m-%dT%H:%M')
+
+
+class SnapshotArchive:
+    """수집한 랭킹 페이지 원본 보관 (SQLite) - 재현/회귀 테스트용
+
+    본문은 내용 해시로 한 번만 gzip 압축해 저장하고, 실행(시각, 시간대)별로 URL → 해시만 기록한다.
+    실행마다 생성에 실제로 쓴 입력(이력 반영/인기 점수/본문이 붙은 최종 뉴스 목록)과 프롬프트 해시도 남겨
+    재현 시 같은 프롬프트가 나오는지 비교할 수 있다.
+    """
+
+    def __init__(self, path=ARCHIVE_PATH, compress_level=9, max_age_days=180):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = Lock()
+        self.compress_level = compress_level
+        self.max_age_days = max_age_days
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS blobs (
+                    content_hash TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    started_at REAL NOT NULL,
+                    run_time TEXT NOT NULL,
+                    time_slot TEXT NOT NULL
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    run_id INTEGER NOT NULL REFERENCES runs(id),
+                    url TEXT NOT NULL,
+                    content_hash TEXT NOT NULL REFERENCES blobs(content_hash),
+                    fetched_at REAL NOT NULL,
+                    PRIMARY KEY (run_id, url)
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_inputs (
+                    run_id INTEGER PRIMARY KEY REFERENCES runs(id),
+                    news_items BLOB NOT NULL,
+                    prompt_hash TEXT
+                )
+            """)
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_runs_run_time ON runs(run_time)')
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages(content_hash)')
+
+    def start_run(self, time_slot, started_at=None):
+        """실행 1회 등록 → 실행 ID"""
+        started_at = started_at or time.time()
+        with self.lock, self.conn:
+            return self.conn.execute(
+                'INSERT INTO runs (started_at, run_time, time_slot) VALUES (?, ?, ?)',
+                (started_at, format_run_time(started_at), time_slot),
+            ).lastrowid
+
+    def record(self, run_id, url, body, fetched_at=None):
+        """페이지 저장 - 같은 내용은 이미 있으면 압축/저장 생략"""
+        digest = hashlib.sha256(body).hexdigest()
+        with self.lock:
+            exists = self.conn.execute('SELECT 1 FROM blobs WHERE content_hash = ?', (digest,)).fetchone()
+        # 압축은 잠금 밖에서 (동시 수집 스레드끼리 막지 않도록)
+        data = None if exists else gzip.compress(body, self.compress_level, mtime=0)
+
+        with self.lock, self.conn:
+            if data is not None:
+                self.conn.execute(
+                    'INSERT OR IGNORE INTO blobs (content_hash, data, size) VALUES (?, ?, ?)',
+                    (digest, data, len(body)),
+                )
+            self.conn.execute(
+                'INSERT OR REPLACE INTO pages (run_id, url, content_hash, fetched_at) VALUES (?, ?, ?, ?)',
+                (run_id, url, digest, fetched_at or time.time()),
+            )
+        return digest
+
+    def record_inputs(self, run_id, news_items, prompt=None):
+        """생성에 쓴 최종 뉴스 목록 + 프롬프트 해시 저장 (같은 실행이면 덮어씀)"""
+        data = gzip.compress(json.dumps(news_items, ensure_ascii=False, default=str).encode('utf-8'), self.compress_level, mtime=0)
+        with self.lock, self.conn:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO run_inputs (run_id, news_items, prompt_hash) VALUES (?, ?, ?)',
+                (run_id, data, prompt_hash(prompt) if prompt else None),
+            )
+
+    def load_inputs(self, run_id):
+        """실행 1회의 (최종 뉴스 목록, 프롬프트 해시) - 기록이 없으면 None"""
+        with self.lock:
+            row = self.conn.execute('SELECT news_items, prompt_hash FROM run_inputs WHERE run_id = ?', (run_id,)).fetchone()
+        if not row:
+            return None
+        return json.loads(gzip.decompress(row[0])), row[1]
+
+    def find_runs(self, prefix):
+        """실행 시각이 prefix로 시작하는 실행 목록 (예: '2026-10-18T12:00', '2026-10-18', '2026-10')"""
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT id, started_at, run_time, time_slot FROM runs WHERE run_time LIKE ? ORDER BY started_at',
+                (prefix.replace(' ', 'T') + '%',),
+            ).fetchall()
+        return [
+            {'id': run_id, 'started_at': started_at, 'run_time': run_time, 'time_slot': time_slot}
+            for run_id, started_at, run_time, time_slot in rows
+        ]
+
+    def load_pages(self, run_id):
+        """실행 1회에 받은 페이지 {url: 본문}"""
+        with self.lock:
+            rows = self.conn.execute(
+                'SELECT p.url, b.data FROM pages p JOIN blobs b ON b.content_hash = p.content_hash WHERE p.run_id = ?',
+                (run_id,),
+            ).fetchall()
+        return {url: gzip.decompress(data) for url, data in rows}
+
+    def prune(self, now=None):
+        """max_age_days보다 오래된 실행과 더 이상 안 쓰는 본문 삭제"""
+        if not self.max_age_days:
+            return 0
+        cutoff = (now or time.time()) - self.max_age_days * 86400
+        with self.lock, self.conn:
+            old_runs = 'SELECT id FROM runs WHERE started_at < ?'
+            self.conn.execute(f'DELETE FROM pages WHERE run_id IN ({old_runs})', (cutoff,))
+            self.conn.execute(f'DELETE FROM run_inputs WHERE run_id IN ({old_runs})', (cutoff,))
+            removed = self.conn.execute('DELETE FROM runs WHERE started_at < ?', (cutoff,)).rowcount
+            self.conn.execute('DELETE FROM blobs WHERE content_hash NOT IN (SELECT content_hash FROM pages)')
+        return removed
+
+    def stats(self):
+        with self.lock:
+            runs = self.conn.execute('SELECT COUNT(*) FROM runs').fetchone()[0]
+            pages = self.conn.execute('SELECT COUNT(*) FROM pages').fetchone()[0]
+            blobs, raw, stored = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs'
+            ).fetchone()
+        return {'runs': runs, 'pages': pages, 'unique_pages': blobs, 'raw_bytes': raw, 'stored_bytes': stored}
+
+    def close(self):
+        self.conn.close()
+
+
+def create_archive(archive_config, root_dir):
+    """설정으로 보관소 생성 (꺼져 있으면 None)"""
+    if not archive_config.get('enabled', True):
+        return None
+    path = archive_config.get('path')
+    return SnapshotArchive(
+        path=os.path.join(root_dir, path) if path else ARCHIVE_PATH,
+        compress_level=archive_config.get('compress_level', 9),
+        max_age_days=archive_config.get('max_age_days', 180),
+    )
+
+
+# 한 달치(하루 4회) 보관 크기와 다시 읽는 시간 측정
+if __name__ == "__main__":
+    import glob
+
+    from html_extractor import extract_ranking_news
+
+    fixture_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures')
+    pages = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, 'naver_ranking_*.html'))):
+        with open(path, 'rb') as f:
+            pages.append(f.read())
+
+    archive = SnapshotArchive(':memory:')
+    start = time.time() - 30 * 86400
+    for day in range(30):
+        for hour in (7, 12, 18, 20):
+            run_at = start + day * 86400 + hour * 3600
+            run_id = archive.start_run(f"{hour:02d}:00", run_at)
+            # 실행마다 일부만 바뀐 페이지 흉내 (순위 변동)
+            body = pages[(day + hour) % len(pages)].replace(b'</body>', f'<!-- {day}-{hour} --></body>'.encode())
+            archive.record(run_id, 'https://news.naver.com/main/ranking/popularDay.naver', body, run_at)
+    stats = archive.stats()
+    print(f"실행 {stats['runs']}회, 고유 페이지 {stats['unique_pages']}개: "
+          f"원본 {stats['raw_bytes'] / 1024:.0f}KB → 저장 {stats['stored_bytes'] / 1024:.0f}KB")
+
+    started = time.perf_counter()
+    items = 0
+    for run in archive.find_runs(''):
+        for body in archive.load_pages(run['id']).values():
+            items += len(extract_ranking_news(body, limit=30, max_sections=6, per_section=5))
+    print(f"다시 읽기 + 파싱: {time.perf_counter() - started:.2f}초 (뉴스 {items}개)")
@@ -1,8 +1,11 @@
-import requests
+import http_client
 import os
 from datetime import datetime
 
-def send_to_telegram_simple(content):
+# 로컬 테스트 서버로 바꿀 수 있도록 Bot API 주소 분리
+TELEGRAM_API_BASE = os.getenv('TELEGRAM_API_BASE', 'https://api.telegram.org')
+
+def send_to_telegram_simple(content, timeout=None):
     """텔레그램 봇으로 본문만 전송 (바로 복사용)"""
     bot_token = os.getenv('TELEGRAM_BOT_TOKEN')
     chat_id = os.getenv('TELEGRAM_CHAT_ID')
@@ -12,7 +15,7 @@ def send_to_telegram_simple(content):
         return False
     
     # 본문만 전송 (다른 정보 없이)
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    url = f"{TELEGRAM_API_BASE}/bot{bot_token}/sendMessage"
     data = {
         'chat_id': chat_id,
         'text': content,  # 본문만
@@ -20,13 +23,16 @@ def send_to_telegram_simple(content):
     }
     
     try:
-        response = requests.post(url, json=data, timeout=10)
+        response = http_client.post(url, json=data, timeout=timeout)
         if response.status_code == 200:
             print("✅ 텔레그램 전송 성공!")
             return True
         else:
             print(f"❌ 텔레그램 전송 실패: HTTP {response.status_code}")
             return False
+    except http_client.DeliveryUnknown:
+        # 보냈는지 알 수 없음 - 실패로 처리하면 재전송(중복)되므로 그대로 올림
+        raise
     except Exception as e:
         print(f"❌ 텔레그램 오류: {e}")
         return False
@@ -41,14 +47,14 @@ def send_error_notification_telegram(error_message, time_slot):
     
     message = f"🚨 뉴스봇 오류\n시간: {time_slot}\n오류: {error_message}"
     
-    url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+    url = f"{TELEGRAM_API_BASE}/bot{bot_token}/sendMessage"
     data = {
         'chat_id': chat_id,
         'text': message
     }
     
     try:
-        response = requests.post(url, json=data, timeout=10)
+        response = http_client.post(url, json=data)
         return response.status_code == 200
     except:
         return False
@@ -0,0 +1,230 @@
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from threading import Lock
+
+import http_client
+from telegram_bot import TELEGRAM_API_BASE
+
+# 텔레그램 Bot API 전송 제한 (전체 초당 30개, 채팅별 초당 1개)
+GLOBAL_RATE = 30
+PER_CHAT_RATE = 1
+
+
+class TokenBucket:
+    """초당 rate개씩 채워지는 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, deadline=None):
+        """토큰 1개 사용 (없으면 채워질 때까지 대기) - deadline(time.monotonic 기준) 전에 못 받으면 False"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            if deadline and time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def pause(self, seconds):
+        """429 retry_after 동안 토큰이 안 나오도록 비움 (같은 시점의 429 여러 개는 겹쳐 늘리지 않음)"""
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, -seconds * self.rate)
+
+
+def get_broadcast_chat_ids():
+    """TELEGRAM_BROADCAST_CHAT_IDS (쉼표 구분) 채팅 목록"""
+    chat_ids = os.getenv('TELEGRAM_BROADCAST_CHAT_IDS', '')
+    return [chat_id.strip() for chat_id in chat_ids.split(',') if chat_id.strip()]
+
+
+class BroadcastQueue:
+    """여러 채팅에 같은 메시지 전송 - 전체/채팅별 토큰 버킷, 429 retry_after 준수"""
+
+    def __init__(self, bot_token=None, global_rate=GLOBAL_RATE, per_chat_rate=PER_CHAT_RATE,
+                 workers=8, max_attempts=3, api_base=None, timeout=None):
+        self.bot_token = bot_token or os.getenv('TELEGRAM_BOT_TOKEN')
+        self.api_base = api_base or TELEGRAM_API_BASE
+        self.global_bucket = TokenBucket(global_rate)
+        self.per_chat_rate = per_chat_rate
+        self.workers = workers
+        self.max_attempts = max_attempts
+        # 요청별 응답 대기 시간 (None이면 http 설정의 read_timeout)
+        self.timeout = timeout
+        self._chat_buckets = {}
+        self._chat_lock = Lock()
+
+        # 재시도는 큐에서 직접 처리 (세션 재시도가 워커를 붙잡지 않도록)
+        http_config = http_client.load_http_config()
+        http_config.update(max_retries=0, pool_maxsize=max(workers, http_config['pool_maxsize']))
+        self.session = http_client.create_session(http_config)
+
+    def _chat_bucket(self, chat_id):
+        with self._chat_lock:
+            if chat_id not in self._chat_buckets:
+                self._chat_buckets[chat_id] = TokenBucket(self.per_chat_rate)
+            return self._chat_buckets[chat_id]
+
+    def _send(self, chat_id, text, deadline=None):
+        """1건 전송 → ('sent' | 'retry' | 'failed' | 'pending', 429 여부)
+
+        토큰을 기다리다 deadline이 지나면 보내지 않고 'pending'
+        """
+        if not (self._chat_bucket(chat_id).acquire(deadline) and self.global_bucket.acquire(deadline)):
+            return 'pending', False
+
+        url = f"{self.api_base}/bot{self.bot_token}/sendMessage"
+        response = http_client.post(url, session=self.session, timeout=self.timeout, json={
+            'chat_id': chat_id,
+            'text': text,
+            'disable_web_page_preview': True
+        })
+
+        if response.status_code == 200:
+            return 'sent', False
+        if response.status_code == 429:
+            try:
+                retry_after = response.json().get('parameters', {}).get('retry_after', 1)
+            except ValueError:
+                retry_after = int(response.headers.get('Retry-After', 1))
+            # 텔레그램 전송 제한(flood control)은 봇 전체 기준 → 다른 채팅도 retry_after 동안 멈춤
+            self._chat_bucket(chat_id).pause(retry_after)
+            self.global_bucket.pause(retry_after)
+            return 'retry', True
+
+        print(f"❌ 텔레그램 전송 실패 ({chat_id}): HTTP {response.status_code}")
+        return 'failed', False
+
+    def time_budget(self, chat_count):
+        """채팅 수와 전체 전송 제한으로 정한 전송 시간 예산 (초)
+
+        채팅 1,000개면 초당 30개 상한에서 최소 33초가 걸리므로 고정 timeout 대신 채팅 수에 비례하게 잡는다.
+        (429 재시도 여유로 2배 + 마지막 요청의 응답 대기 시간)
+        """
+        request_timeout = self.timeout or http_client.load_http_config()['read_timeout']
+        return 2 * chat_count / self.global_bucket.rate + request_timeout
+
+    def broadcast(self, text, chat_ids, on_chat=None, deadline=None):
+        """모든 채팅에 전송하고 처리량 통계 반환
+
+        on_chat(chat_id, status): 채팅마다 결과가 정해지는 즉시 호출 ('sent' | 'unknown' | 'failed')
+        deadline(time.monotonic 기준)이 지나면 아직 보내지 않은 채팅은 (토큰 대기 중이던 것도) pending으로 남긴다.
+        """
+        jobs = queue.Queue()
+        for chat_id in chat_ids:
+            jobs.put((chat_id, 1))
+
+        stats = {'sent': 0, 'failed': 0, 'unknown': 0, 'pending': 0, 'throttled': 0}
+        stats_lock = Lock()
+
+        def worker():
+            while True:
+                try:
+                    chat_id, attempt = jobs.get_nowait()
+                except queue.Empty:
+                    return
+
+                if deadline and time.monotonic() > deadline:
+                    with stats_lock:
+                        stats['pending'] += 1
+                    continue
+
+                try:
+                    status, throttled = self._send(chat_id, text, deadline)
+                except http_client.DeliveryUnknown as e:
+                    # 받았을 수도 있으니 재시도하지 않음 (중복 방지)
+                    print(f"❓ 텔레그램 전송 여부 불명 ({chat_id}): {e}")
+                    status, throttled = 'unknown', False
+                except Exception as e:
+                    print(f"❌ 텔레그램 오류 ({chat_id}): {e}")
+                    status, throttled = 'retry', False
+
+                with stats_lock:
+                    stats['throttled'] += throttled
+                    if status == 'pending':
+                        stats['pending'] += 1
+                        continue
+                    if status == 'retry' and attempt < self.max_attempts:
+                        # 다시 넣은 작업은 넣은 워커가 계속 돌면서 처리
+                        jobs.put((chat_id, attempt + 1))
+                        continue
+                    if status == 'retry':
+                        status = 'failed'
+                    stats[status] += 1
+                if on_chat:
+                    on_chat(chat_id, status)
+
+        started = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(min(self.workers, len(chat_ids)))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - started
+        stats['elapsed'] = round(elapsed, 3)
+        stats['messages_per_second'] = round(stats['sent'] / elapsed, 1) if elapsed else 0.0
+        print(f"📣 텔레그램 다중 전송: {stats}")
+        return stats
+
+
+# 로컬 가짜 Bot API로 전송 제한 상한 도달 여부 확인
+if __name__ == "__main__":
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    chat_count = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+    server_global = TokenBucket(GLOBAL_RATE, capacity=GLOBAL_RATE)
+    server_lock = Lock()
+
+    class FakeBotAPI(BaseHTTPRequestHandler):
+        """전체 초당 30개 초과 시 429 + retry_after 응답"""
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            with server_lock:
+                server_global._refill()
+                allowed = server_global.tokens >= 1
+                if allowed:
+                    server_global.tokens -= 1
+
+            if allowed:
+                code, body = 200, {'ok': True, 'result': {}}
+            else:
+                code, body = 429, {'ok': False, 'error_code': 429, 'parameters': {'retry_after': 1}}
+
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeBotAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    sender = BroadcastQueue(bot_token='test', api_base=f"http://127.0.0.1:{server.server_port}")
+    stats = sender.broadcast('테스트 메시지', [str(chat_id) for chat_id in range(chat_count)])
+    print(f"채팅 {chat_count}개, 상한 {GLOBAL_RATE}/s → {stats['messages_per_second']}/s, 429 {stats['throttled']}회, "
+          f"새 연결 {http_client.get_handshake_count()}개")
+    server.shutdown()
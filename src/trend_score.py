@@ -0,0 +1,184 @@
+import os
+import sqlite3
+import time
+from threading import Lock
+
+from history_store import extract_article_id, normalize_url
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+TRENDS_PATH = os.path.join(DATA_DIR, 'trends.sqlite3')
+
+
+class TrendScorer:
+    """수집할 때마다 기사별 순위 상승 속도/체류 시간을 갱신해 popularity_score(0~100) 계산
+
+    기사마다 마지막 상태(순위, 시각, 속도, 체류 시간)만 저장하고 새 수집 결과로 바로 갱신한다.
+    (기사당 PK 조회 1번 + 저장 1번, 전체 이력을 다시 보지 않음)
+    """
+
+    def __init__(self, path=TRENDS_PATH, out_rank=31, smoothing=0.5, max_gap_hours=6,
+                 dwell_half_life_hours=12, velocity_scale=5, weights=None):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = Lock()
+        # 순위 밖 = out_rank (처음 들어온 기사는 여기서 올라온 것으로 봄)
+        self.out_rank = out_rank
+        self.smoothing = smoothing
+        self.max_gap_hours = max_gap_hours
+        self.dwell_half_life_hours = dwell_half_life_hours
+        self.velocity_scale = velocity_scale
+        self.weights = weights or {'position': 0.5, 'velocity': 0.35, 'freshness': 0.15}
+        with self.lock, self.conn:
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS trends (
+                    url_key TEXT PRIMARY KEY,
+                    article_id TEXT,
+                    last_rank INTEGER NOT NULL,
+                    last_seen REAL NOT NULL,
+                    velocity REAL NOT NULL DEFAULT 0,
+                    dwell_seconds REAL NOT NULL DEFAULT 0,
+                    score REAL NOT NULL DEFAULT 0
+                )
+            """)
+            self.conn.execute('CREATE INDEX IF NOT EXISTS idx_trends_last_seen ON trends(last_seen)')
+
+    def _next_state(self, previous, rank, seen_at):
+        """이전 상태 + 이번 순위 → (속도(순위/시간), 체류 시간(초))"""
+        if previous is None:
+            # 새로 들어온 기사: 순위 밖에서 1시간 동안 올라온 것으로 계산
+            return float(self.out_rank - rank), 0.0
+
+        last_rank, last_seen, velocity, dwell_seconds = previous
+        gap = seen_at - last_seen
+        if gap <= 0:
+            # 같은 실행 안에서 다시 나온 경우 (여러 소스) - 더 높은 순위만 반영
+            return velocity, dwell_seconds
+        if gap > self.max_gap_hours * 3600:
+            # 오래 안 보이다 다시 들어오면 새 기사처럼
+            return float(self.out_rank - rank), 0.0
+
+        # 지수 이동 평균으로 속도 갱신 (15분 미만 간격은 15분으로 봄)
+        hours = max(gap / 3600, 0.25)
+        instant = (last_rank - rank) / hours
+        velocity = self.smoothing * instant + (1 - self.smoothing) * velocity
+        return velocity, dwell_seconds + gap
+
+    def _score(self, rank, velocity, dwell_seconds):
+        position = max(0.0, (self.out_rank - rank) / (self.out_rank - 1))
+        # 속도를 0~1로 (0 = 정체, 1에 가까울수록 빠르게 상승)
+        rising = 0.5 + 0.5 * velocity / (abs(velocity) + self.velocity_scale)
+        # 오래 머문 기사일수록 낮게 (새 이야기 우선)
+        freshness = 1 / (1 + dwell_seconds / 3600 / self.dwell_half_life_hours)
+        weights = self.weights
+        return 100 * (weights['position'] * position + weights['velocity'] * rising + weights['freshness'] * freshness)
+
+    def update(self, news_items, seen_at=None):
+        """수집 결과로 기사별 상태 갱신 → popularity_score/trend_velocity/dwell_hours 붙인 목록"""
+        seen_at = seen_at or time.time()
+        keys = [normalize_url(item['link']) for item in news_items]
+        if not keys:
+            return []
+
+        unique_keys = list(dict.fromkeys(keys))
+        placeholders = ','.join('?' * len(unique_keys))
+        with self.lock:
+            rows = self.conn.execute(
+                f"SELECT url_key, last_rank, last_seen, velocity, dwell_seconds FROM trends WHERE url_key IN ({placeholders})",
+                unique_keys,
+            ).fetchall()
+        previous = {row[0]: row[1:] for row in rows}
+
+        states = {}
+        scored = []
+        for key, item in zip(keys, news_items):
+            rank = min(item.get('rank') or self.out_rank, self.out_rank)
+            if key in states and states[key][0] <= rank:
+                # 같은 기사가 여러 번 나오면 가장 높은 순위 기준
+                state = states[key]
+            else:
+                velocity, dwell_seconds = self._next_state(previous.get(key), rank, seen_at)
+                state = (rank, velocity, dwell_seconds, self._score(rank, velocity, dwell_seconds))
+                states[key] = state
+            _, velocity, dwell_seconds, score = state
+            scored.append(dict(
+                item,
+                popularity_score=round(score),
+                trend_velocity=round(velocity, 2),
+                dwell_hours=round(dwell_seconds / 3600, 1),
+            ))
+
+        with self.lock, self.conn:
+            self.conn.executemany("""
+                INSERT INTO trends (url_key, article_id, last_rank, last_seen, velocity, dwell_seconds, score)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url_key) DO UPDATE SET
+                    last_rank = excluded.last_rank,
+                    last_seen = excluded.last_seen,
+                    velocity = excluded.velocity,
+                    dwell_seconds = excluded.dwell_seconds,
+                    score = excluded.score
+            """, [
+                (key, extract_article_id(key), rank, seen_at, velocity, dwell_seconds, score)
+                for key, (rank, velocity, dwell_seconds, score) in states.items()
+            ])
+        return scored
+
+    def prune(self, now=None):
+        """max_gap_hours 넘게 안 보인 기사 상태 삭제 (다시 나오면 어차피 새 기사로 계산)"""
+        before = (now or time.time()) - self.max_gap_hours * 3600
+        with self.lock, self.conn:
+            return self.conn.execute('DELETE FROM trends WHERE last_seen < ?', (before,)).rowcount
+
+    def close(self):
+        self.conn.close()
+
+
+def order_by_trend(news_items):
+    """popularity_score 높은 순 (이력상 반복 뉴스는 계속 뒤로), 순위 다시 매김"""
+    ordered = sorted(news_items, key=lambda item: (bool(item.get('repeat')), -item.get('popularity_score', 0)))
+    return [dict(item, rank=rank) for rank, item in enumerate(ordered, 1)]
+
+
+def create_trend_scorer(trend_config, root_dir, out_rank=31):
+    """설정으로 점수 계산기 생성 (꺼져 있으면 None)"""
+    if not trend_config.get('enabled', True):
+        return None
+    path = trend_config.get('path')
+    if path and path != ':memory:':
+        path = os.path.join(root_dir, path)
+    return TrendScorer(
+        path=path or TRENDS_PATH,
+        out_rank=out_rank,
+        smoothing=trend_config.get('smoothing', 0.5),
+        max_gap_hours=trend_config.get('max_gap_hours', 6),
+        dwell_half_life_hours=trend_config.get('dwell_half_life_hours', 12),
+        velocity_scale=trend_config.get('velocity_scale', 5),
+        weights=trend_config.get('weights'),
+    )
+
+
+# 기사 수천 개 상태에서 수집 1회 갱신 시간 + 오래 1위인 기사 vs 빠르게 오르는 기사 순서 확인
+if __name__ == "__main__":
+    scorer = TrendScorer(':memory:')
+    now = time.time()
+    for poll in range(500):
+        # 15분마다 30개, 4회마다 7개씩 새 기사로 바뀌는 순위
+        items = [{'link': f'https://n.news.naver.com/article/001/{(poll // 4) * 7 + i:010d}', 'rank': i + 1}
+                 for i in range(30)]
+        started = time.perf_counter()
+        scorer.update(items, now + poll * 900)
+    elapsed = time.perf_counter() - started
+    count = scorer.conn.execute('SELECT COUNT(*) FROM trends').fetchone()[0]
+    print(f"기사 상태 {count}개, 30개 갱신 {elapsed * 1000:.2f}ms")
+
+    scorer = TrendScorer(':memory:')
+    steady = {'title': '10시간째 1위', 'link': 'https://n.news.naver.com/article/001/0000000001'}
+    rising = {'title': '1시간 만에 25위 → 3위', 'link': 'https://n.news.naver.com/article/001/0000000002'}
+    for poll, rising_rank in enumerate([None] * 36 + [25, 18, 10, 3]):
+        items = [dict(steady, rank=1)] + ([dict(rising, rank=rising_rank)] if rising_rank else [])
+        scored = scorer.update(items, now + poll * 900)
+    for item in order_by_trend(scored):
+        print(f"  {item['rank']}. {item['title']}: 점수 {item['popularity_score']}, "
+              f"속도 {item['trend_velocity']}/h, 체류 {item['dwell_hours']}h")
@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+# src/ 모듈은 패키지가 아니라 평평한 모듈 (python src/main.py와 같은 import 경로)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+
+@pytest.fixture
+def crawler(monkeypatch, tmp_path):
+    """data/, .cache/ 대신 임시 디렉터리와 메모리 DB를 쓰는 크롤러 (보관/인기 점수 없음)"""
+    import naver_crawler
+    from history_store import HistoryStore
+    from response_cache import ResponseCache
+
+    monkeypatch.setattr(naver_crawler, 'HistoryStore', lambda: HistoryStore(':memory:'))
+    monkeypatch.setattr(naver_crawler, 'ResponseCache', lambda ttl_seconds: ResponseCache(str(tmp_path / 'http'), ttl_seconds))
+    monkeypatch.setattr(naver_crawler, 'create_archive', lambda config, root_dir: None)
+    monkeypatch.setattr(naver_crawler, 'create_trend_scorer', lambda config, root_dir, out_rank: None)
+    crawler = naver_crawler.NaverNewsCrawler()
+    yield crawler
+    if crawler.history_store:
+        crawler.history_store.close()
@@ -0,0 +1,32 @@
+from coverage_pipeline import unique_news
+
+
+def _news(*numbers):
+    return [{'title': f'뉴스 {number}', 'link': f'https://n.news.naver.com/article/001/{number:010d}'} for number in numbers]
+
+
+def _unique(numbers, max_seen):
+    stats = {'duplicates': 0}
+    items = list(unique_news(_news(*numbers), stats, max_seen))
+    return [int(item['title'].split()[1]) for item in items], stats['duplicates']
+
+
+def test_unique_news_drops_duplicates_inside_window():
+    assert _unique([1, 2, 1, 3, 2], max_seen=10) == ([1, 2, 3], 2)
+
+
+def test_unique_news_forgets_least_recently_seen():
+    # 1은 다시 나와서 최근으로 갱신 → 창(2개) 밖으로 밀려나는 건 2
+    assert _unique([1, 2, 1, 3, 1, 2], max_seen=2) == ([1, 2, 3, 2], 2)
+
+
+def test_poll_uses_single_page_source(crawler):
+    calls = []
+    crawler.source_handlers = {
+        'naver_ranking': lambda limit, url: calls.append('naver_ranking') or [],
+        'naver_ranking_full': lambda limit, url: calls.append('naver_ranking_full') or [],
+    }
+
+    crawler.crawl_sources('20:00', poll=True)
+    crawler.crawl_sources('20:00')
+    assert calls == ['naver_ranking', 'naver_ranking_full']
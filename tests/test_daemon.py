@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from daemon import KST, NewsDaemon, next_slot
+
+SLOTS = ['07:00', '12:00', '18:00', '20:00']
+
+
+def _at(day, hour, minute=0, second=0):
+    return datetime(2026, 10, day, hour, minute, second, tzinfo=KST)
+
+
+@pytest.mark.parametrize('now, slot, run_at', [
+    (_at(18, 5), '07:00', _at(18, 7)),
+    (_at(18, 7, 0, 1), '12:00', _at(18, 12)),
+    (_at(18, 19, 59), '20:00', _at(18, 20)),
+    # 마지막 시간대를 지나면 다음 날 첫 시간대
+    (_at(18, 20), '07:00', _at(19, 7)),
+    (_at(18, 23, 30), '07:00', _at(19, 7)),
+])
+def test_next_slot(now, slot, run_at):
+    assert next_slot(SLOTS, now) == (slot, run_at)
+
+
+def test_next_slot_rolls_over_month_and_year():
+    now = datetime(2026, 12, 31, 21, 0, tzinfo=KST)
+    assert next_slot(SLOTS, now) == ('07:00', datetime(2027, 1, 1, 7, 0, tzinfo=KST))
+
+
+def test_next_slot_ignores_slot_order():
+    assert next_slot(['20:00', '07:00'], _at(18, 8)) == ('20:00', _at(18, 20))
+
+
+def test_run_counts_success_failure_and_errors():
+    results = iter([True, False])
+
+    def run_slot(slot):
+        result = next(results, None)
+        if result is None:
+            raise RuntimeError('실패')
+        return result
+
+    daemon = NewsDaemon(run_slot, SLOTS)
+    for _ in range(3):
+        daemon._run('07:00')
+
+    assert daemon.health()['runs']['07:00'] == {'success': 1, 'failure': 2}
+    assert '07:00' in daemon.last_success_at
+    assert 'news_bot_runs_total{slot="07:00",result="failure"} 2' in daemon.metrics()
+
+
+def test_wait_until_polls_between_slots():
+    polls = []
+    daemon = NewsDaemon(lambda slot: True, SLOTS, poll=lambda: polls.append(1), poll_seconds=0.1)
+
+    assert daemon._wait_until(datetime.now(KST) + timedelta(seconds=0.35))
+    assert len(polls) == 3
+    assert daemon.health()['polls'] == {'success': 3, 'failure': 0}
+
+
+def test_wait_until_returns_false_after_stop():
+    daemon = NewsDaemon(lambda slot: True, SLOTS)
+    daemon.stop()
+    assert not daemon._wait_until(datetime.now(KST) + timedelta(hours=1))
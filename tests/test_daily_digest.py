@@ -0,0 +1,60 @@
+import pytest
+
+from daily_digest import DailyDigestStore, build_digest_thread_data
+
+DAY = '2026-10-18'
+
+
+def _thread(slot, category, content, scores):
+    news = [
+        {'title': f'{slot} 뉴스 {i}', 'link': f'https://n.news.naver.com/article/001/{slot[:2]}{i:04d}', 'popularity_score': score}
+        for i, score in enumerate(scores)
+    ]
+    return {'time_slot': slot, 'category': category, 'content': content, 'source_news': news}
+
+
+@pytest.fixture
+def store():
+    store = DailyDigestStore(':memory:', top_stories=3)
+    yield store
+    store.close()
+
+
+def test_append_accumulates_slots(store):
+    store.append(_thread('07:00', '오전 이슈', '1. 아침', [90, 10]), day=DAY)
+    digest = store.append(_thread('12:00', '정오 이슈', '1. 점심', [50, 40, 30]), day=DAY)
+
+    assert digest == store.get(DAY)
+    assert digest['thread_count'] == 2
+    assert digest['news_count'] == 5
+    assert digest['categories'] == {'오전 이슈': 1, '정오 이슈': 1}
+    assert [story['popularity_score'] for story in digest['top_stories']] == [90, 50, 40]
+
+
+def test_rerun_slot_recomputes_digest(store):
+    store.append(_thread('07:00', '오전 이슈', '1. 아침 첫 결과', [90, 80]), day=DAY)
+    store.append(_thread('12:00', '정오 이슈', '1. 점심', [50, 40, 30]), day=DAY)
+    digest = store.append(_thread('07:00', '속보', '1. 다시 생성', [20]), day=DAY)
+
+    # 재실행한 시간대는 이전 결과 대신 새 결과만 (개수/글자 수/카테고리/미리보기/인기 뉴스 모두)
+    assert digest['thread_count'] == 2
+    assert digest['news_count'] == 4
+    assert digest['total_chars'] == len('1. 다시 생성') + len('1. 점심')
+    assert digest['categories'] == {'정오 이슈': 1, '속보': 1}
+    assert [thread['content'] for thread in digest['threads']] == ['1. 다시 생성', '1. 점심']
+    assert [story['title'] for story in digest['top_stories']] == ['12:00 뉴스 0', '12:00 뉴스 1', '12:00 뉴스 2']
+    assert store.get(DAY) == digest
+
+    content = build_digest_thread_data(digest)['content']
+    assert '07:00 속보: 1. 다시 생성' in content
+    assert '아침 첫 결과' not in content
+
+
+def test_prune_keeps_recent_days(store):
+    store.retention_days = 7
+    store.append(_thread('07:00', '오전 이슈', '1. 오래된 날', [10]), day='2026-10-01')
+    store.append(_thread('07:00', '오전 이슈', '1. 오늘', [10]), day=DAY)
+
+    assert store.prune(DAY) == 1
+    assert store.get('2026-10-01') is None
+    assert store.get(DAY)['thread_count'] == 1
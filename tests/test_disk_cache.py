@@ -0,0 +1,33 @@
+import os
+import time
+
+from disk_cache import DiskCache
+
+
+def test_evict_removes_every_file_of_the_key(tmp_path):
+    cache = DiskCache(str(tmp_path), max_entries=1)
+    cache.write('old', b'{}')
+    cache.write('old', b'<html>', 'body')
+    past = time.time() - 10
+    os.utime(cache.path('old'), (past, past))
+
+    cache.set('new', '값')
+    assert sorted(os.listdir(tmp_path)) == ['new.json']
+
+
+def test_unknown_or_broken_entries_are_misses(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    cache.write('broken', b'{not json')
+    cache.write('old_format', b'{"created_at": 0, "text": "x"}')
+
+    assert cache.get('broken') is None
+    assert cache.get('old_format') is None
+    assert cache.get('missing') is None
+    assert cache.stats() == {'hits': 0, 'misses': 3}
+
+
+def test_without_limits_nothing_expires(tmp_path):
+    cache = DiskCache(str(tmp_path))
+    for index in range(5):
+        cache.set(f'key{index}', index)
+    assert [cache.get(f'key{index}') for index in range(5)] == list(range(5))
@@ -0,0 +1,63 @@
+import time
+
+import pytest
+
+from history_store import HistoryStore
+
+
+def _news(*numbers):
+    return [
+        {'title': f'테스트 뉴스 {number}', 'link': f'https://n.news.naver.com/article/001/{number:010d}?ntype=RANKING', 'rank': rank}
+        for rank, number in enumerate(numbers, 1)
+    ]
+
+
+@pytest.fixture
+def store():
+    store = HistoryStore(':memory:')
+    yield store
+    store.close()
+
+
+def test_filter_repeats_filter_mode_drops_seen(store):
+    now = time.time()
+    store.record(_news(1, 2), seen_at=now - 3600)
+
+    items = store.filter_repeats(_news(1, 3, 2, 4), now - 12 * 3600, mode='filter')
+    assert [item['title'] for item in items] == ['테스트 뉴스 3', '테스트 뉴스 4']
+    assert [item['rank'] for item in items] == [1, 2]
+
+
+def test_filter_repeats_downrank_mode_moves_seen_last(store):
+    now = time.time()
+    store.record(_news(1, 2), seen_at=now - 3600)
+
+    items = store.filter_repeats(_news(1, 3, 2, 4), now - 12 * 3600, mode='downrank')
+    assert [item['title'] for item in items] == ['테스트 뉴스 3', '테스트 뉴스 4', '테스트 뉴스 1', '테스트 뉴스 2']
+    assert [item['rank'] for item in items] == [1, 2, 3, 4]
+    assert [bool(item.get('repeat')) for item in items] == [False, False, True, True]
+
+
+def test_filter_repeats_ignores_history_outside_window(store):
+    now = time.time()
+    store.record(_news(1), seen_at=now - 24 * 3600)
+
+    items = store.filter_repeats(_news(1, 2), now - 12 * 3600, mode='filter')
+    assert [item['title'] for item in items] == ['테스트 뉴스 1', '테스트 뉴스 2']
+
+
+def test_crawl_records_history_only_when_asked(crawler, monkeypatch):
+    # 수집 직후에는 기록하지 않음 (생성/저장 전에 실패하면 다음 실행에서 다시 새 뉴스)
+    crawler.lsh = None
+    monkeypatch.setattr(crawler, 'crawl_sources', lambda time_slot, limit=10, archive=True: _news(1, 2, 3))
+    since = time.time() - 3600
+
+    assert len(crawler.get_naver_news('07:00')) == 3
+    assert crawler.history_store.seen_since(_news(1, 2, 3), since) == set()
+    assert len(crawler.get_naver_news('07:00')) == 3
+
+    crawler.record_history()
+    assert len(crawler.history_store.seen_since(_news(1, 2, 3), since)) == 3
+    # 한 번만 기록
+    crawler.record_history()
+    assert crawler.history_store.get(_news(1)[0]['link'])['seen_count'] == 1
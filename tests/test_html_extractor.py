@@ -0,0 +1,37 @@
+import glob
+import os
+
+import pytest
+
+from html_extractor import EXTRACTORS, FIXTURE_DIR, check_parity, extract_ranking_news, iter_ranking_news
+
+FIXTURES = sorted(glob.glob(os.path.join(FIXTURE_DIR, 'naver_ranking_*.html')))
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_fixtures_exist():
+    assert FIXTURES
+
+
+def test_check_parity():
+    assert check_parity()
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=os.path.basename)
+@pytest.mark.parametrize('backend', sorted(EXTRACTORS))
+def test_backend_matches_html_parser(path, backend):
+    content = _read(path)
+    expected = extract_ranking_news(content, 10, backend='html.parser')
+    assert expected
+    assert extract_ranking_news(content, 10, backend=backend) == expected
+
+
+@pytest.mark.parametrize('path', FIXTURES, ids=os.path.basename)
+def test_streaming_reads_every_box(path):
+    content = _read(path)
+    expected = [(item['title'], item['link']) for item in extract_ranking_news(content, 10000, 'html.parser', None, None)]
+    assert [(item['title'], item['link']) for item in iter_ranking_news(content)] == expected
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from fake_services import make_anthropic_handler, start_server
+from issue_generator import IssueGenerator, IssueJsonParser, IssueLineParser
+
+LATENCY = 0.3
+
+NEWS = [
+    {'title': f'테스트 뉴스 제목 {i}번 오늘 화제', 'link': f'https://n.news.naver.com/article/001/{i:010d}', 'rank': i}
+    for i in range(1, 11)
+]
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 1000])
+def test_line_parser_across_chunk_boundaries(size):
+    text = "여기 정리했어\n" + "\n".join(f"{i}. 이슈 {i}번" for i in range(1, 13))
+    parser = IssueLineParser()
+    added = sum(parser.feed(chunk) for chunk in _chunks(text, size) if not parser.done)
+    parser.finish()
+
+    assert added == 10
+    assert parser.done
+    assert parser.items == [f"{i}. 이슈 {i}번" for i in range(1, 11)]
+
+
+def test_line_parser_keeps_last_line_until_finish():
+    parser = IssueLineParser()
+    assert parser.feed("1. 첫 번째\n2. 두 ") == 1
+    assert parser.feed("번째") == 0
+    assert parser.finish()
+    assert parser.result() == "1. 첫 번째\n2. 두 번째"
+
+
+@pytest.mark.parametrize('size', [1, 2, 5, 7, 1000])
+def test_json_parser_across_chunk_boundaries(size):
+    issues = ['따옴표 "인용" 포함', '역슬래시 \\ 포함', '줄\n바꿈'] + [f'이슈 {i}번' for i in range(4, 13)]
+    payload = json.dumps({'issues': issues}, ensure_ascii=False)
+    parser = IssueJsonParser()
+    added = sum(parser.feed(chunk) for chunk in _chunks(payload, size) if not parser.done)
+
+    assert added == 10
+    assert parser.items == issues[:10]
+
+
+def test_json_parser_waits_for_closing_quote():
+    parser = IssueJsonParser()
+    assert parser.feed('{"issues": ["첫 번째", "두 번\\') == 1
+    assert parser.feed('"째"') == 1
+    assert parser.items == ['첫 번째', '두 번"째']
+
+
+@pytest.fixture
+def anthropic_url():
+    server, url = start_server(make_anthropic_handler(latency=LATENCY))
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture
+def generator(anthropic_url):
+    from anthropic import Anthropic, AsyncAnthropic
+
+    generator = IssueGenerator()
+    generator.cache = None
+    generator._client = Anthropic(api_key='test', base_url=anthropic_url)
+    generator._async_client = AsyncAnthropic(api_key='test', base_url=anthropic_url)
+    return generator
+
+
+def test_async_issue_list_matches_sync_format(generator):
+    assert generator.structured_output
+    expected = generator.generate_issue_list(NEWS, '07:00')
+    assert asyncio.run(generator.generate_issue_list_async(NEWS, '07:00')) == expected
+    assert expected.split('\n') == [f"{i}. 오늘 화제된 뉴스 요약 {i}번이야" for i in range(1, 11)]
+
+
+def test_generate_all_async_runs_requests_concurrently(generator):
+    started = time.perf_counter()
+    results = asyncio.run(generator.generate_all_async(NEWS, '07:00', blurb_count=2))
+    elapsed = time.perf_counter() - started
+
+    assert len(results['issue_list'].split('\n')) == 10
+    assert results['hot_issue']
+    assert results['blurbs'] == ['이거 진짜 난리 났대'] * 2
+    # 요청 4개(max_concurrency 4)가 동시에 → 가장 느린 요청 1개 수준
+    assert elapsed < 3 * LATENCY
+
+
+def test_structured_streaming_stops_at_ten_items(generator):
+    assert generator.structured_output and generator.streaming
+    result = generator.generate_issue_list(NEWS, '07:00')
+
+    assert len(result.split('\n')) == 10
+    assert generator.last_stream_metrics['items'] == 10
+    assert generator.last_stream_metrics['stopped_early']
+    assert generator.last_stream_metrics['time_to_first_item'] is not None
+
+
+@pytest.mark.parametrize('mode, requests', [('combined', 1), ('batches', 2)])
+def test_generate_slots_in_one_batch(crawler, generator, monkeypatch, mode, requests):
+    from main import generate_slots
+    from message_batches import LocalMessageBatches
+
+    crawler.lsh = None
+    monkeypatch.setattr(crawler, 'crawl_sources', lambda time_slot, limit=10, archive=True: NEWS)
+    messages = generator.client.messages
+    sent = []
+    create = messages.create
+    monkeypatch.setattr(messages, 'create', lambda **kwargs: sent.append(kwargs) or create(**kwargs))
+
+    results = generate_slots(crawler, generator, ['07:00', '20:00'], mode, LocalMessageBatches(messages))
+
+    assert results['07:00'].split('\n') == [f"{i}. 오늘 화제된 뉴스 요약 {i}번이야" for i in range(1, 11)]
+    assert results['20:00'] == ('오늘 제일 핫한 뉴스는 이거야. ' * 8).strip()
+    assert len(sent) == requests
+
+
+def test_system_prompt_has_only_current_task_rules(generator):
+    from issue_generator import TASK_RULES
+
+    system = generator._system('hot_issue')
+    assert TASK_RULES['hot_issue'] in system
+    assert TASK_RULES['issue_list'] not in system
+    assert TASK_RULES['blurb'] not in system
+
+
+def test_cache_control_only_past_minimum_length(generator, monkeypatch):
+    assert generator.prompt_caching
+    # 최소 길이(1024토큰)보다 짧으면 캐시되지 않으므로 일반 문자열
+    assert isinstance(generator._system('issue_list'), str)
+
+    monkeypatch.setattr('issue_generator.PERSONA', '말투 규칙과 예시 문장이 길게 이어지는 지시문이야. ' * 200)
+    system = generator._system('issue_list')
+    assert system[0]['cache_control'] == {'type': 'ephemeral'}
+
+
+def test_llm_cache_separates_structured_and_text_results(generator, tmp_path):
+    from llm_cache import LLMCache
+
+    generator.cache = LLMCache(str(tmp_path))
+    key, _ = generator._cached_result('[이슈 리스트] 테스트', 400, 0.1, 'issue_list')
+    generator._store_result(key, '1. 도구 응답 결과')
+    assert generator._cached_result('[이슈 리스트] 테스트', 400, 0.1, 'issue_list')[1] == '1. 도구 응답 결과'
+
+    generator.structured_output = False
+    assert generator._cached_result('[이슈 리스트] 테스트', 400, 0.1, 'issue_list')[1] is None
+
+
+@pytest.mark.parametrize('structured', [True, False])
+def test_issue_list_request_fits_input_budget(generator, structured):
+    from issue_generator import ISSUE_LIST_PROMPT
+    from prompt_builder import count_tokens
+
+    generator.structured_output = structured
+    news = [dict(item, title=item['title'] + ' 관련 후속 보도와 반응 정리') for item in NEWS]
+    prompt = generator._issue_list_prompt(news, '07:00')
+    fixed = generator.fixed_tokens('issue_list', ISSUE_LIST_PROMPT.format(news_titles='', time_slot='07:00'))
+    template = count_tokens(ISSUE_LIST_PROMPT.format(news_titles='', time_slot='07:00'))
+
+    # 시스템 프롬프트 + 사용자 메시지 + 도구 정의 합계가 예산 이하
+    assert fixed - template + count_tokens(prompt) <= generator.prompt_builder.input_token_budget
+    assert prompt.count('\n') >= generator.prompt_builder.min_items
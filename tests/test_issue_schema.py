@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+from issue_generator import IssueGenerator
+from issue_schema import ISSUE_LIST_TOOL, ISSUE_LIST_VALIDATOR, REPAIR_TOOL
+
+validator = ISSUE_LIST_VALIDATOR
+GOOD = [f"오늘 화제된 뉴스 요약 {i}번이야" for i in range(1, 11)]
+
+
+def tool_use(name, payload):
+    return SimpleNamespace(type='tool_use', name=name, input=payload)
+
+
+def test_schema_limits_read_once():
+    assert validator.max_chars == 35
+    assert validator.min_items == validator.max_items == 10
+
+
+def test_valid_list_has_no_problems():
+    items, problems = validator.validate(GOOD)
+    assert items == GOOD
+    assert problems == {}
+
+
+def test_problems_by_index():
+    raw = GOOD[:3] + ['', GOOD[0], 'x' * 50] + GOOD[6:8]
+    _, problems = validator.validate(raw)
+    assert problems == {3: 'empty', 4: 'duplicate', 5: 'too_long', 8: 'missing', 9: 'missing'}
+
+
+def test_slightly_long_item_trimmed_locally():
+    long_item = "대통령 새해 기자회견에서 경제 정책 방향과 부동산 대책 발표했어 진짜"
+    assert validator.max_chars < len(long_item) <= validator.max_chars + validator.truncate_slack
+    items, problems = validator.validate([long_item] + GOOD[1:])
+    items, remaining = validator.repair_locally(items, problems)
+    assert remaining == {}
+    assert len(items[0]) <= validator.max_chars
+    # 어절 중간에서 자르지 않음
+    assert long_item.startswith(items[0]) and long_item[len(items[0])] == ' '
+
+
+def test_far_too_long_item_left_for_repair():
+    items, problems = validator.validate(['가' * 60] + GOOD[1:])
+    _, remaining = validator.repair_locally(items, problems)
+    assert remaining == {0: 'too_long'}
+    assert validator.describe(items, remaining) == '1(60자, 너무 김)'
+
+
+def test_apply_fixes_fills_missing_and_finalize_enforces_limits():
+    items, problems = validator.validate(GOOD[:8])
+    fixed = validator.apply_fixes(items, {8: '아홉 번째 이슈', 9: '열 번째 이슈가 너무 길어서 잘라야 하는 긴 요약 문장이야 정말로'})
+    assert len(fixed) == 10
+    assert all(0 < len(item) <= validator.max_chars for item in fixed)
+
+
+def test_from_content_prefers_tool_input_and_accepts_text():
+    assert validator.from_content([tool_use(ISSUE_LIST_TOOL['name'], {'issues': GOOD})]) == GOOD
+    text = SimpleNamespace(type='text', text="1. 첫 번째 소식\n설명 줄\n2) 두 번째 소식")
+    assert validator.from_content([text]) == ['첫 번째 소식', '두 번째 소식']
+
+
+class FakeMessages:
+    """도구 요청마다 정해 둔 응답을 차례로 반환하고 요청을 기록"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        return SimpleNamespace(content=self.responses.pop(0), usage=None)
+
+
+def test_structured_issue_list_repairs_only_bad_items():
+    generator = IssueGenerator()
+    first = GOOD[:1] + ['가' * 60] + GOOD[2:8]
+    messages = FakeMessages([
+        [tool_use(ISSUE_LIST_TOOL['name'], {'issues': first})],
+        [tool_use(REPAIR_TOOL['name'], {'fixes': [
+            {'number': 2, 'text': '두 번째 이슈 다시 씀'},
+            {'number': 9, 'text': '아홉 번째 이슈'},
+            {'number': 10, 'text': '열 번째 이슈'},
+            # 요청하지 않은 번호는 무시
+            {'number': 1, 'text': '바꾸면 안 되는 항목'},
+        ]})],
+    ])
+    generator._client = SimpleNamespace(messages=messages)
+    generator.streaming = False
+
+    result = generator._structured_issue_list('[이슈 리스트] 테스트')
+
+    assert len(messages.requests) == 2
+    assert messages.requests[1]['tool_choice'] == {'type': 'tool', 'name': REPAIR_TOOL['name']}
+    assert '고칠 번호: 2(60자, 너무 김), 9(없음), 10(없음)' in messages.requests[1]['messages'][0]['content']
+    assert result.split('\n') == [
+        f"1. {GOOD[0]}", "2. 두 번째 이슈 다시 씀", *[f"{i}. {GOOD[i - 1]}" for i in range(3, 9)],
+        "9. 아홉 번째 이슈", "10. 열 번째 이슈",
+    ]
+
+
+def test_structured_issue_list_skips_repair_when_valid():
+    generator = IssueGenerator()
+    messages = FakeMessages([[tool_use(ISSUE_LIST_TOOL['name'], {'issues': GOOD})]])
+    generator._client = SimpleNamespace(messages=messages)
+    generator.streaming = False
+    assert generator._structured_issue_list('[이슈 리스트] 테스트') == validator.format(GOOD)
+    assert len(messages.requests) == 1
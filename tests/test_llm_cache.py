@@ -0,0 +1,54 @@
+import os
+import time
+
+from llm_cache import LLMCache, cache_key
+
+
+def _backdate(cache, key, seconds):
+    """항목의 최근 사용 시각을 seconds초 전으로"""
+    path = cache.path(key)
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_get_returns_stored_text_and_counts(tmp_path):
+    cache = LLMCache(str(tmp_path), ttl_seconds=60, max_entries=10)
+    key = cache_key('model', '프롬프트', 0.7, 100)
+
+    assert cache.get(key) is None
+    cache.set(key, '응답')
+    assert cache.get(key) == '응답'
+    assert cache.stats() == {'hits': 1, 'misses': 1}
+
+
+def test_cache_key_separates_parameters():
+    base = cache_key('model', '프롬프트', 0.7, 100)
+    assert cache_key('model', '프롬프트', 0.7, 100) == base
+    assert cache_key('model', '프롬프트', 0.7, 200) != base
+    assert cache_key('model', '프롬프트', 0.7, 100, system='규칙') != base
+
+
+def test_expired_entry_is_removed(tmp_path):
+    cache = LLMCache(str(tmp_path), ttl_seconds=0.05, max_entries=10)
+    cache.set('key', '응답')
+    time.sleep(0.1)
+
+    assert cache.get('key') is None
+    assert not os.path.exists(cache.path('key'))
+    assert cache.stats() == {'hits': 0, 'misses': 1}
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = LLMCache(str(tmp_path), ttl_seconds=60, max_entries=2)
+    cache.set('old', '1')
+    cache.set('newer', '2')
+    _backdate(cache, 'old', 20)
+    _backdate(cache, 'newer', 10)
+
+    # 읽으면 최근 사용으로 갱신 → 안 읽은 'newer'가 먼저 밀려남
+    assert cache.get('old') == '1'
+    cache.set('newest', '3')
+
+    assert cache.get('newer') is None
+    assert cache.get('old') == '1'
+    assert cache.get('newest') == '3'
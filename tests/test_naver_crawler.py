@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+from fake_services import _QuietHandler, start_server
+from html_extractor import FIXTURE_DIR
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        return f.read()
+
+
+class FakeRanking:
+    """ETag를 주고 If-None-Match가 같으면 304로 답하는 랭킹 페이지 (받은 요청 헤더 기록)"""
+
+    def __init__(self, body, etag='"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests = []
+
+        ranking = self
+
+        class Handler(_QuietHandler):
+            def do_GET(self):
+                ranking.requests.append(dict(self.headers))
+                if ranking.etag and self.headers.get('If-None-Match') == ranking.etag:
+                    self.send_response(304)
+                    self.send_header('ETag', ranking.etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if ranking.etag:
+                    self.send_header('ETag', ranking.etag)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(ranking.body)))
+                self.end_headers()
+                self.wfile.write(ranking.body)
+
+        self.server, base_url = start_server(Handler)
+        self.url = f"{base_url}/ranking"
+
+
+@pytest.fixture
+def ranking():
+    ranking = FakeRanking(_fixture('naver_ranking_popular_day.html'))
+    yield ranking
+    ranking.server.shutdown()
+
+
+@pytest.fixture
+def parses(crawler, monkeypatch):
+    """parse_ranking_page 호출 횟수"""
+    calls = []
+    parse = crawler.parse_ranking_page
+
+    def counting_parse(content, limit=10):
+        calls.append(limit)
+        return parse(content, limit)
+
+    monkeypatch.setattr(crawler, 'parse_ranking_page', counting_parse)
+    return calls
+
+
+def test_ttl_hit_skips_request(crawler, ranking, parses):
+    first = crawler.crawl_naver_ranking_news(5, ranking.url)
+    assert first
+    assert crawler.crawl_naver_ranking_news(5, ranking.url) == first
+    assert len(ranking.requests) == 1
+    assert len(parses) == 1
+
+
+def test_not_modified_reuses_cached_parse(crawler, ranking, parses):
+    crawler.response_cache.ttl_seconds = 0
+    first = crawler.crawl_naver_ranking_news(5, ranking.url)
+
+    assert crawler.crawl_naver_ranking_news(5, ranking.url) == first
+    assert ranking.requests[1].get('If-None-Match') == '"v1"'
+    assert len(parses) == 1
+
+    # 캐시에 없던 limit은 저장된 본문으로 파싱 (요청은 304)
+    assert crawler.crawl_naver_ranking_news(3, ranking.url) == first[:3]
+    assert len(ranking.requests) == 3
+    assert parses == [5, 3]
+
+
+def test_same_body_without_etag_skips_parse(crawler, ranking, parses):
+    ranking.etag = None
+    crawler.response_cache.ttl_seconds = 0
+    first = crawler.crawl_naver_ranking_news(5, ranking.url)
+
+    assert crawler.crawl_naver_ranking_news(5, ranking.url) == first
+    assert 'If-None-Match' not in ranking.requests[1]
+    assert len(parses) == 1
+
+
+def test_changed_body_is_parsed_and_stored(crawler, ranking, parses):
+    crawler.response_cache.ttl_seconds = 0
+    first = crawler.crawl_naver_ranking_news(5, ranking.url)
+
+    ranking.body = _fixture('naver_ranking_relative_links.html')
+    ranking.etag = '"v2"'
+    changed = crawler.crawl_naver_ranking_news(5, ranking.url)
+    assert changed != first
+    assert len(parses) == 2
+
+    # 새 ETag로 다시 조건부 요청
+    assert crawler.crawl_naver_ranking_news(5, ranking.url) == changed
+    assert ranking.requests[-1].get('If-None-Match') == '"v2"'
+    assert len(parses) == 2
@@ -0,0 +1,96 @@
+import time
+
+import pytest
+
+from fake_services import make_webhook_handler, start_server
+from notifiers import DiscordNotifier, Notifier, build_thread_data
+from outbox import Outbox, deliver_pending
+
+
+class RecordingNotifier(Notifier):
+    """보낸 횟수만 세는 전송 대상"""
+
+    name = 'recording'
+
+    def __init__(self, success=True):
+        self.success = success
+        self.sent = 0
+
+    def send(self, thread_data, timeout=None):
+        self.sent += 1
+        return self.success
+
+
+def _thread_data(content='1. 테스트 이슈'):
+    return build_thread_data(content, '07:00', '오전 이슈')
+
+
+@pytest.fixture
+def outbox():
+    outbox = Outbox(':memory:', max_attempts=3, lease_seconds=60)
+    yield outbox
+    outbox.close()
+
+
+@pytest.fixture
+def notifier(monkeypatch):
+    notifier = RecordingNotifier()
+    monkeypatch.setattr('outbox.get_notifier', lambda name: notifier)
+    return notifier
+
+
+def test_enqueue_same_content_reuses_entry(outbox):
+    first = outbox.enqueue(_thread_data(), ['recording'])
+    assert outbox.enqueue(_thread_data(), ['recording']) == first
+    assert outbox.enqueue(_thread_data('1. 다른 이슈'), ['recording']) != first
+    assert outbox.pending_count() == 2
+
+
+def test_claim_holds_lease(outbox):
+    entry_id = outbox.enqueue(_thread_data(), ['discord', 'slack'])
+    claimed = outbox.claim_pending()
+    assert [(claimed_id, sorted(destinations)) for claimed_id, _, destinations in claimed] == [(entry_id, ['discord', 'slack'])]
+    # 점유 중에는 다른 실행이 가져가지 못함
+    assert outbox.claim_pending() == []
+
+    outbox.mark_delivered(entry_id, 'discord')
+    outbox.mark_failed(entry_id, 'slack', 'HTTP 500')
+    assert [destinations for _, _, destinations in outbox.claim_pending()] == [['slack']]
+
+
+def test_failed_destination_retried_until_max_attempts(outbox, notifier):
+    notifier.success = False
+    entry_id = outbox.enqueue(_thread_data(), ['recording'])
+    for _ in range(5):
+        deliver_pending(outbox)
+    assert notifier.sent == outbox.max_attempts
+    assert outbox.undelivered_count(entry_id) == 1
+
+
+def test_delivered_destination_not_sent_again(outbox, notifier):
+    entry_id = outbox.enqueue(_thread_data(), ['recording'])
+    deliver_pending(outbox)
+    outbox.enqueue(_thread_data(), ['recording'])
+    deliver_pending(outbox)
+    assert notifier.sent == 1
+    assert outbox.status(entry_id, 'recording') == 'delivered'
+
+
+def test_timeout_in_flight_marked_unknown_and_not_resent(outbox, monkeypatch):
+    server, url = start_server(make_webhook_handler(latency=1.5))
+    monkeypatch.setenv('DISCORD_WEBHOOK_URL', f'{url}/discord')
+    monkeypatch.setattr('outbox.get_notifier', lambda name: DiscordNotifier())
+    try:
+        entry_id = outbox.enqueue(_thread_data(), ['discord'])
+        started = time.perf_counter()
+        results = deliver_pending(outbox, timeout=0.3)[entry_id]
+        elapsed = time.perf_counter() - started
+
+        assert results[0]['status'] == 'unknown'
+        # HTTP 요청 자체가 timeout에 끝나야 함 (서버 응답 1.5초를 기다리지 않음)
+        assert elapsed < 1.2
+        assert outbox.status(entry_id, 'discord') == 'unknown'
+        assert outbox.pending_count() == 0
+        assert deliver_pending(outbox) == {}
+    finally:
+        server.shutdown()
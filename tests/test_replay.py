@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from html_extractor import FIXTURE_DIR
+from main import replay_run
+from naver_crawler import RANKING_URL
+from snapshot_archive import SnapshotArchive
+
+
+@pytest.fixture
+def archive():
+    archive = SnapshotArchive(':memory:')
+    yield archive
+    archive.close()
+
+
+@pytest.fixture
+def generator():
+    from issue_generator import IssueGenerator
+
+    generator = IssueGenerator()
+    generator.cache = None
+    return generator
+
+
+def _record_run(archive, crawler, generator, name='naver_ranking_popular_day.html'):
+    """실제 실행처럼 페이지 + 생성 입력/프롬프트 보관 → 실행 정보"""
+    with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+        body = f.read()
+    run_id = archive.start_run('07:00')
+    archive.record(run_id, RANKING_URL, body)
+    crawler.load_replay({RANKING_URL: body})
+    news_items = crawler.get_naver_news('07:00')
+    archive.record_inputs(run_id, news_items, generator.build_prompt(news_items, '07:00'))
+    return archive.find_runs('')[-1]
+
+
+def test_replay_reparses_pages_and_matches_live_run(crawler, archive, generator, monkeypatch):
+    run = _record_run(archive, crawler, generator)
+    # 기록된 입력을 그대로 쓰지 않고 항상 페이지를 다시 파싱
+    calls = []
+    parse = crawler.parse_ranking_page
+    monkeypatch.setattr(crawler, 'parse_ranking_page', lambda content, limit=10: calls.append(limit) or parse(content, limit))
+
+    result = replay_run(crawler, generator, archive, run)
+
+    assert calls
+    assert result['changes'] == []
+    assert result['prompt_hash'] == result['live_hash']
+
+
+def test_replay_reports_input_and_prompt_differences(crawler, archive, generator):
+    run = _record_run(archive, crawler, generator)
+    recorded, _ = archive.load_inputs(run['id'])
+    # 실제 실행 입력이 파서 변경 전 결과였다고 가정: 1개 빠지고 순서/제목이 다름
+    live = [dict(recorded[1], title=recorded[1]['title'] + ' (속보)'), recorded[0]] + recorded[2:-1]
+    archive.record_inputs(run['id'], live, generator.build_prompt(live, '07:00'))
+
+    result = replay_run(crawler, generator, archive, run)
+
+    assert result['changes'] == ['추가 1개', '순서 다름', '제목 다름 1개']
+    assert result['prompt_hash'] != result['live_hash']
+
+
+def test_replay_keeps_recorded_article_bodies(crawler, archive, generator):
+    run = _record_run(archive, crawler, generator)
+    recorded, _ = archive.load_inputs(run['id'])
+    recorded[0] = dict(recorded[0], body='기사 본문 일부')
+    archive.record_inputs(run['id'], recorded)
+
+    result = replay_run(crawler, generator, archive, run)
+
+    assert result['news_items'][0]['body'] == '기사 본문 일부'
+    assert result['changes'] == []
@@ -0,0 +1,142 @@
+import json
+import time
+from threading import Lock
+
+import pytest
+
+from fake_services import _QuietHandler, start_server
+from notifiers import build_thread_data
+from outbox import Outbox, deliver_pending
+from telegram_broadcast import BroadcastQueue, TokenBucket
+
+
+def test_token_bucket_paces_to_rate():
+    bucket = TokenBucket(rate=50)
+    started = time.monotonic()
+    for _ in range(26):
+        bucket.acquire()
+    elapsed = time.monotonic() - started
+    # 첫 토큰은 바로, 나머지 25개는 초당 50개 → 약 0.5초
+    assert 0.45 <= elapsed < 0.8
+
+
+def test_token_bucket_pause_blocks_for_retry_after():
+    bucket = TokenBucket(rate=100)
+    bucket.acquire()
+    bucket.pause(0.3)
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started >= 0.29
+
+
+def test_time_budget_grows_with_chat_count():
+    sender = BroadcastQueue(bot_token='test', timeout=5)
+    # 초당 30개 상한에서 1,000개는 33초 넘게 걸림 → 고정 30초보다 길어야 함
+    assert sender.time_budget(1000) > 1000 / 30
+    assert sender.time_budget(10) < sender.time_budget(1000)
+
+
+def make_bot_api(fail_once):
+    """fail_once에 있는 채팅은 처음 1번만 HTTP 500, 채팅별 요청 수 기록"""
+    calls = {}
+    lock = Lock()
+
+    class FakeBotAPI(_QuietHandler):
+        def do_POST(self):
+            chat_id = str(self._read_json()['chat_id'])
+            with lock:
+                calls[chat_id] = calls.get(chat_id, 0) + 1
+                first = calls[chat_id] == 1
+            if chat_id in fail_once and first:
+                self._send(500, b'{"ok": false}')
+            else:
+                self._send(200, b'{"ok": true, "result": {}}')
+
+    return FakeBotAPI, calls
+
+
+@pytest.fixture
+def bot_api(monkeypatch):
+    handler, calls = make_bot_api(fail_once={'7', '13'})
+    server, url = start_server(handler)
+    monkeypatch.setattr('telegram_broadcast.TELEGRAM_API_BASE', url)
+    monkeypatch.setenv('TELEGRAM_BOT_TOKEN', 'test')
+    monkeypatch.setenv('TELEGRAM_BROADCAST_CHAT_IDS', ','.join(str(chat_id) for chat_id in range(20)))
+    yield calls
+    server.shutdown()
+
+
+def test_retry_sends_only_failed_chats(bot_api):
+    outbox = Outbox(':memory:')
+    entry_id = outbox.enqueue(build_thread_data('1. 테스트 이슈', '07:00', '오전 이슈'), ['telegram_broadcast'])
+
+    first = deliver_pending(outbox)[entry_id]
+    assert not first[0]['success']
+    assert outbox.finished_chats(entry_id, 'telegram_broadcast') == {str(chat_id) for chat_id in range(20)} - {'7', '13'}
+
+    second = deliver_pending(outbox)[entry_id]
+    assert second[0]['success']
+    # 이미 받은 18개 채팅에는 다시 보내지 않음
+    assert {chat_id: count for chat_id, count in bot_api.items() if count > 1} == {'7': 2, '13': 2}
+    assert outbox.status(entry_id, 'telegram_broadcast') == 'delivered'
+    outbox.close()
+
+
+def test_unsent_chats_after_deadline_stay_pending(bot_api):
+    sender = BroadcastQueue(bot_token='test', workers=1)
+    stats = sender.broadcast('테스트', [str(chat_id) for chat_id in range(20, 40)], deadline=time.monotonic() + 0.2)
+    assert stats['pending'] > 0
+    assert stats['sent'] + stats['pending'] == 20
+
+
+def make_flood_bot_api(retry_after):
+    """첫 요청에 봇 전체 429(retry_after) 응답, 요청마다 (시각, 채팅) 기록"""
+    requests = []
+    lock = Lock()
+
+    class FloodBotAPI(_QuietHandler):
+        def do_POST(self):
+            chat_id = str(self._read_json()['chat_id'])
+            with lock:
+                flooded = not requests
+                requests.append((time.monotonic(), chat_id))
+            if flooded:
+                body = {'ok': False, 'error_code': 429, 'parameters': {'retry_after': retry_after}}
+                self._send(429, json.dumps(body).encode('utf-8'))
+            else:
+                self._send(200, b'{"ok": true, "result": {}}')
+
+    return FloodBotAPI, requests
+
+
+@pytest.fixture
+def flood_api():
+    handler, requests = make_flood_bot_api(retry_after=1)
+    server, url = start_server(handler)
+    yield url, requests
+    server.shutdown()
+
+
+def test_global_429_pauses_every_chat(flood_api):
+    url, requests = flood_api
+    sender = BroadcastQueue(bot_token='test', api_base=url, workers=4)
+    stats = sender.broadcast('테스트', [str(chat_id) for chat_id in range(6)])
+
+    assert stats['sent'] == 6
+    assert stats['throttled'] == 1
+    flooded_at = requests[0][0]
+    # retry_after(1초) 동안은 다른 채팅도 보내지 않음
+    assert min(sent_at for sent_at, _ in requests[1:]) >= flooded_at + 1
+
+
+def test_deadline_during_retry_after_leaves_chats_pending(flood_api):
+    url, requests = flood_api
+    sender = BroadcastQueue(bot_token='test', api_base=url, workers=4)
+    started = time.monotonic()
+    stats = sender.broadcast('테스트', [str(chat_id) for chat_id in range(6)], deadline=started + 0.3)
+
+    # retry_after가 끝나기 전에 deadline → 토큰 대기 중이던 채팅도 보내지 않고 pending
+    assert stats['sent'] == 0
+    assert stats['pending'] == 6
+    assert len(requests) == 1
+    assert time.monotonic() - started < 0.8